@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import User, Profile
 from .models.throttle_records import ThrottleRecord
+from .models.email_outbox import EmailOutbox
 
 # Register your models here.
 
@@ -76,5 +77,20 @@ class ThrottleRecordAdmin(admin.ModelAdmin):
     ordering = ("-updated_at",)
 
 
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "to_email",
+        "subject",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "created_at",
+    )
+    search_fields = ("to_email", "subject")
+    list_filter = ("status",)
+    ordering = ("-created_at",)
+
+
 admin.site.register(Profile)
 admin.site.register(User, CustomUserAdmin)
@@ -3,11 +3,20 @@ from django.contrib.auth.password_validation import validate_password
 from django.core import exceptions
 from django.contrib.auth import authenticate
 from django.utils.translation import gettext_lazy as _
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 import re
 from django.core.exceptions import ValidationError as DjangoValidationError
 
+from uploads.fields import ImageRenditionsField
 from ...models import User, Profile
+from ...authentication import set_user_claims
+from ...revocation import is_token_revoked
 
 
 class CustomAuthTokenSerializer(serializers.Serializer):
@@ -102,6 +111,14 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     and prevents login if the user is not verified.
     """
 
+    @classmethod
+    def get_token(cls, user):
+        """
+        Embed profile, verification, staff and permission claims so
+        ClaimsJWTAuthentication can authenticate without DB hits.
+        """
+        return set_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         """
         Validates the user credentials and checks if the user is verified.
@@ -131,6 +148,37 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return validated_data
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh serializer that rejects revoked refresh tokens and those issued
+    before a password change, and re-reads the user claims for the new
+    access token.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if is_token_revoked(refresh):
+            raise AuthenticationFailed(
+                _("Token has been revoked."), code="token_revoked"
+            )
+        data = super().validate(attrs)
+        user = (
+            User.objects.select_related("profile")
+            .filter(pk=refresh[api_settings.USER_ID_CLAIM])
+            .first()
+        )
+        if user is None or refresh.get("token_version", 0) != (
+            user.token_version
+        ):
+            raise AuthenticationFailed(
+                _("Token is no longer valid."), code="token_revoked"
+            )
+
+        access = AccessToken(data["access"])
+        data["access"] = str(set_user_claims(access, user))
+        return data
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """
     Serializer to validate and process user password change requests.
@@ -191,6 +239,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     """
 
     email = serializers.EmailField(source="user.email", read_only=True)
+    image_renditions = ImageRenditionsField()
 
     class Meta:
         model = Profile
@@ -201,6 +250,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             "last_name",
             "description",
             "image",
+            "image_renditions",
         ]
 
     def validate_first_name(self, value):
@@ -30,6 +30,12 @@ urlpatterns = [
     ),
     path("jwt/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("jwt/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("jwt/logout/", views.JWTLogoutAPIView.as_view(), name="jwt-logout"),
+    path(
+        "logout-everywhere/",
+        views.LogoutEverywhereAPIView.as_view(),
+        name="logout-everywhere",
+    ),
     path(
         "change-password",
         views.ChangePasswordAPIView.as_view(),
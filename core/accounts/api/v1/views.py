@@ -5,7 +5,11 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.tokens import (
+    AccessToken,
+    RefreshToken,
+    Token as JWTToken,
+)
 from rest_framework_simplejwt.exceptions import TokenError
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
@@ -19,6 +23,8 @@ from ...utils import (
     APIVerificationResendThrottle,
 )
 from ...models import Profile
+from ...authentication import load_full_user, revoke_all_user_tokens
+from ...revocation import revoke_token
 from .serializers import (
     RegistrationSerializer,
     CustomAuthTokenSerializer,
@@ -121,6 +127,60 @@ class DiscardAuthToken(APIView):
         )
 
 
+class JWTLogoutAPIView(APIView):
+    """
+    API endpoint to revoke JWTs until they expire.
+
+    - Revokes the access token used for this request.
+    - Also revokes the refresh token passed as `refresh`, if any.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        if isinstance(request.auth, JWTToken):
+            revoke_token(request.auth)
+
+        raw_refresh = request.data.get("refresh")
+        if raw_refresh:
+            try:
+                refresh = RefreshToken(raw_refresh)
+            except TokenError:
+                return Response(
+                    {"detail": _("Invalid or expired refresh token.")},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if str(refresh.get("user_id")) != str(request.user.pk):
+                return Response(
+                    {"detail": _("Refresh token belongs to another user.")},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            revoke_token(refresh)
+
+        return Response(
+            {"detail": _("Logged out successfully.")},
+            status=status.HTTP_200_OK,
+        )
+
+
+class LogoutEverywhereAPIView(APIView):
+    """
+    API endpoint to log the user out of every device.
+
+    - Invalidates all issued JWTs (access and refresh) at once.
+    - Deletes the DRF authentication token.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        revoke_all_user_tokens(request.user)
+        return Response(
+            {"detail": _("Logged out from all devices.")},
+            status=status.HTTP_200_OK,
+        )
+
+
 class ChangePasswordAPIView(GenericAPIView):
     """
     API endpoint for allowing authenticated users to change their password.
@@ -139,7 +199,8 @@ class ChangePasswordAPIView(GenericAPIView):
     def put(self, request, *args, **kwargs):
         throttle = self.get_throttles()[0]
         throttle.record_attempt(request)
-        user = request.user
+        # Claims-based JWT users are partial; load the full row
+        user = load_full_user(request.user)
 
         # Initialize serializer with request data and user context
         serializer = self.get_serializer(
@@ -0,0 +1,300 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from django.db.models.fields.files import FieldFile
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User, Profile
+from .revocation import is_token_revoked
+
+# Fields left out of cached entries. They stay deferred on the rebuilt
+# instances, so reading them (e.g. `check_password`) loads them from the DB.
+USER_DEFERRED_FIELDS = {"password"}
+PROFILE_DEFERRED_FIELDS = {"description"}
+
+
+def _cached_attnames(model, deferred):
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname not in deferred
+    ]
+
+
+USER_CACHED_FIELDS = _cached_attnames(User, USER_DEFERRED_FIELDS)
+PROFILE_CACHED_FIELDS = _cached_attnames(Profile, PROFILE_DEFERRED_FIELDS)
+
+
+def get_token_cache():
+    return caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+
+
+def token_cache_key(key):
+    return f"auth_token:{key}"
+
+
+def user_token_cache_key(user_id):
+    return f"auth_token_user:{user_id}"
+
+
+def _raw_values(instance, attnames):
+    """
+    Values of `attnames` in the form `from_db` takes them: a file is
+    stored by name, not as a FieldFile bound to instance and storage.
+    """
+    values = []
+    for name in attnames:
+        value = getattr(instance, name)
+        if isinstance(value, FieldFile):
+            value = value.name
+        values.append(value)
+    return values
+
+
+def cache_token_entry(token):
+    """
+    Store the token's user and profile summary in the cache.
+    """
+    user = token.user
+    profile = getattr(user, "profile", None)
+    entry = {
+        "user": _raw_values(user, USER_CACHED_FIELDS),
+        "profile": (
+            _raw_values(profile, PROFILE_CACHED_FIELDS) if profile else None
+        ),
+    }
+    timeout = settings.AUTH_TOKEN_CACHE_TIMEOUT
+    get_token_cache().set_many(
+        {
+            token_cache_key(token.key): entry,
+            user_token_cache_key(user.pk): token.key,
+        },
+        timeout,
+    )
+
+
+def build_cached_user(entry):
+    """
+    Rebuild User (and its Profile) instances from a cached entry
+    without touching the database.
+    """
+    user = User.from_db(DEFAULT_DB_ALIAS, USER_CACHED_FIELDS, entry["user"])
+    if entry["profile"] is not None:
+        profile = Profile.from_db(
+            DEFAULT_DB_ALIAS, PROFILE_CACHED_FIELDS, entry["profile"]
+        )
+        profile._state.fields_cache["user"] = user
+        user._state.fields_cache["profile"] = profile
+    return user
+
+
+def invalidate_user_token(user_id):
+    """
+    Drop the cached entry of the user's token, if any.
+    """
+    cache = get_token_cache()
+    key = cache.get(user_token_cache_key(user_id))
+    if key:
+        cache.delete_many(
+            [token_cache_key(key), user_token_cache_key(user_id)]
+        )
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that caches token → (user, profile summary).
+
+    A cache hit authenticates the request and serves `request.user.profile`
+    without any query. Entries live for `AUTH_TOKEN_CACHE_TIMEOUT` seconds
+    and are dropped when the token is deleted, the password changes or the
+    user is deactivated (see accounts.signals).
+    """
+
+    def authenticate_credentials(self, key):
+        entry = get_token_cache().get(token_cache_key(key))
+        if entry is not None:
+            user = build_cached_user(entry)
+            if not user.is_active:
+                raise exceptions.AuthenticationFailed(
+                    _("User inactive or deleted.")
+                )
+            return user, Token(key=key, user=user)
+
+        try:
+            token = Token.objects.select_related("user__profile").get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _("User inactive or deleted.")
+            )
+
+        cache_token_entry(token)
+        return token.user, token
+
+
+# Permissions embedded in JWT claims, answered by ClaimsPermissionBackend
+CLAIM_PERMISSIONS = {"blog.add_post": "can_add_post"}
+
+
+def set_user_claims(token, user):
+    """
+    Embed the claims needed by the hot paths into a JWT.
+    """
+    profile = getattr(user, "profile", None)
+    token["profile_id"] = profile.id if profile else None
+    token["is_verified"] = user.is_verified
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token["token_version"] = user.token_version
+    for perm, claim in CLAIM_PERMISSIONS.items():
+        token[claim] = user.has_perm(perm)
+    return token
+
+
+def token_version_cache_key(user_id):
+    return f"token_version:{user_id}"
+
+
+def cache_token_version(user):
+    """
+    Publish the user's current token version (-1 once deactivated).
+    """
+    version = user.token_version if user.is_active else -1
+    get_token_cache().set(
+        token_version_cache_key(user.pk),
+        version,
+        api_settings.REFRESH_TOKEN_LIFETIME.total_seconds(),
+    )
+
+
+def get_token_version(user_id):
+    """
+    Return the user's current token version, from the cache when possible.
+    """
+    version = get_token_cache().get(token_version_cache_key(user_id))
+    if version is not None:
+        return version
+
+    user = (
+        User.objects.filter(pk=user_id)
+        .only("token_version", "is_active")
+        .first()
+    )
+    if user is None:
+        return -1
+    cache_token_version(user)
+    return user.token_version if user.is_active else -1
+
+
+def build_claims_user(validated_token):
+    """
+    Build a User and its Profile from JWT claims without a DB hit.
+    Fields that are not in the claims stay deferred and load on access.
+    """
+    user_id = User._meta.pk.to_python(
+        validated_token[api_settings.USER_ID_CLAIM]
+    )
+    user = _from_values(
+        User,
+        {
+            "id": user_id,
+            "is_active": True,
+            "is_verified": validated_token["is_verified"],
+            "is_staff": validated_token["is_staff"],
+            "is_superuser": validated_token.get("is_superuser", False),
+            "token_version": validated_token.get("token_version", 0),
+        },
+    )
+    user.claimed_perms = {
+        perm
+        for perm, claim in CLAIM_PERMISSIONS.items()
+        if validated_token.get(claim)
+    }
+    if validated_token["profile_id"] is not None:
+        profile = _from_values(
+            Profile, {"id": validated_token["profile_id"], "user_id": user_id}
+        )
+        profile._state.fields_cache["user"] = user
+        user._state.fields_cache["profile"] = profile
+    return user
+
+
+def _from_values(model, values):
+    names = [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname in values
+    ]
+    return model.from_db(
+        DEFAULT_DB_ALIAS, names, [values[name] for name in names]
+    )
+
+
+def revoke_all_user_tokens(user):
+    """
+    Log the user out everywhere: bump the token version, which rejects
+    every issued JWT, and delete the DRF auth token.
+    """
+    User.objects.filter(pk=user.pk).update(
+        token_version=F("token_version") + 1
+    )
+    user.refresh_from_db(fields=["token_version", "is_active"])
+    cache_token_version(user)
+    Token.objects.filter(user_id=user.pk).delete()
+
+
+def load_full_user(user):
+    """
+    Load all deferred fields of a token-built user in one query.
+    Used by sensitive actions such as password changes.
+    """
+    deferred = user.get_deferred_fields()
+    if deferred:
+        user.refresh_from_db(fields=deferred)
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the user claims embedded by
+    CustomTokenObtainPairSerializer.
+
+    Access tokens carrying `profile_id` are turned into a lightweight user
+    without loading the User or Profile rows; only the token version is
+    checked (from the cache) so a password change or deactivation rejects
+    older tokens. Tokens without these claims fall back to a DB load.
+    Tokens in the revocation list (see accounts.revocation) are rejected.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_token_revoked(validated_token):
+            raise InvalidToken(_("Token has been revoked."))
+        return validated_token
+
+    def get_user(self, validated_token):
+        if "profile_id" not in validated_token:
+            user = super().get_user(validated_token)
+            if validated_token.get("token_version", 0) != user.token_version:
+                raise exceptions.AuthenticationFailed(
+                    _("Token is no longer valid."), code="token_revoked"
+                )
+            return user
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if validated_token.get("token_version", 0) != get_token_version(
+            user_id
+        ):
+            raise exceptions.AuthenticationFailed(
+                _("Token is no longer valid."), code="token_revoked"
+            )
+        return build_claims_user(validated_token)
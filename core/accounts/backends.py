@@ -0,0 +1,35 @@
+from django.contrib.auth.backends import BaseBackend, ModelBackend
+from django.core.exceptions import PermissionDenied
+
+from .authentication import CLAIM_PERMISSIONS
+from .request_user import load_request_user
+
+
+class ClaimsPermissionBackend(BaseBackend):
+    """
+    Answers permission checks from JWT claims for users built by
+    ClaimsJWTAuthentication, so `has_perm("blog.add_post")` does not load
+    the permission tables. Other users and permissions fall through to
+    the next backend.
+    """
+
+    def has_perm(self, user_obj, perm, obj=None):
+        claimed = getattr(user_obj, "claimed_perms", None)
+        if claimed is None or obj is not None or perm not in CLAIM_PERMISSIONS:
+            return False
+        if perm in claimed:
+            return True
+        # Stop ModelBackend from querying: the claim is authoritative
+        raise PermissionDenied
+
+
+class RequestUserBackend(ModelBackend):
+    """
+    ModelBackend that loads the user, its profile and its permission names
+    in one joined query, cached per user (see accounts.request_user).
+    `request.user.profile` and `has_perm()` then need no further query.
+    """
+
+    def get_user(self, user_id):
+        user = load_request_user(user_id)
+        return user if user and self.user_can_authenticate(user) else None
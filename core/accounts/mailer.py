@@ -0,0 +1,175 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from mail_templated import EmailMessage
+
+from .models.email_outbox import EmailOutbox
+
+
+def enqueue_email(template_name, context, to_email):
+    """
+    Render a mail_templated template once and store it in the outbox.
+    The message is delivered later by `dispatch_outbox`.
+    """
+    message = EmailMessage(
+        template_name=template_name,
+        context=context,
+        from_email=settings.EMAIL_HOST_USER,
+        to=[to_email],
+        render=True,
+    )
+    body = message.body or ""
+    if message.content_subtype == "html":
+        # Templates with only an html block render it as the body
+        body, html_body = "", body
+    else:
+        html_body = next(
+            (
+                content
+                for content, mimetype in message.alternatives
+                if mimetype == "text/html"
+            ),
+            "",
+        )
+    return EmailOutbox.objects.create(
+        to_email=to_email,
+        from_email=message.from_email or "",
+        subject=message.subject or "",
+        body=body,
+        html_body=html_body,
+    )
+
+
+def build_message(entry, connection):
+    """
+    Build a Django email message from an outbox entry.
+    """
+    message = EmailMultiAlternatives(
+        subject=entry.subject,
+        body=entry.body or entry.html_body,
+        from_email=entry.from_email or None,
+        to=[entry.to_email],
+        connection=connection,
+    )
+    if not entry.body:
+        message.content_subtype = "html"
+    elif entry.html_body:
+        message.attach_alternative(entry.html_body, "text/html")
+    return message
+
+
+def schedule_retry(entry, error, now):
+    """
+    Record a failed delivery and back off exponentially, giving up
+    after `EMAIL_OUTBOX_MAX_ATTEMPTS`.
+    """
+    entry.attempts += 1
+    entry.last_error = str(error)[:1000]
+    if entry.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        entry.status = EmailOutbox.STATUS_FAILED
+    else:
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (entry.attempts - 1)
+        entry.next_attempt_at = now + timedelta(seconds=delay)
+
+
+def claim_batch(batch_size, now):
+    """
+    Claim up to `batch_size` due entries for this dispatcher.
+
+    The rows are locked with `SKIP LOCKED` only while their
+    `next_attempt_at` is pushed past `EMAIL_OUTBOX_CLAIM_TIMEOUT`; once
+    committed, other dispatchers no longer see them as due, so no
+    transaction stays open while SMTP is slow. Entries of a dispatcher
+    that dies are retried when the claim runs out.
+    """
+    with transaction.atomic():
+        entries = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=EmailOutbox.STATUS_PENDING,
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        claimed_until = now + timedelta(
+            seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+        )
+        EmailOutbox.objects.filter(
+            pk__in=[entry.pk for entry in entries]
+        ).update(next_attempt_at=claimed_until)
+    return entries
+
+
+def dispatch_outbox(batch_size=None, max_batches=None, connection=None):
+    """
+    Drain due outbox entries in batches over one persistent connection.
+
+    Each batch is claimed in a short transaction (see `claim_batch`),
+    sent outside of it and its results saved afterwards. A custom
+    `connection` (e.g. one pointing to a local SMTP stand-in) can be
+    passed for testing. Returns the number of sent messages.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    connection = connection or get_connection()
+    sent = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        now = timezone.now()
+        entries = claim_batch(batch_size, now)
+        if not entries:
+            break
+
+        try:
+            connection.open()
+        except Exception as error:
+            # Server unreachable: retry the whole batch later
+            for entry in entries:
+                schedule_retry(entry, error, now)
+            EmailOutbox.objects.bulk_update(
+                entries,
+                ["attempts", "last_error", "status", "next_attempt_at"],
+            )
+            break
+
+        for entry in entries:
+            try:
+                connection.send_messages([build_message(entry, connection)])
+            except Exception as error:
+                schedule_retry(entry, error, now)
+            else:
+                entry.status = EmailOutbox.STATUS_SENT
+                entry.sent_at = timezone.now()
+                sent += 1
+
+        EmailOutbox.objects.bulk_update(
+            entries,
+            [
+                "attempts",
+                "last_error",
+                "status",
+                "next_attempt_at",
+                "sent_at",
+            ],
+        )
+        batches += 1
+
+    connection.close()
+    return sent
+
+
+def purge_sent_outbox(days=None):
+    """
+    Delete emails sent more than `days` (default
+    `EMAIL_OUTBOX_RETENTION_DAYS`) ago. Failed entries are kept for
+    inspection. Returns the number of deleted entries.
+    """
+    if days is None:
+        days = settings.EMAIL_OUTBOX_RETENTION_DAYS
+    deleted, _ = EmailOutbox.objects.filter(
+        status=EmailOutbox.STATUS_SENT,
+        sent_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()
+    return deleted
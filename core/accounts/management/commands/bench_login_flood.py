@@ -0,0 +1,155 @@
+import statistics
+import threading
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from accounts.models.throttle_records import ThrottleRecord
+from accounts.throttle_storages import get_throttle_storage
+from accounts.utils import AdaptiveDBThrottle, CustomThrottleException
+from blog.models import Category, Post
+
+BENCH_SCOPE = "bench_login_flood"
+DATABASE_STORAGE = "accounts.throttle_storages.DatabaseThrottleStorage"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure content query latency while failed logins flood the "
+        "ThrottleRecord table, with the throttle table in the content "
+        "database and in HOT_WRITE_DATABASE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seconds", type=float, default=5, help="Duration per phase."
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=4,
+            help="Threads running content queries.",
+        )
+        parser.add_argument(
+            "--flooders",
+            type=int,
+            default=8,
+            help="Threads sending failed logins.",
+        )
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=500,
+            help="Distinct client IPs of the flood.",
+        )
+
+    def handle(self, *args, **options):
+        self.run_phase("no flood", 0, options)
+        with override_settings(HOT_WRITE_DATABASE=None):
+            self.run_phase("flood, shared database", None, options)
+        if settings.HOT_WRITE_DATABASE:
+            self.run_phase(
+                f"flood, {settings.HOT_WRITE_DATABASE} database", None, options
+            )
+        else:
+            self.stdout.write(
+                "flood, hot-write database: skipped (HOT_WRITE_DATABASE is "
+                "not set)"
+            )
+
+    def run_phase(self, label, flooders, options):
+        """
+        Run readers and `flooders` (default --flooders) flood threads for
+        --seconds and report the content query latency.
+        """
+        if flooders is None:
+            flooders = options["flooders"]
+        stop = threading.Event()
+        latencies, errors, attempts = [], [0], [0]
+        threads = [
+            threading.Thread(target=self.read, args=(stop, latencies, errors))
+            for _ in range(options["readers"])
+        ] + [
+            threading.Thread(
+                target=self.flood,
+                args=(stop, index, options["clients"], attempts),
+            )
+            for index in range(flooders)
+        ]
+
+        ThrottleRecord.objects.filter(scope=BENCH_SCOPE).delete()
+        for thread in threads:
+            thread.start()
+        time.sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        ThrottleRecord.objects.filter(scope=BENCH_SCOPE).delete()
+
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: {len(latencies)} content queries, "
+                f"p50 {statistics.median(latencies or [0]) * 1000:.2f}ms, "
+                f"p99 {p99 * 1000:.2f}ms, {errors[0]} errors; "
+                f"{attempts[0]} failed logins"
+            )
+        )
+
+    def read(self, stop, latencies, errors):
+        """
+        Run the post list queries until `stop` is set.
+        """
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    list(
+                        Post.objects.filter(
+                            status=True, published_date__lte=timezone.now()
+                        )
+                        .select_related("author", "category")
+                        .order_by("-published_date")[:10]
+                    )
+                    list(Category.objects.all())
+                except DatabaseError:
+                    errors[0] += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+        finally:
+            connections.close_all()
+
+    def flood(self, stop, index, clients, attempts):
+        """
+        Send failed logins (a throttle check and an attempt) from rotating
+        client IPs until `stop` is set.
+        """
+        storage = get_throttle_storage(DATABASE_STORAGE)
+        factory = RequestFactory()
+        count = 0
+        try:
+            while not stop.is_set():
+                client = (index * 7919 + count) % clients
+                request = factory.post(
+                    "/accounts/login/",
+                    REMOTE_ADDR=f"10.1.{client // 256}.{client % 256}",
+                )
+                throttle = AdaptiveDBThrottle()
+                throttle.storage = storage
+                throttle.scope = BENCH_SCOPE
+                throttle.allowed_attempts = 5
+                throttle.base_window = 60
+                try:
+                    throttle.allow_request(request, None)
+                    throttle.record_attempt(request)
+                except CustomThrottleException:
+                    pass
+                count += 1
+        finally:
+            attempts[0] += count
+            connections.close_all()
@@ -0,0 +1,83 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.middleware import REQUEST_USER_BACKEND
+from accounts.models import User
+
+ENGINES = (
+    "django.contrib.sessions.backends.db",
+    "accounts.sessions",
+)
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test session handling: DB queries, DB writes and session "
+        "table hits per request for the DB and Redis session engines, "
+        "plus Vary: Cookie / Set-Cookie on anonymous list pages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Requests per page and client type.",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(
+            email="bench-sessions@example.com", password=None
+        )
+        try:
+            for engine in ENGINES:
+                with override_settings(
+                    SESSION_ENGINE=engine, ALLOWED_HOSTS=["testserver"]
+                ):
+                    self.run(engine, user, options["requests"])
+        finally:
+            user.delete()
+
+    def run(self, engine, user, requests):
+        pages = [reverse("blog:post-list"), reverse("blog:api-v1:post-list")]
+        member = Client()
+        member.force_login(user, backend=REQUEST_USER_BACKEND)
+        self.stdout.write(self.style.MIGRATE_HEADING(engine))
+
+        for label, client_factory in (
+            ("anonymous", Client),
+            ("authenticated", lambda: member),
+        ):
+            varies = cookies = 0
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(requests):
+                    for page in pages:
+                        # A fresh anonymous client per request: no cookies
+                        response = client_factory().get(page)
+                        varies += "Cookie" in response.get("Vary", "")
+                        cookies += "sessionid" in response.cookies
+                elapsed = time.perf_counter() - started
+
+            total = requests * len(pages)
+            sqls = [query["sql"] for query in queries]
+            writes = sum(
+                sql.lstrip().upper().startswith(WRITE_PREFIXES) for sql in sqls
+            )
+            session_hits = sum("django_session" in sql for sql in sqls)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"  {label}: "
+                    f"{len(sqls) / total:.2f} queries/request, "
+                    f"{writes / total:.2f} writes/request, "
+                    f"{session_hits / total:.2f} session queries/request, "
+                    f"Vary: Cookie on {varies}/{total}, "
+                    f"session cookie set on {cookies}/{total}, "
+                    f"{elapsed / total * 1000:.3f}ms/request"
+                )
+            )
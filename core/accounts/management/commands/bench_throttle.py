@@ -0,0 +1,118 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from accounts.models.throttle_records import ThrottleRecord
+from accounts.throttle_storages import (
+    RedisThrottleStorage,
+    get_throttle_storage,
+)
+from accounts.utils import AdaptiveDBThrottle, CustomThrottleException
+
+BACKENDS = {
+    "db": "accounts.throttle_storages.DatabaseThrottleStorage",
+    "redis": "accounts.throttle_storages.RedisThrottleStorage",
+}
+BENCH_SCOPE = "bench_throttle"
+
+
+class Command(BaseCommand):
+    help = "Compare throttle storage backends under concurrent load."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            choices=[*BACKENDS, "all"],
+            default="all",
+            help="Storage backend to benchmark.",
+        )
+        parser.add_argument(
+            "--threads", type=int, default=16, help="Concurrent workers."
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Simulated failed logins per backend.",
+        )
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=50,
+            help="Distinct client IPs sharing the load.",
+        )
+
+    def handle(self, *args, **options):
+        names = (
+            list(BACKENDS)
+            if options["backend"] == "all"
+            else [options["backend"]]
+        )
+        for name in names:
+            self.run_backend(name, options)
+
+    def run_backend(self, name, options):
+        """
+        Run `allow_request` + `record_attempt` (a failed login) for
+        every simulated request and report throughput and latency.
+        """
+        storage = get_throttle_storage(BACKENDS[name])
+        factory = RequestFactory()
+        clients = options["clients"]
+
+        def attempt(i):
+            request = factory.post(
+                "/accounts/login/",
+                REMOTE_ADDR=f"10.0.{i % clients // 256}.{i % clients % 256}",
+            )
+            throttle = AdaptiveDBThrottle()
+            throttle.storage = storage
+            throttle.scope = BENCH_SCOPE
+            throttle.allowed_attempts = 5
+            throttle.base_window = 60
+
+            started = time.perf_counter()
+            blocked = False
+            try:
+                throttle.allow_request(request, None)
+                throttle.record_attempt(request)
+            except CustomThrottleException:
+                blocked = True
+            return time.perf_counter() - started, blocked
+
+        self.clear_state(storage)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+            results = list(pool.map(attempt, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+        self.clear_state(storage)
+
+        latencies = sorted(latency for latency, _ in results)
+        blocked = sum(1 for _, is_blocked in results if is_blocked)
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name}: {len(results) / elapsed:.0f} req/s, "
+                f"p50 {statistics.median(latencies) * 1000:.2f}ms, "
+                f"p99 {p99 * 1000:.2f}ms, {blocked} blocked"
+            )
+        )
+
+    def clear_state(self, storage):
+        """
+        Forget the benchmark clients: their ThrottleRecord rows and, for
+        the Redis backend, their `throttle:<scope>:*` keys.
+        """
+        ThrottleRecord.objects.filter(scope=BENCH_SCOPE).delete()
+        if isinstance(storage, RedisThrottleStorage):
+            pattern = f"{storage.key_prefix}:{BENCH_SCOPE}:*"
+            keys = []
+            for key in storage.client.scan_iter(match=pattern, count=1000):
+                keys.append(key)
+                if len(keys) >= 1000:
+                    storage.client.delete(*keys)
+                    keys = []
+            if keys:
+                storage.client.delete(*keys)
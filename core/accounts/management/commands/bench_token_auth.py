@@ -0,0 +1,57 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+
+from accounts.authentication import CachedTokenAuthentication
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare queries and time per request for TokenAuthentication "
+        "and CachedTokenAuthentication (authenticate + request.user.profile)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1000,
+            help="Simulated requests per authentication class.",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(
+            email="bench-token-auth@example.com", password=None
+        )
+        token = Token.objects.create(user=user)
+        factory = APIRequestFactory()
+        try:
+            for auth_class in (TokenAuthentication, CachedTokenAuthentication):
+                self.run(auth_class, token, factory, options["requests"])
+        finally:
+            user.delete()
+
+    def run(self, auth_class, token, factory, requests):
+        auth = auth_class()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for _ in range(requests):
+                request = factory.get(
+                    "/", HTTP_AUTHORIZATION=f"Token {token.key}"
+                )
+                user, _ = auth.authenticate(request)
+                user.profile.id  # as used by the comment/report actions
+            elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{auth_class.__name__}: "
+                f"{len(queries) / requests:.2f} queries/request, "
+                f"{elapsed / requests * 1000:.3f}ms/request"
+            )
+        )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from accounts.staff_permissions import sync_staff_permissions
+
+
+class Command(BaseCommand):
+    help = "Grant the 'blog.add_post' permission to existing staff users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Permission rows inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        updated = sync_staff_permissions(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Granted 'add_post' to {updated} user(s).")
+        )
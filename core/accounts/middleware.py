@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .models import User
+from .request_user import build_request_user, get_request_user_entry
+
+REQUEST_USER_BACKEND = "accounts.backends.RequestUserBackend"
+
+
+def get_session_user(request):
+    """
+    Return the session user from the request user cache, or None when the
+    session was not created by RequestUserBackend or does not match the
+    cached entry.
+    """
+    session = request.session
+    if (
+        session.get(BACKEND_SESSION_KEY) != REQUEST_USER_BACKEND
+        or REQUEST_USER_BACKEND not in settings.AUTHENTICATION_BACKENDS
+        or SESSION_KEY not in session
+    ):
+        return None
+
+    entry = get_request_user_entry(
+        User._meta.pk.to_python(session[SESSION_KEY])
+    )
+    session_hash = session.get(HASH_SESSION_KEY)
+    if (
+        entry is None
+        or not session_hash
+        or not constant_time_compare(session_hash, entry["session_hash"])
+    ):
+        return None
+
+    user = build_request_user(entry)
+    return user if user.is_active else None
+
+
+def get_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = get_session_user(request) or auth.get_user(
+            request
+        )
+    return request._cached_user
+
+
+class RequestUserMiddleware(AuthenticationMiddleware):
+    """
+    Drop-in replacement for AuthenticationMiddleware.
+
+    Sessions created by RequestUserBackend are verified against the cached
+    session hash, so on a cache hit `request.user`, its profile and its
+    permissions cost no query. Anything else (other backends, a hash
+    mismatch, secret key rotation) goes through `auth.get_user()`.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.15 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_throttlerecord_last_blocked_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="throttlerecord",
+            index=models.Index(
+                fields=["scope", "expires_at"],
+                name="accounts_th_scope_64a32e_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="throttlerecord",
+            index=models.Index(
+                fields=["scope", "last_blocked_at"],
+                name="accounts_th_scope_150f16_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.15 on 2026-10-19 11:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_throttlerecord_purge_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("to_email", models.EmailField(max_length=256)),
+                ("from_email", models.CharField(blank=True, max_length=256)),
+                ("subject", models.CharField(blank=True, max_length=256)),
+                ("body", models.TextField(blank=True)),
+                ("html_body", models.TextField(blank=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("last_error", models.TextField(blank=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="accounts_em_status_943736_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.15 on 2026-10-19 11:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0010_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="token_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.15 on 2026-10-19 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_profile_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                db_index=True,
+                default="defaults/default_profile.png",
+                null=True,
+                upload_to="profile_images/",
+            ),
+        ),
+    ]
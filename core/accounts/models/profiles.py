@@ -11,11 +11,17 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     first_name = models.CharField(max_length=256)
     last_name = models.CharField(max_length=256)
+    # Indexed for the media access checks (uploads.access)
     image = models.ImageField(
         upload_to="profile_images/",
         default="defaults/default_profile.png",
         blank=True,
         null=True,
+        db_index=True,
+    )
+    # Rendition manifest of `image`, filled by uploads.tasks
+    image_renditions = models.JSONField(
+        default=dict, blank=True, editable=False
     )
     description = models.TextField(blank=True, null=True)
     score = models.PositiveIntegerField(default=50)
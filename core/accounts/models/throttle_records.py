@@ -23,4 +23,7 @@ class ThrottleRecord(models.Model):
         ordering = ["-updated_at"]
         indexes = [
             models.Index(fields=["ident", "scope"]),
+            # Support the per-scope purge in `clear_throttle_after_grace`
+            models.Index(fields=["scope", "expires_at"]),
+            models.Index(fields=["scope", "last_blocked_at"]),
         ]
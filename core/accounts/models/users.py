@@ -52,6 +52,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     is_verified = models.BooleanField(default=False)
+    # Bumped on password change; JWTs carrying an older version are rejected
+    token_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -61,5 +63,56 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    # Fields whose changes are reported in `dirty_fields` during post_save
+    TRACKED_FIELDS = ("is_staff", "is_superuser")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_tracked_values()
+        return instance
+
+    def _remember_tracked_values(self):
+        deferred = self.get_deferred_fields()
+        self._tracked_values = {
+            name: getattr(self, name)
+            for name in self.TRACKED_FIELDS
+            if name not in deferred
+        }
+
+    def get_dirty_fields(self):
+        """
+        Return the tracked fields changed since the instance was loaded.
+        For unsaved instances, the tracked fields that are set.
+        """
+        loaded = getattr(self, "_tracked_values", None)
+        if loaded is None:
+            return {
+                name for name in self.TRACKED_FIELDS if getattr(self, name)
+            }
+        return {
+            name
+            for name, value in loaded.items()
+            if getattr(self, name) != value
+        }
+
+    def save(self, *args, **kwargs):
+        """
+        Bump `token_version` when a new password is saved, so JWTs issued
+        for the old password are rejected. The tracked fields changed by
+        this save are exposed as `dirty_fields` to post_save receivers.
+        """
+        update_fields = kwargs.get("update_fields")
+        if self.pk and self._password is not None:
+            self.token_version += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+
+        self.dirty_fields = self.get_dirty_fields()
+        if update_fields is not None:
+            self.dirty_fields &= set(update_fields)
+        super().save(*args, **kwargs)
+        self._remember_tracked_values()
+
     def __str__(self):
         return self.email
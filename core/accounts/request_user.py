@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from .authentication import (
+    PROFILE_CACHED_FIELDS,
+    USER_CACHED_FIELDS,
+    build_cached_user,
+)
+from .models import User
+
+# Permission paths followed by the joined query: direct and via groups
+PERMISSION_PATHS = ("user_permissions", "groups__permissions")
+
+
+def get_request_user_cache():
+    return caches[settings.REQUEST_USER_CACHE_ALIAS]
+
+
+def request_user_cache_key(user_id):
+    return f"request_user:{user_id}"
+
+
+def fetch_request_user_entry(user_id):
+    """
+    Load the user, its profile and its permission names in one joined
+    query. Returns a cache entry, or None when the user does not exist.
+
+    The query returns one row per (user permission, group permission)
+    pair, which stays small for the handful of permissions users have.
+    """
+    profile_lookups = [f"profile__{name}" for name in PROFILE_CACHED_FIELDS]
+    permission_lookups = [
+        lookup
+        for path in PERMISSION_PATHS
+        for lookup in (f"{path}__content_type__app_label", f"{path}__codename")
+    ]
+    rows = list(
+        User.objects.filter(pk=user_id).values_list(
+            *USER_CACHED_FIELDS,
+            "password",
+            *profile_lookups,
+            *permission_lookups,
+        )
+    )
+    if not rows:
+        return None
+
+    user_count = len(USER_CACHED_FIELDS)
+    profile_start = user_count + 1
+    profile_end = profile_start + len(profile_lookups)
+    first = rows[0]
+    user_values = list(first[:user_count])
+    profile_values = list(first[profile_start:profile_end])
+
+    perms = set()
+    for row in rows:
+        pairs = row[profile_end:]
+        for app_label, codename in zip(pairs[::2], pairs[1::2]):
+            if codename is not None:
+                perms.add(f"{app_label}.{codename}")
+
+    user = User(password=first[user_count])
+    return {
+        "user": user_values,
+        "profile": profile_values if profile_values[0] is not None else None,
+        "perms": sorted(perms),
+        "session_hash": user.get_session_auth_hash(),
+    }
+
+
+def build_request_user(entry):
+    """
+    Rebuild the user from a cached entry, with its profile attached and
+    its permission cache primed so ModelBackend checks need no query.
+    """
+    user = build_cached_user(entry)
+    if not user.is_superuser:
+        # Superusers pass every check before reaching the backends
+        user._perm_cache = set(entry["perms"])
+    return user
+
+
+def get_request_user_entry(user_id):
+    """
+    Return the cached entry for `user_id`, loading it on a miss.
+    """
+    cache = get_request_user_cache()
+    key = request_user_cache_key(user_id)
+    entry = cache.get(key)
+    if entry is None:
+        entry = fetch_request_user_entry(user_id)
+        if entry is not None:
+            cache.set(key, entry, settings.REQUEST_USER_CACHE_TIMEOUT)
+    return entry
+
+
+def load_request_user(user_id):
+    entry = get_request_user_entry(user_id)
+    return build_request_user(entry) if entry is not None else None
+
+
+def invalidate_request_user(*user_ids):
+    """
+    Drop the cached entries of the given users.
+    """
+    if user_ids:
+        get_request_user_cache().delete_many(
+            [request_user_cache_key(user_id) for user_id in user_ids]
+        )
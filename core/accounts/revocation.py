@@ -0,0 +1,189 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from django.conf import settings
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = "jwt_revoked"
+REVOCATION_STREAM = "jwt_revocations"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    `in` never gives false negatives; false positives happen at roughly
+    `error_rate` once `capacity` items were added.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(
+            8,
+            int(-capacity * math.log(error_rate) / (math.log(2) ** 2)),
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return (
+            (first + i * second) % self.size for i in range(self.hash_count)
+        )
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """
+    JWT revocation list stored in Redis with a per-process Bloom filter.
+
+    Each revoked `jti` is a Redis key expiring with the token and an entry
+    in a stream. Every process replays the stream into its Bloom filter
+    (incrementally every `JWT_REVOCATION_SYNC_INTERVAL` seconds and fully
+    every `JWT_REVOCATION_REBUILD_INTERVAL` to drop expired tokens), so the
+    common "not revoked" answer needs no network hop; only Bloom hits are
+    confirmed in Redis. Revocations from other processes are seen after at
+    most one sync interval.
+    """
+
+    def __init__(self):
+        from django_redis import get_redis_connection
+
+        self.client = get_redis_connection(settings.JWT_REVOCATION_REDIS_ALIAS)
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.last_stream_id = "0-0"
+        self.synced_at = 0
+        self.built_at = 0
+
+    def revoke(self, jti, exp):
+        """
+        Revoke a token until its expiry timestamp `exp`.
+        """
+        ttl = int(exp - time.time())
+        if ttl <= 0:
+            return  # Already expired
+
+        pipe = self.client.pipeline()
+        pipe.set(f"{REVOKED_KEY_PREFIX}:{jti}", 1, ex=ttl)
+        # Entries older than the longest token lifetime can be trimmed
+        oldest = int(
+            (time.time() - api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+            * 1000
+        )
+        pipe.xadd(
+            REVOCATION_STREAM,
+            {"jti": jti, "exp": int(exp)},
+            minid=oldest,
+            approximate=True,
+        )
+        pipe.execute()
+
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def is_revoked(self, jti):
+        self._sync()
+        if jti not in self.bloom:
+            return False
+        return bool(self.client.exists(f"{REVOKED_KEY_PREFIX}:{jti}"))
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self.synced_at < settings.JWT_REVOCATION_SYNC_INTERVAL:
+            return
+
+        with self.lock:
+            if now - self.synced_at < settings.JWT_REVOCATION_SYNC_INTERVAL:
+                return
+            rebuild = (
+                self.bloom is None
+                or now - self.built_at
+                > settings.JWT_REVOCATION_REBUILD_INTERVAL
+            )
+            if rebuild:
+                bloom = BloomFilter(
+                    settings.JWT_REVOCATION_BLOOM_CAPACITY,
+                    settings.JWT_REVOCATION_BLOOM_ERROR_RATE,
+                )
+                self.last_stream_id = "0-0"
+            else:
+                bloom = self.bloom
+
+            self.last_stream_id = self._replay(bloom, self.last_stream_id)
+            self.bloom = bloom
+            self.synced_at = now
+            if rebuild:
+                self.built_at = now
+
+    def _replay(self, bloom, last_id, batch_size=1000):
+        """
+        Add stream entries after `last_id` that did not expire yet.
+        """
+        now = time.time()
+        while True:
+            entries = self.client.xrange(
+                REVOCATION_STREAM, min=f"({last_id}", count=batch_size
+            )
+            for entry_id, fields in entries:
+                last_id = entry_id.decode()
+                if int(fields[b"exp"]) > now:
+                    bloom.add(fields[b"jti"].decode())
+            if len(entries) < batch_size:
+                return last_id
+
+
+_revocation_list = None
+
+
+def get_revocation_list():
+    """
+    Return the per-process revocation list.
+    """
+    global _revocation_list
+    if _revocation_list is None:
+        _revocation_list = RevocationList()
+    return _revocation_list
+
+
+def revoke_token(token):
+    """
+    Revoke a validated SimpleJWT token (access or refresh).
+    """
+    if not settings.JWT_REVOCATION_ENABLED:
+        return
+    get_revocation_list().revoke(token[api_settings.JTI_CLAIM], token["exp"])
+
+
+def is_token_revoked(token):
+    """
+    Whether the token is in the revocation list.
+
+    Fails open on Redis errors, like the throttles: the token is then
+    accepted, and only the `token_version` check of
+    ClaimsJWTAuthentication still rejects tokens issued before a
+    password change or logout everywhere.
+    """
+    if not settings.JWT_REVOCATION_ENABLED:
+        return False
+    try:
+        return get_revocation_list().is_revoked(token[api_settings.JTI_CLAIM])
+    except RedisError:
+        logger.warning("JWT revocation check failed", exc_info=True)
+        return False
@@ -1,42 +1,81 @@
 from django_celery_beat.models import PeriodicTask, CrontabSchedule
+import hashlib
 import json
 
+# Periodic tasks, staggered to avoid overload. Crontab fields default to
+# "*"; `periodic_tasks_fingerprint` lets prepare_app skip unchanged specs.
+PERIODIC_TASKS = [
+    # Task 1: Reset throttle levels daily at 1:00 AM
+    {
+        "name": "Reset Throttle Levels",
+        "task": "accounts.tasks.clear_throttle_after_grace",
+        "crontab": {"minute": "0", "hour": "1"},
+    },
+    # Task 2: Add monthly score to active users at 1:10 AM
+    {
+        "name": "Monthly Add Score to Active Users",
+        "task": "accounts.tasks.monthly_add_score",
+        "crontab": {"minute": "10", "hour": "1"},
+    },
+    # Task 3: Retry pending outbox emails every minute
+    {
+        "name": "Dispatch Email Outbox",
+        "task": "accounts.tasks.dispatch_email_outbox",
+        "crontab": {},
+    },
+    # Task 4: Purge sent outbox emails daily at 1:20 AM
+    {
+        "name": "Purge Sent Emails",
+        "task": "accounts.tasks.purge_sent_emails",
+        "crontab": {"minute": "20", "hour": "1"},
+    },
+    # Task 5: Weekly digest of new posts on Fridays at 9:00 AM
+    {
+        "name": "Weekly Posts Digest",
+        "task": "blog.tasks.send_weekly_digest",
+        "crontab": {"minute": "0", "hour": "9", "day_of_week": "5"},
+    },
+    # Task 6: Quarantine orphaned media files on Sundays at 3:30 AM
+    {
+        "name": "Collect Orphaned Media",
+        "task": "uploads.tasks.collect_orphaned_media",
+        "crontab": {"minute": "30", "hour": "3", "day_of_week": "0"},
+    },
+]
 
-def setup_periodic_tasks():
+CRONTAB_FIELDS = (
+    "minute",
+    "hour",
+    "day_of_week",
+    "day_of_month",
+    "month_of_year",
+)
+
+
+def periodic_tasks_fingerprint():
     """
-    Set up periodic tasks with different execution times to avoid overload.
+    Hash of the periodic task spec.
     """
+    spec = json.dumps(PERIODIC_TASKS, sort_keys=True).encode()
+    return hashlib.sha256(spec).hexdigest()
 
-    # Task 1: Reset throttle levels daily at 1:00 AM
-    throttle_reset_schedule, _ = CrontabSchedule.objects.get_or_create(
-        minute="0",
-        hour="1",
-        day_of_week="*",
-        day_of_month="*",
-        month_of_year="*",
-    )
-    PeriodicTask.objects.update_or_create(
-        name="Reset Throttle Levels",
-        defaults={
-            "crontab": throttle_reset_schedule,
-            "task": "accounts.tasks.clear_throttle_after_grace",
-            "kwargs": json.dumps({}),
-        },
-    )
 
-    # Task 2: Add monthly score to active users at 1:10 AM
-    score_schedule, _ = CrontabSchedule.objects.get_or_create(
-        minute="10",
-        hour="1",
-        day_of_week="*",
-        day_of_month="*",
-        month_of_year="*",
-    )
-    PeriodicTask.objects.update_or_create(
-        name="Monthly Add Score to Active Users",
-        defaults={
-            "crontab": score_schedule,
-            "task": "accounts.tasks.monthly_add_score",
-            "kwargs": json.dumps({}),
-        },
-    )
+def setup_periodic_tasks():
+    """
+    Create or update the periodic tasks of PERIODIC_TASKS.
+    """
+    for spec in PERIODIC_TASKS:
+        schedule, _ = CrontabSchedule.objects.get_or_create(
+            **{
+                field: spec["crontab"].get(field, "*")
+                for field in CRONTAB_FIELDS
+            }
+        )
+        PeriodicTask.objects.update_or_create(
+            name=spec["name"],
+            defaults={
+                "crontab": schedule,
+                "task": spec["task"],
+                "kwargs": json.dumps(spec.get("kwargs", {})),
+            },
+        )
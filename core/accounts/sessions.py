@@ -0,0 +1,27 @@
+from django.contrib.sessions.backends.cache import (
+    SessionStore as CacheSessionStore,
+)
+
+
+class SessionStore(CacheSessionStore):
+    """
+    Redis session engine (through the `SESSION_CACHE_ALIAS` cache) that
+    leaves cookieless requests alone.
+
+    Session data is loaded from Redis on first access only. A request
+    without a session cookie can read the (empty) session without marking
+    it accessed, so SessionMiddleware neither saves it nor adds
+    `Vary: Cookie`, and anonymous pages stay cacheable at the proxy. The
+    proxy must skip its cache when the session cookie is present (see
+    nginx/default.conf).
+    """
+
+    def _get_session(self, no_load=False):
+        if self.session_key is not None:
+            return super()._get_session(no_load)
+        accessed = self.accessed
+        session = super()._get_session(no_load)
+        self.accessed = accessed
+        return session
+
+    _session = property(_get_session)
@@ -1,11 +1,17 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.contrib.auth.models import Permission
-from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth.models import Group
+from rest_framework.authtoken.models import Token
 
 from accounts.models import Profile
-from blog.models import Post
+from accounts.authentication import (
+    invalidate_user_token,
+    cache_token_version,
+)
+from accounts.request_user import invalidate_request_user
+from accounts.staff_permissions import sync_staff_permission
 
 User = get_user_model()
 
@@ -23,14 +29,104 @@ def create_profile(sender, instance, created, **kwargs):
 def assign_post_permission_if_staff(sender, instance, **kwargs):
     """
     Assign the 'add_post' permission to staff or superusers automatically.
-    Ensures the user has the required permission for creating blog posts.
-    """
-    if instance.is_staff or instance.is_superuser:
-        content_type = ContentType.objects.get_for_model(Post)
-        permission, _ = Permission.objects.get_or_create(
-            content_type=content_type,
-            codename="add_post",
-            defaults={"name": "Can add post"},
-        )
-        if not instance.has_perm("blog.add_post"):
-            instance.user_permissions.add(permission)
+    Runs only when `is_staff` or `is_superuser` changed in this save.
+    """
+    if getattr(instance, "dirty_fields", None):
+        sync_staff_permission(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_token_on_user_change(
+    sender, instance, created, **kwargs
+):
+    """
+    Drop the cached token entry and publish the new JWT token version when
+    the password changes or the user is deactivated. `_password` is still
+    set during post_save after `set_password()`.
+    """
+    if created:
+        return
+    if instance._password is not None or not instance.is_active:
+        invalidate_user_token(instance.pk)
+        cache_token_version(instance)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token_on_delete(sender, instance, **kwargs):
+    """
+    Drop the cached entry of a discarded (deleted) token.
+    """
+    invalidate_user_token(instance.user_id)
+
+
+def invalidate_request_user_on_commit(user_ids):
+    """
+    Drop the request user cache entries once the transaction commits, so
+    a concurrent request cannot cache the old rows again.
+    """
+    user_ids = list(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: invalidate_request_user(*user_ids))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_request_user_on_user_change(sender, instance, **kwargs):
+    """
+    Drop the cached request user when the user changes.
+    """
+    if not kwargs.get("created"):
+        invalidate_request_user_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_request_user_on_profile_change(
+    sender, instance, created, **kwargs
+):
+    """
+    Drop the cached request user when its profile changes.
+    """
+    if not created:
+        invalidate_request_user_on_commit([instance.user_id])
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_request_user_on_user_m2m_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Drop the cached request users whose permissions or groups changed,
+    from either side of the relation.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        user_ids = [instance.pk]
+    elif action == "pre_clear":
+        user_ids = instance.user_set.values_list("pk", flat=True)
+    else:
+        user_ids = pk_set
+    invalidate_request_user_on_commit(user_ids)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_request_user_on_group_permission_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Drop the cached request users of groups whose permissions changed.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        group_ids = [instance.pk]
+    elif action == "pre_clear":
+        group_ids = instance.group_set.values_list("pk", flat=True)
+    else:
+        group_ids = pk_set
+    invalidate_request_user_on_commit(
+        User.objects.filter(groups__in=list(group_ids))
+        .values_list("pk", flat=True)
+        .distinct()
+    )
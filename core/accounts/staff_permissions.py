@@ -0,0 +1,58 @@
+from functools import lru_cache
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+
+from blog.models import Post
+from .models import User
+from .request_user import invalidate_request_user
+
+
+@lru_cache(maxsize=None)
+def get_add_post_permission_id():
+    """
+    Return the id of the 'blog.add_post' permission, created on first use
+    and cached for the lifetime of the process.
+    """
+    permission, _ = Permission.objects.get_or_create(
+        content_type=ContentType.objects.get_for_model(Post),
+        codename="add_post",
+        defaults={"name": "Can add post"},
+    )
+    return permission.pk
+
+
+def sync_staff_permission(user):
+    """
+    Grant 'add_post' to a user who is staff or superuser.
+    The permission is never revoked, so manual grants survive a demotion.
+    """
+    if user.is_staff or user.is_superuser:
+        user.user_permissions.add(get_add_post_permission_id())
+
+
+def sync_staff_permissions(batch_size=1000):
+    """
+    Grant 'add_post' to every staff user or superuser missing it.
+    Returns the number of users updated.
+    """
+    permission_id = get_add_post_permission_id()
+    through = User.user_permissions.through
+    user_ids = list(
+        User.objects.filter(Q(is_staff=True) | Q(is_superuser=True))
+        .exclude(user_permissions=permission_id)
+        .values_list("pk", flat=True)
+    )
+    for start in range(0, len(user_ids), batch_size):
+        end = start + batch_size
+        batch = user_ids[start:end]
+        through.objects.bulk_create(
+            [
+                through(user_id=user_id, permission_id=permission_id)
+                for user_id in batch
+            ],
+            ignore_conflicts=True,
+        )
+        # bulk_create sends no m2m_changed, so drop the cached users here
+        invalidate_request_user(*batch)
+    return len(user_ids)
@@ -1,95 +1,98 @@
 from django.contrib.auth import get_user_model
-from mail_templated import EmailMessage
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken
 from celery import shared_task
 from django.utils import timezone
 from datetime import timedelta
-from django.utils.module_loading import import_string
-
-from .utils import SCOPE_CONFIG_MAP
+from django.db.models import (
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Q,
+    Value,
+)
+from django.db.models.functions import Cast, Power
+
+from .mailer import enqueue_email, dispatch_outbox, purge_sent_outbox
+from .utils import SCOPE_CONFIG_MAP, get_scope_throttle_config
 from .models import Profile
 from .models.throttle_records import ThrottleRecord
-from core.settings.base import EMAIL_HOST_USER, DOMAIN_NAME
+from core.settings.base import DOMAIN_NAME
 
 User = get_user_model()
 
 
+def build_purpose_token(user, purpose, lifetime):
+    """
+    Create a short-lived access token with a `purpose` claim.
+    No refresh token is minted since these links are single-purpose.
+    """
+    access_token = AccessToken.for_user(user)
+    access_token["purpose"] = purpose
+    access_token.set_exp(lifetime=lifetime)
+    return str(access_token)
+
+
 @shared_task
 def send_verification_email(user_id):
     """
-    Send verification email to the user with the given user_id using JWT token
-    with a custom claim (purpose=email_verification) and short expiration time.
+    Queue a verification email to the user with the given user_id using JWT
+    token with a custom claim (purpose=email_verification) and short
+    expiration time (1 day). Delivery is handled by the outbox dispatcher.
     """
     try:
         user = User.objects.get(id=user_id)
-
-        # Create a refresh token and access token
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
-
-        # Add a custom claim to clarify the purpose of the token
-        access_token["purpose"] = "email_verification"
-
-        # Set token expiration to 1 day for email verification
-        access_token.set_exp(lifetime=timedelta(days=1))
-
-        # Convert token to string
-        token = str(access_token)
-
-        # Prepare and send the email
-        message = EmailMessage(
-            template_name="email/email-confirm.tpl",
-            context={
-                "user": user,
-                "token": token,
-                "domain": DOMAIN_NAME,
-            },
-            from_email=EMAIL_HOST_USER,
-            to=[user.email],
-        )
-        message.send()
     except User.DoesNotExist:
         # If user not found, silently ignore
-        pass
+        return
+
+    token = build_purpose_token(user, "email_verification", timedelta(days=1))
+    enqueue_email(
+        "email/email-confirm.tpl",
+        {"user": user, "token": token, "domain": DOMAIN_NAME},
+        user.email,
+    )
+    dispatch_email_outbox.delay()
 
 
 @shared_task
 def send_password_reset_email(user_id):
     """
-    Send password reset email to the user with the given user_id using JWT token
-    with a custom claim (purpose=password_reset) and short expiration time.
+    Queue a password reset email to the user with the given user_id using JWT
+    token with a custom claim (purpose=password_reset) and short
+    expiration time (10 minutes). Delivery is handled by the outbox dispatcher.
     """
     try:
         user = User.objects.get(id=user_id)
-
-        # Create a refresh token and access token
-        refresh = RefreshToken.for_user(user)
-        access_token = refresh.access_token
-
-        # Add a custom claim to clarify the purpose of the token
-        access_token["purpose"] = "password_reset"
-
-        # Set token expiration to 10 minutes for email verification
-        access_token.set_exp(lifetime=timedelta(minutes=10))
-
-        # Convert token to string
-        token = str(access_token)
-
-        # Prepare and send the email
-        message = EmailMessage(
-            template_name="email/email-password-reset.tpl",
-            context={
-                "user": user,
-                "token": token,
-                "domain": DOMAIN_NAME,
-            },
-            from_email=EMAIL_HOST_USER,
-            to=[user.email],
-        )
-        message.send()
     except User.DoesNotExist:
         # If user not found, silently ignore
-        pass
+        return
+
+    token = build_purpose_token(user, "password_reset", timedelta(minutes=10))
+    enqueue_email(
+        "email/email-password-reset.tpl",
+        {"user": user, "token": token, "domain": DOMAIN_NAME},
+        user.email,
+    )
+    dispatch_email_outbox.delay()
+
+
+@shared_task
+def dispatch_email_outbox():
+    """
+    Send due outbox emails in batches over a single SMTP connection.
+    Triggered after each enqueue and periodically for retries.
+    """
+    return dispatch_outbox()
+
+
+@shared_task
+def purge_sent_emails():
+    """
+    Delete sent outbox emails past their retention period.
+    """
+    return purge_sent_outbox()
 
 
 @shared_task
@@ -121,32 +124,40 @@ def clear_throttle_after_grace():
 
     Cooldown = base_window * 2^level
     base_window is fetched per-scope from throttle class or view class.
-    Only records with `last_blocked_at` are considered.
+
+    The grace check is evaluated by the database: for every known scope
+    a single DELETE compares `last_blocked_at` with the cooldown computed
+    from the record's level, and also removes never-blocked records whose
+    `expires_at` is older than twice the scope's base window.
+    Returns the number of deleted records.
     """
     now = timezone.now()
-    records = ThrottleRecord.objects.exclude(last_blocked_at__isnull=True)
-
-    for record in records:
-        scope_config = SCOPE_CONFIG_MAP.get(record.scope)
-        if not scope_config:
-            continue  # Unknown scope
-
-        # If config is a string, import the class
-        if isinstance(scope_config, str):
-            try:
-                scope_config = import_string(scope_config)
-            except ImportError:
-                continue  # Invalid path, skip
-
-        # Try to get base_window from class attribute
-        base_window = getattr(
-            scope_config, "throttle_base_window", None
-        ) or getattr(scope_config, "base_window", None)
-        if base_window is None:
-            continue  # Skip if not defined
-
-        cooldown = base_window * (2**record.level)
-        grace_period = timedelta(seconds=cooldown * 2)
-
-        if record.last_blocked_at + grace_period < now:
-            record.delete()
+    deleted = 0
+
+    for scope in SCOPE_CONFIG_MAP:
+        config = get_scope_throttle_config(scope)
+        if config is None:
+            continue  # Invalid path or no base_window defined
+        base_window, _ = config
+        min_grace = timedelta(seconds=base_window * 2)
+
+        # Stale records that were never blocked
+        stale = Q(last_blocked_at__isnull=True, expires_at__lt=now - min_grace)
+
+        # Blocked records whose grace period (2 * cooldown) has passed.
+        # The level 0 bound lets the (scope, last_blocked_at) index
+        # narrow the rows the per-level expression is checked on.
+        grace = ExpressionWrapper(
+            Value(min_grace) * Cast(Power(2, F("level")), IntegerField()),
+            output_field=DurationField(),
+        )
+        stale |= Q(last_blocked_at__lt=now - min_grace) & Q(
+            last_blocked_at__lt=ExpressionWrapper(
+                Value(now) - grace, output_field=DateTimeField()
+            )
+        )
+
+        count, _ = ThrottleRecord.objects.filter(stale, scope=scope).delete()
+        deleted += count
+
+    return deleted
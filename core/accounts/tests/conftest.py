@@ -3,6 +3,7 @@ Shared fixtures for accounts app tests.
 """
 
 import pytest
+from django.core.cache import cache, caches
 from accounts.models import User, Profile
 from rest_framework.test import APIClient
 
@@ -41,3 +42,20 @@ def authenticated_client(test_user, api_client, user_data):
     user, _ = test_user
     api_client.force_authenticate(user=user)
     return api_client
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    """
+    Uses an empty in-process cache instead of Redis, and turns off the
+    Redis-backed JWT revocation list.
+    """
+    settings.CACHES = {
+        alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        for alias in ("default", "sessions")
+    }
+    settings.JWT_REVOCATION_ENABLED = False
+    cache.clear()
+    yield
+    for alias in ("default", "sessions"):
+        caches[alias].clear()
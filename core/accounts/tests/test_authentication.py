@@ -0,0 +1,77 @@
+"""
+Test suite for the cached token authentication.
+"""
+
+import pytest
+from django.db import connection
+from django.db.models.fields.files import FieldFile
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import (
+    CachedTokenAuthentication,
+    get_token_cache,
+    token_cache_key,
+)
+
+
+@pytest.mark.django_db
+def test_cached_token_authentication_skips_db(locmem_cache, test_user):
+    """
+    The second lookup serves user and profile from the cache.
+    """
+    user, profile = test_user
+    token = Token.objects.create(user=user)
+    auth = CachedTokenAuthentication()
+    auth.authenticate_credentials(token.key)
+
+    with CaptureQueriesContext(connection) as queries:
+        cached_user, _ = auth.authenticate_credentials(token.key)
+        assert cached_user.pk == user.pk
+        assert cached_user.profile.id == profile.id
+
+    assert len(queries) == 0
+    # Deferred fields are still loaded on demand
+    assert cached_user.check_password("testpass123")
+
+
+@pytest.mark.django_db
+def test_cached_token_invalidated_on_password_change_and_delete(
+    locmem_cache, test_user
+):
+    """
+    Password changes and token deletion drop the cached entry.
+    """
+    user, _ = test_user
+    token = Token.objects.create(user=user)
+    auth = CachedTokenAuthentication()
+    auth.authenticate_credentials(token.key)
+
+    user.set_password("newpass123")
+    user.save()
+    with CaptureQueriesContext(connection) as queries:
+        auth.authenticate_credentials(token.key)
+    assert len(queries) == 1
+
+    token.delete()
+    with pytest.raises(AuthenticationFailed):
+        auth.authenticate_credentials(token.key)
+
+
+@pytest.mark.django_db
+def test_cached_token_entry_holds_raw_values(locmem_cache, test_user):
+    """
+    The profile image is cached by name and rebuilt as a file.
+    """
+    user, profile = test_user
+    token = Token.objects.create(user=user)
+    auth = CachedTokenAuthentication()
+    auth.authenticate_credentials(token.key)
+
+    entry = get_token_cache().get(token_cache_key(token.key))
+    assert profile.image.name in entry["profile"]
+    assert not any(isinstance(value, FieldFile) for value in entry["profile"])
+
+    cached_user, _ = auth.authenticate_credentials(token.key)
+    assert cached_user.profile.image.name == profile.image.name
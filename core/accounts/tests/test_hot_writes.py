@@ -0,0 +1,95 @@
+"""
+Test suite for the hot-write database routing of throttle, session and
+beat tables.
+"""
+
+import pytest
+from django.db import OperationalError, connections, router
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django_celery_beat.models import PeriodicTask
+
+from accounts.models.throttle_records import ThrottleRecord
+from accounts.throttle_storages import BaseThrottleStorage
+from accounts.utils import APIResetPasswordThrottle
+from blog.models import Post
+
+
+@pytest.fixture
+def hot_writes(settings):
+    """
+    Routes the hot-write models to the "hot_writes" alias (a test mirror
+    of "default").
+    """
+    settings.HOT_WRITE_DATABASE = "hot_writes"
+
+
+class FailingStorage(BaseThrottleStorage):
+    """
+    Storage whose database is down.
+    """
+
+    def check(self, throttle):
+        raise OperationalError("connection refused")
+
+    record_attempt = reset_level = check
+
+
+def test_hot_write_models_are_routed(hot_writes):
+    """
+    Throttle, session and beat models use the hot-write database, and
+    only their tables are migrated there.
+    """
+    assert router.db_for_write(ThrottleRecord) == "hot_writes"
+    assert router.db_for_read(PeriodicTask) == "hot_writes"
+    assert router.db_for_read(Post) == "default"
+
+    assert router.allow_migrate(
+        "hot_writes", "accounts", model_name="throttlerecord"
+    )
+    assert router.allow_migrate("hot_writes", "sessions")
+    assert not router.allow_migrate("default", "django_celery_beat")
+    assert not router.allow_migrate("hot_writes", "blog", model_name="post")
+    assert router.allow_migrate("default", "blog", model_name="post")
+
+
+def test_nothing_is_routed_without_hot_write_database(settings):
+    """
+    Without HOT_WRITE_DATABASE everything stays in the default database.
+    """
+    settings.HOT_WRITE_DATABASE = None
+
+    assert router.db_for_write(ThrottleRecord) == "default"
+    assert router.allow_migrate("default", "django_celery_beat")
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "hot_writes"])
+def test_failed_login_writes_go_to_hot_write_database(hot_writes):
+    """
+    Recording a failed attempt queries the hot-write database only.
+    """
+    request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.3")
+    throttle = APIResetPasswordThrottle()
+
+    with CaptureQueriesContext(
+        connections["default"]
+    ) as primary, CaptureQueriesContext(connections["hot_writes"]) as hot:
+        throttle.allow_request(request, None)
+        throttle.record_attempt(request)
+
+    assert len(hot) > 0
+    assert len(primary) == 0
+    assert ThrottleRecord.objects.filter(scope=throttle.scope).exists()
+
+
+def test_throttle_fails_open_on_database_errors():
+    """
+    With its database down, the throttle lets requests through.
+    """
+    request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.4")
+    throttle = APIResetPasswordThrottle()
+    throttle.storage = FailingStorage()
+
+    assert throttle.allow_request(request, None)
+    throttle.record_attempt(request)
+    throttle.reset_level(request)
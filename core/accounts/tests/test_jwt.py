@@ -0,0 +1,51 @@
+"""
+Test suite for the claims-based JWT authentication.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.api.v1.serializers import CustomTokenObtainPairSerializer
+from accounts.authentication import ClaimsJWTAuthentication
+
+
+@pytest.mark.django_db
+def test_claims_jwt_builds_user_without_queries(locmem_cache, test_user):
+    """
+    Hot-path attributes come from the token claims.
+    """
+    user, profile = test_user
+    access = CustomTokenObtainPairSerializer.get_token(user).access_token
+    auth = ClaimsJWTAuthentication()
+    token = auth.get_validated_token(str(access))
+    auth.get_user(token)  # warms the token version cache
+
+    with CaptureQueriesContext(connection) as queries:
+        claims_user = auth.get_user(token)
+        assert claims_user.pk == user.pk
+        assert claims_user.profile.id == profile.id
+        assert claims_user.is_verified is False
+        assert claims_user.has_perm("blog.add_post") is False
+
+    assert len(queries) == 0
+    # Fields outside the claims are loaded on demand
+    assert claims_user.email == user.email
+
+
+@pytest.mark.django_db
+def test_password_change_rejects_older_jwt(locmem_cache, test_user):
+    """
+    Changing the password bumps the token version.
+    """
+    user, _ = test_user
+    access = CustomTokenObtainPairSerializer.get_token(user).access_token
+    auth = ClaimsJWTAuthentication()
+    token = auth.get_validated_token(str(access))
+
+    user.set_password("newpass123")
+    user.save()
+
+    with pytest.raises(AuthenticationFailed):
+        auth.get_user(token)
@@ -0,0 +1,197 @@
+"""
+Test suite for the email outbox and its batched dispatcher.
+"""
+
+import pytest
+import socket
+from datetime import timedelta
+from django.core import mail
+from django.core.mail import get_connection
+from django.utils import timezone
+
+from accounts.mailer import (
+    claim_batch,
+    dispatch_outbox,
+    enqueue_email,
+    purge_sent_outbox,
+)
+from accounts.models.email_outbox import EmailOutbox
+
+
+class FailingConnection:
+    """
+    Stand-in connection whose delivery always fails.
+    """
+
+    def open(self):
+        return True
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise ConnectionError("smtp unavailable")
+
+
+class RecordingHandler:
+    """
+    aiosmtpd handler keeping delivered messages and refusing
+    recipients at refused.com.
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, options):
+        if address.endswith("@refused.com"):
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def smtp_server():
+    """
+    Runs a local SMTP server; returns its handler and a connection to it.
+    """
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = RecordingHandler()
+    controller = controller_module.Controller(
+        handler, hostname="127.0.0.1", port=port
+    )
+    controller.start()
+    yield handler, get_connection(
+        "django.core.mail.backends.smtp.EmailBackend",
+        host="127.0.0.1",
+        port=port,
+        use_tls=False,
+        username="",
+        password="",
+    )
+    controller.stop()
+
+
+@pytest.mark.django_db
+def test_dispatch_outbox_sends_batches(test_user):
+    """
+    Queued emails are rendered once and sent through one connection.
+    """
+    user, _ = test_user
+    for _ in range(3):
+        enqueue_email(
+            "email/email-confirm.tpl",
+            {"user": user, "token": "token", "domain": "http://testserver"},
+            user.email,
+        )
+
+    sent = dispatch_outbox(batch_size=2, connection=get_connection())
+
+    assert sent == 3
+    assert len(mail.outbox) == 3
+    assert "accounts/verify/token/" in mail.outbox[0].body
+    assert mail.outbox[0].content_subtype == "html"
+    assert not EmailOutbox.objects.exclude(status=EmailOutbox.STATUS_SENT)
+
+
+@pytest.mark.django_db
+def test_dispatch_outbox_backs_off_on_failure(test_user, settings):
+    """
+    Failed deliveries are retried later and marked failed at the limit.
+    """
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+    user, _ = test_user
+    entry = enqueue_email(
+        "email/email-password-reset.tpl",
+        {"user": user, "token": "token", "domain": "http://testserver"},
+        user.email,
+    )
+
+    assert dispatch_outbox(connection=FailingConnection()) == 0
+    entry.refresh_from_db()
+    assert entry.status == EmailOutbox.STATUS_PENDING
+    assert entry.attempts == 1
+    assert entry.next_attempt_at > entry.created_at
+
+    EmailOutbox.objects.update(next_attempt_at=entry.created_at)
+    dispatch_outbox(connection=FailingConnection())
+    entry.refresh_from_db()
+    assert entry.status == EmailOutbox.STATUS_FAILED
+    assert "smtp unavailable" in entry.last_error
+
+
+@pytest.mark.django_db
+def test_claimed_entries_are_not_due_for_other_dispatchers(settings):
+    """
+    A claimed batch is skipped by other dispatchers until its claim runs
+    out.
+    """
+    settings.EMAIL_OUTBOX_CLAIM_TIMEOUT = 300
+    EmailOutbox.objects.create(to_email="claimed@accounts.com")
+    now = timezone.now()
+
+    assert len(claim_batch(10, now)) == 1
+    assert claim_batch(10, now) == []
+    assert len(claim_batch(10, now + timedelta(seconds=301))) == 1
+
+
+@pytest.mark.django_db
+def test_dispatch_outbox_over_smtp(test_user, smtp_server):
+    """
+    Messages go through a real SMTP session; a refused recipient is
+    retried later without holding back the others.
+    """
+    user, _ = test_user
+    handler, connection = smtp_server
+    context = {"user": user, "token": "token", "domain": "http://testserver"}
+    enqueue_email("email/email-confirm.tpl", context, user.email)
+    refused = enqueue_email(
+        "email/email-confirm.tpl", context, "nobody@refused.com"
+    )
+    enqueue_email("email/email-confirm.tpl", context, "second@accounts.com")
+
+    assert dispatch_outbox(batch_size=2, connection=connection) == 2
+
+    assert [envelope.rcpt_tos for envelope in handler.messages] == [
+        [user.email],
+        ["second@accounts.com"],
+    ]
+    assert b"accounts/verify/token/" in handler.messages[0].content
+    refused.refresh_from_db()
+    assert refused.status == EmailOutbox.STATUS_PENDING
+    assert refused.attempts == 1
+    assert "nobody@refused.com" in refused.last_error
+    assert refused.next_attempt_at > timezone.now()
+
+
+@pytest.mark.django_db
+def test_purge_sent_outbox_keeps_recent_and_unsent_entries(settings):
+    """
+    Only emails sent before the retention period are deleted.
+    """
+    settings.EMAIL_OUTBOX_RETENTION_DAYS = 30
+    now = timezone.now()
+    old_sent = EmailOutbox.objects.create(
+        to_email="old@accounts.com",
+        status=EmailOutbox.STATUS_SENT,
+        sent_at=now - timedelta(days=31),
+    )
+    EmailOutbox.objects.create(
+        to_email="recent@accounts.com",
+        status=EmailOutbox.STATUS_SENT,
+        sent_at=now - timedelta(days=1),
+    )
+    EmailOutbox.objects.create(
+        to_email="failed@accounts.com", status=EmailOutbox.STATUS_FAILED
+    )
+    EmailOutbox.objects.create(to_email="pending@accounts.com")
+
+    assert purge_sent_outbox() == 1
+    assert not EmailOutbox.objects.filter(pk=old_sent.pk).exists()
+    assert EmailOutbox.objects.count() == 3
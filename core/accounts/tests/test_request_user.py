@@ -0,0 +1,80 @@
+"""
+Test suite for the request-scoped user, profile and permission loading.
+"""
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from accounts.middleware import REQUEST_USER_BACKEND, get_user
+from accounts.request_user import load_request_user
+
+
+@pytest.mark.django_db
+def test_request_user_loads_in_one_query(locmem_cache, test_user):
+    """
+    A miss costs one joined query; a hit serves user, profile and
+    permission checks without any.
+    """
+    user, profile = test_user
+    user.user_permissions.add(Permission.objects.get(codename="add_post"))
+
+    with CaptureQueriesContext(connection) as queries:
+        load_request_user(user.pk)
+    assert len(queries) == 1
+
+    with CaptureQueriesContext(connection) as queries:
+        cached_user = load_request_user(user.pk)
+        assert cached_user.profile.id == profile.id
+        assert cached_user.has_perm("blog.add_post")
+        assert not cached_user.has_perm("blog.delete_post")
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_request_user_invalidated_on_change(
+    locmem_cache, test_user, django_capture_on_commit_callbacks
+):
+    """
+    Profile saves and permission changes drop the cached entry.
+    """
+    user, profile = test_user
+    load_request_user(user.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.first_name = "Ali"
+        profile.save()
+    assert load_request_user(user.pk).profile.first_name == "Ali"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.user_permissions.add(Permission.objects.get(codename="add_post"))
+    assert load_request_user(user.pk).has_perm("blog.add_post")
+
+
+@pytest.mark.django_db
+def test_middleware_serves_session_user_from_cache(locmem_cache, test_user):
+    """
+    A session created by RequestUserBackend is verified against the
+    cached session hash.
+    """
+    user, _ = test_user
+    session = SessionStore()
+    session.update(
+        {
+            "_auth_user_id": str(user.pk),
+            "_auth_user_backend": REQUEST_USER_BACKEND,
+            "_auth_user_hash": user.get_session_auth_hash(),
+        }
+    )
+    load_request_user(user.pk)
+    request = RequestFactory().get("/")
+    request.session = session
+
+    with CaptureQueriesContext(connection) as queries:
+        request_user = get_user(request)
+        assert request_user.pk == user.pk
+        assert request_user.profile.id
+    assert len(queries) == 0
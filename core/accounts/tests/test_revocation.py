@@ -0,0 +1,245 @@
+"""
+Test suite for JWT revocation and logout everywhere.
+"""
+
+import pytest
+import time
+from django.urls import reverse
+from redis.exceptions import ConnectionError
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.api.v1.serializers import CustomTokenObtainPairSerializer
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.revocation import (
+    REVOCATION_STREAM,
+    BloomFilter,
+    RevocationList,
+    is_token_revoked,
+    revoke_token,
+)
+
+
+def parse_id(entry_id):
+    return tuple(int(part) for part in entry_id.split("-"))
+
+
+class FakePipeline:
+    """
+    Queues commands and runs them on the client on execute().
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append(
+            (name, args, kwargs)
+        )
+
+    def execute(self):
+        return [
+            getattr(self.client, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the Redis commands used by RevocationList.
+    Stream entries are returned as bytes, like redis-py does.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.streams = {}
+        self.xrange_mins = []
+        self.sequence = 0
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = (value, ex)
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def xadd(self, name, fields, minid=None, approximate=False):
+        self.sequence += 1
+        entry_id = f"{int(time.time() * 1000)}-{self.sequence}"
+        entries = self.streams.setdefault(name, [])
+        entries.append(
+            (
+                entry_id.encode(),
+                {
+                    key.encode(): str(value).encode()
+                    for key, value in fields.items()
+                },
+            )
+        )
+        if minid is not None:
+            entries[:] = [
+                entry
+                for entry in entries
+                if parse_id(entry[0].decode())[0] >= minid
+            ]
+        return entry_id.encode()
+
+    def xrange(self, name, min="-", count=None):
+        self.xrange_mins.append(min)
+        assert min.startswith("("), "replay must exclude the last entry"
+        after = parse_id(min[1:])
+        entries = [
+            entry
+            for entry in self.streams.get(name, [])
+            if parse_id(entry[0].decode()) > after
+        ]
+        return entries[:count]
+
+
+@pytest.fixture
+def redis_client(monkeypatch, settings):
+    """
+    Turns on JWT revocation on a fake Redis client, synced on every
+    check, and returns the client.
+    """
+    settings.JWT_REVOCATION_ENABLED = True
+    settings.JWT_REVOCATION_SYNC_INTERVAL = 0
+    client = FakeRedis()
+    monkeypatch.setattr(
+        "django_redis.get_redis_connection", lambda alias: client
+    )
+    monkeypatch.setattr("accounts.revocation._revocation_list", None)
+    return client
+
+
+def jwt(jti, lifetime=300):
+    return {"jti": jti, "exp": int(time.time()) + lifetime}
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """
+    Every added item is reported as present.
+    """
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+@pytest.mark.django_db
+def test_logout_everywhere_rejects_issued_tokens(
+    locmem_cache, test_user, authenticated_client
+):
+    """
+    Logging out everywhere invalidates JWTs and deletes the DRF token.
+    """
+    user, _ = test_user
+    Token.objects.create(user=user)
+    access = CustomTokenObtainPairSerializer.get_token(user).access_token
+    auth = ClaimsJWTAuthentication()
+    token = auth.get_validated_token(str(access))
+
+    response = authenticated_client.post(
+        reverse("accounts:api-v1:logout-everywhere")
+    )
+
+    assert response.status_code == 200
+    assert not Token.objects.filter(user=user).exists()
+    user.refresh_from_db()
+    assert user.token_version == 1
+    with pytest.raises(AuthenticationFailed):
+        auth.get_user(token)
+
+
+def test_revoked_token_is_reported_until_expiry(redis_client):
+    """
+    A revoked jti gets a key expiring with the token; expired tokens are
+    not stored.
+    """
+    token = jwt("jti-1")
+    revoke_token(token)
+    revoke_token(jwt("jti-expired", lifetime=-10))
+
+    assert is_token_revoked(token)
+    assert not is_token_revoked(jwt("jti-2"))
+    _, ttl = redis_client.values["jwt_revoked:jti-1"]
+    assert 298 <= ttl <= 300
+    assert "jwt_revoked:jti-expired" not in redis_client.values
+    assert len(redis_client.streams[REVOCATION_STREAM]) == 1
+
+
+def test_revocation_stream_is_trimmed(redis_client):
+    """
+    Adding a revocation trims entries older than the refresh lifetime.
+    """
+    redis_client.streams[REVOCATION_STREAM] = [
+        (b"1000-0", {b"jti": b"ancient", b"exp": b"2000"})
+    ]
+
+    revoke_token(jwt("jti-1"))
+
+    entries = redis_client.streams[REVOCATION_STREAM]
+    assert [fields[b"jti"] for _, fields in entries] == [b"jti-1"]
+
+
+def test_other_processes_sync_from_the_stream_offset(redis_client):
+    """
+    Another process picks up revocations from the stream, reading only
+    entries after the last one it replayed, and skips expired ones.
+    """
+    revoking, checking = RevocationList(), RevocationList()
+    assert not checking.is_revoked("jti-1")
+
+    revoking.revoke("jti-1", jwt("jti-1")["exp"])
+    redis_client.xadd(
+        REVOCATION_STREAM, {"jti": "jti-old", "exp": int(time.time()) - 1}
+    )
+    assert checking.is_revoked("jti-1")
+    assert "jti-old" not in checking.bloom
+
+    last_id = redis_client.streams[REVOCATION_STREAM][-1][0].decode()
+    assert checking.last_stream_id == last_id
+    checking.is_revoked("jti-1")
+    assert redis_client.xrange_mins[-1] == f"({last_id}"
+
+
+@pytest.mark.django_db
+def test_jwt_logout_revokes_access_and_refresh_tokens(
+    locmem_cache, redis_client, test_user, api_client
+):
+    """
+    After logging out, the access token is rejected and the refresh
+    token is revoked.
+    """
+    user, _ = test_user
+    refresh = CustomTokenObtainPairSerializer.get_token(user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    url = reverse("accounts:api-v1:jwt-logout")
+
+    response = api_client.post(url, {"refresh": str(refresh)})
+    assert response.status_code == 200
+    assert is_token_revoked(refresh)
+
+    response = api_client.post(url)
+    assert response.status_code == 401
+
+
+def test_revocation_check_fails_open_on_redis_errors(redis_client):
+    """
+    With Redis down, tokens are accepted instead of failing the request.
+    """
+    token = jwt("jti-1")
+    revoke_token(token)
+
+    def refuse(*args, **kwargs):
+        raise ConnectionError("connection refused")
+
+    redis_client.exists = redis_client.xrange = refuse
+    assert not is_token_revoked(token)
@@ -0,0 +1,52 @@
+"""
+Test suite for the incremental staff permission sync.
+"""
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from accounts.staff_permissions import get_add_post_permission_id
+
+
+def has_add_post(user):
+    return user.user_permissions.filter(
+        pk=get_add_post_permission_id()
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_permission_granted_only_when_staff_flag_changes(test_user):
+    """
+    Unrelated saves skip the sync; promoting to staff grants 'add_post'.
+    """
+    user, _ = test_user
+    get_add_post_permission_id()
+
+    user.is_verified = True
+    with CaptureQueriesContext(connection) as queries:
+        user.save()
+    assert len(queries) == 1  # the UPDATE only
+    assert user.dirty_fields == set()
+
+    user = User.objects.get(pk=user.pk)
+    user.is_staff = True
+    user.save()
+    assert user.dirty_fields == {"is_staff"}
+    assert has_add_post(user)
+
+
+@pytest.mark.django_db
+def test_sync_staff_permissions_command(locmem_cache, test_user):
+    """
+    The command grants 'add_post' to staff users missing it.
+    """
+    user, _ = test_user
+    User.objects.filter(pk=user.pk).update(is_staff=True)
+    assert not has_add_post(user)
+
+    call_command("sync_staff_permissions")
+
+    assert has_add_post(user)
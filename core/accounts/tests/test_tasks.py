@@ -0,0 +1,67 @@
+"""
+Test suite for the periodic tasks in the accounts app.
+"""
+
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+
+from accounts.models.throttle_records import ThrottleRecord
+from accounts.tasks import clear_throttle_after_grace
+
+
+@pytest.mark.django_db
+def test_clear_throttle_after_grace_deletes_per_level():
+    """
+    Blocked records are deleted only once 2 * base_window * 2^level passed.
+    """
+    now = timezone.now()
+    # api_register: base_window = 600s
+    ThrottleRecord.objects.create(
+        ident="expired",
+        scope="api_register",
+        level=1,
+        expires_at=now,
+        last_blocked_at=now - timedelta(seconds=600 * 2 * 2 + 1),
+    )
+    ThrottleRecord.objects.create(
+        ident="in-grace",
+        scope="api_register",
+        level=2,
+        expires_at=now,
+        last_blocked_at=now - timedelta(seconds=600 * 2 * 2 + 1),
+    )
+
+    assert clear_throttle_after_grace() == 1
+    assert list(ThrottleRecord.objects.values_list("ident", flat=True)) == [
+        "in-grace"
+    ]
+
+
+@pytest.mark.django_db
+def test_clear_throttle_after_grace_purges_stale_unblocked():
+    """
+    Never-blocked records expire after twice the scope's base window.
+    """
+    now = timezone.now()
+    # login view: throttle_base_window = 300s
+    ThrottleRecord.objects.create(
+        ident="stale",
+        scope="login",
+        attempts=3,
+        expires_at=now - timedelta(seconds=601),
+    )
+    ThrottleRecord.objects.create(
+        ident="fresh", scope="login", attempts=3, expires_at=now
+    )
+    ThrottleRecord.objects.create(
+        ident="unknown",
+        scope="unknown_scope",
+        expires_at=now - timedelta(days=30),
+    )
+
+    assert clear_throttle_after_grace() == 1
+    assert set(ThrottleRecord.objects.values_list("ident", flat=True)) == {
+        "fresh",
+        "unknown",
+    }
@@ -0,0 +1,158 @@
+"""
+Test suite for the adaptive throttle and its database and Redis storages.
+"""
+
+import pytest
+from datetime import timedelta
+from django.test import RequestFactory
+from redis.exceptions import ConnectionError
+
+from accounts.models.throttle_records import ThrottleRecord
+from accounts.throttle_storages import THROTTLE_LUA, RedisThrottleStorage
+from accounts.utils import APIResetPasswordThrottle, CustomThrottleException
+
+
+class FakeScript:
+    """
+    Stands in for the registered THROTTLE_LUA script: records its calls
+    and returns `result` (or raises it).
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.result = [0, 0, 0]
+
+    def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeRedis:
+    def __init__(self):
+        self.script = FakeScript()
+
+    def register_script(self, script):
+        assert script == THROTTLE_LUA
+        return self.script
+
+
+@pytest.fixture
+def redis_throttle(monkeypatch, settings):
+    """
+    Returns a throttle using RedisThrottleStorage on a fake client, and
+    the fake script.
+    """
+    settings.THROTTLE_DB_AUDIT = True
+    client = FakeRedis()
+    monkeypatch.setattr(
+        "django_redis.get_redis_connection", lambda alias: client
+    )
+    throttle = APIResetPasswordThrottle()
+    throttle.storage = RedisThrottleStorage()
+    return throttle, client.script
+
+
+@pytest.mark.django_db
+def test_throttle_blocks_and_escalates_after_allowed_attempts():
+    """
+    Exhausting allowed attempts blocks the client and raises the level.
+    """
+    request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.1")
+    throttle = APIResetPasswordThrottle()
+
+    for _ in range(throttle.allowed_attempts):
+        assert throttle.allow_request(request, None)
+        throttle.record_attempt(request)
+
+    with pytest.raises(CustomThrottleException) as exc:
+        throttle.allow_request(request, None)
+
+    record = ThrottleRecord.objects.get(scope=throttle.scope)
+    assert int(exc.value.detail["retry_after"]) == throttle.base_window
+    assert record.level == 1
+    assert record.attempts == 0
+    assert record.last_blocked_at is not None
+
+
+@pytest.mark.django_db
+def test_throttle_reset_level_deletes_record_over_threshold():
+    """
+    reset_level only forgets clients whose level reached the threshold.
+    """
+    request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.2")
+    throttle = APIResetPasswordThrottle()
+    throttle.record_attempt(request)
+
+    throttle.reset_level(request)
+    assert ThrottleRecord.objects.exists()
+
+    ThrottleRecord.objects.update(level=throttle.reset_threshold)
+    throttle.reset_level(request)
+    assert not ThrottleRecord.objects.exists()
+
+
+def test_redis_storage_runs_one_script_call_per_operation(redis_throttle):
+    """
+    Every operation is one script call on the client's key, with the
+    scope settings as arguments.
+    """
+    throttle, script = redis_throttle
+    request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.5")
+
+    assert throttle.allow_request(request, None)
+    throttle.record_attempt(request)
+    throttle.reset_level(request)
+
+    assert [args[0] for _, args in script.calls] == [
+        "check",
+        "attempt",
+        "reset",
+    ]
+    keys, args = script.calls[-1]
+    assert keys == ["throttle:api_reset_password:10.0.0.5"]
+    assert args[1] == throttle.now.timestamp()
+    assert args[2:] == [
+        throttle.allowed_attempts,
+        throttle.base_window,
+        throttle.max_level,
+        throttle.reset_threshold,
+    ]
+
+
+@pytest.mark.django_db
+def test_redis_storage_audits_escalations(redis_throttle):
+    """
+    A blocked client gets the script's wait time; only an escalation is
+    written to ThrottleRecord.
+    """
+    throttle, script = redis_throttle
+    request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.6")
+
+    script.result = [120, 0, 1]
+    with pytest.raises(CustomThrottleException) as exc:
+        throttle.allow_request(request, None)
+    assert int(exc.value.detail["retry_after"]) == 120
+    assert not ThrottleRecord.objects.exists()
+
+    script.result = [600, 1, 2]
+    with pytest.raises(CustomThrottleException):
+        throttle.allow_request(request, None)
+    record = ThrottleRecord.objects.get(scope=throttle.scope)
+    assert record.level == 2
+    assert record.expires_at == record.last_blocked_at + timedelta(seconds=600)
+
+
+def test_throttle_fails_open_on_redis_errors(redis_throttle):
+    """
+    With Redis down, the throttle lets requests through.
+    """
+    throttle, script = redis_throttle
+    request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.7")
+    script.result = ConnectionError("connection refused")
+
+    assert throttle.allow_request(request, None)
+    throttle.record_attempt(request)
+    throttle.reset_level(request)
+    assert len(script.calls) == 3
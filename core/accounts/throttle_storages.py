@@ -0,0 +1,216 @@
+from datetime import timedelta
+from functools import lru_cache
+from django.conf import settings
+from django.db.models import F
+from django.utils.module_loading import import_string
+
+from .models.throttle_records import ThrottleRecord
+
+
+class BaseThrottleStorage:
+    """
+    Storage interface used by AdaptiveDBThrottle.
+
+    Every method receives the throttle instance, which carries the
+    client identity (`ident`), `scope`, current time (`now`) and the
+    scope settings (`allowed_attempts`, `base_window`, `max_level`,
+    `reset_threshold`).
+    """
+
+    def check(self, throttle):
+        """
+        Return the remaining wait time in seconds if the client is blocked,
+        escalating the penalty level when attempts are exhausted.
+        Return None if the request is allowed.
+        """
+        raise NotImplementedError
+
+    def record_attempt(self, throttle):
+        """
+        Count one attempt for the client, unless it is currently blocked.
+        """
+        raise NotImplementedError
+
+    def reset_level(self, throttle):
+        """
+        Forget the client once its level reached `reset_threshold`.
+        """
+        raise NotImplementedError
+
+
+class DatabaseThrottleStorage(BaseThrottleStorage):
+    """
+    Stores throttle state in the `ThrottleRecord` table.
+    """
+
+    def check(self, throttle):
+        try:
+            record = ThrottleRecord.objects.get(
+                ident=throttle.ident, scope=throttle.scope
+            )
+        except ThrottleRecord.DoesNotExist:
+            return None  # First-time access — no restrictions
+
+        throttle.record = record
+        if record.expires_at > throttle.now:
+            return int((record.expires_at - throttle.now).total_seconds())
+
+        if record.attempts >= throttle.allowed_attempts:
+            cooldown = throttle.base_window * (2**record.level)
+            record.level = min(record.level + 1, throttle.max_level)
+            record.attempts = 0  # Reset after penalty
+            record.expires_at = throttle.now + timedelta(seconds=cooldown)
+            record.last_blocked_at = throttle.now
+            record.save()
+            return cooldown
+
+        return None
+
+    def record_attempt(self, throttle):
+        # Increment in SQL so concurrent attempts are not lost
+        updated = ThrottleRecord.objects.filter(
+            ident=throttle.ident,
+            scope=throttle.scope,
+            expires_at__lte=throttle.now,
+        ).update(attempts=F("attempts") + 1)
+        if updated:
+            return
+
+        ThrottleRecord.objects.get_or_create(
+            ident=throttle.ident,
+            scope=throttle.scope,
+            defaults={"level": 0, "expires_at": throttle.now, "attempts": 1},
+        )
+
+    def reset_level(self, throttle):
+        ThrottleRecord.objects.filter(
+            ident=throttle.ident,
+            scope=throttle.scope,
+            level__gte=throttle.reset_threshold,
+        ).delete()
+
+
+# Single atomic script for every throttle operation.
+# The record is a hash {level, attempts, expires_at}; keys expire on their
+# own after the same grace period `clear_throttle_after_grace` applies.
+# Returns {wait, escalated, level}.
+THROTTLE_LUA = """
+local op = ARGV[1]
+local now = tonumber(ARGV[2])
+local allowed = tonumber(ARGV[3])
+local base_window = tonumber(ARGV[4])
+local max_level = tonumber(ARGV[5])
+local reset_threshold = tonumber(ARGV[6])
+
+local record = redis.call('HMGET', KEYS[1], 'level', 'attempts', 'expires_at')
+local level = tonumber(record[1])
+local attempts = tonumber(record[2])
+local expires_at = tonumber(record[3])
+
+if op == 'attempt' then
+    if not level then
+        redis.call('HSET', KEYS[1], 'level', 0, 'attempts', 1,
+                   'expires_at', now)
+        redis.call('EXPIRE', KEYS[1], base_window * 2)
+    elseif expires_at <= now then
+        redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+    end
+    return {0, 0, level or 0}
+end
+
+if not level then
+    return {0, 0, 0}
+end
+
+if op == 'reset' then
+    if level >= reset_threshold then
+        redis.call('DEL', KEYS[1])
+    end
+    return {0, 0, level}
+end
+
+-- op == 'check'
+if expires_at > now then
+    return {math.floor(expires_at - now), 0, level}
+end
+
+if attempts >= allowed then
+    local cooldown = base_window * 2 ^ level
+    level = math.min(level + 1, max_level)
+    redis.call('HSET', KEYS[1], 'level', level, 'attempts', 0,
+               'expires_at', now + cooldown)
+    redis.call('EXPIRE', KEYS[1], base_window * 2 ^ level * 2)
+    return {cooldown, 1, level}
+end
+
+return {0, 0, level}
+"""
+
+
+class RedisThrottleStorage(BaseThrottleStorage):
+    """
+    Stores throttle state in Redis with native key expiry.
+
+    The check, attempt counting and level escalation run as one Lua
+    script, so each call is a single atomic round trip. When
+    `THROTTLE_DB_AUDIT` is enabled, every escalation is also written to
+    `ThrottleRecord` for auditing in the admin.
+    """
+
+    key_prefix = "throttle"
+
+    def __init__(self):
+        from django_redis import get_redis_connection
+
+        self.client = get_redis_connection(settings.THROTTLE_REDIS_ALIAS)
+        self.script = self.client.register_script(THROTTLE_LUA)
+        self.audit = settings.THROTTLE_DB_AUDIT
+
+    def get_key(self, throttle):
+        return f"{self.key_prefix}:{throttle.scope}:{throttle.ident}"
+
+    def _run(self, op, throttle):
+        return self.script(
+            keys=[self.get_key(throttle)],
+            args=[
+                op,
+                throttle.now.timestamp(),
+                throttle.allowed_attempts,
+                throttle.base_window,
+                throttle.max_level,
+                throttle.reset_threshold,
+            ],
+        )
+
+    def check(self, throttle):
+        wait, escalated, level = self._run("check", throttle)
+        if escalated and self.audit:
+            self._audit_block(throttle, level, wait)
+        return int(wait) or None
+
+    def record_attempt(self, throttle):
+        self._run("attempt", throttle)
+
+    def reset_level(self, throttle):
+        self._run("reset", throttle)
+
+    def _audit_block(self, throttle, level, cooldown):
+        ThrottleRecord.objects.update_or_create(
+            ident=throttle.ident,
+            scope=throttle.scope,
+            defaults={
+                "level": level,
+                "attempts": 0,
+                "expires_at": throttle.now + timedelta(seconds=cooldown),
+                "last_blocked_at": throttle.now,
+            },
+        )
+
+
+@lru_cache(maxsize=None)
+def get_throttle_storage(path=None):
+    """
+    Return the (per-process) storage instance configured by
+    `THROTTLE_STORAGE_BACKEND`, or by the given dotted path.
+    """
+    return import_string(path or settings.THROTTLE_STORAGE_BACKEND)()
@@ -1,13 +1,21 @@
+import logging
 from rest_framework.throttling import BaseThrottle
 from rest_framework.exceptions import Throttled
 from django.utils import timezone
-from datetime import timedelta
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.utils.functional import cached_property
 from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from django.db import DatabaseError
+from redis.exceptions import RedisError
 
-from .models.throttle_records import ThrottleRecord
+from .throttle_storages import get_throttle_storage
+
+logger = logging.getLogger(__name__)
+
+# Errors of the throttle storages (database and Redis) that fail open
+STORAGE_ERRORS = (DatabaseError, RedisError)
 
 
 class CustomThrottleException(Throttled):
@@ -30,10 +38,15 @@ class CustomThrottleException(Throttled):
 
 class AdaptiveDBThrottle(BaseThrottle):
     """
-    Adaptive throttle system using DB per user/IP and scope.
+    Adaptive throttle system per user/IP and scope.
 
     - Limits allowed attempts per time window.
     - Applies exponential cooldowns with increasing penalty (level).
+    - State is kept by the storage set in `THROTTLE_STORAGE_BACKEND`
+      (database by default, or Redis).
+    - Fails open on database and Redis errors, so an outage of the
+      hot-write database (`HOT_WRITE_DATABASE`) or of the throttle Redis
+      does not block logins.
     """
 
     def __init__(self, **kwargs):
@@ -57,6 +70,7 @@ class AdaptiveDBThrottle(BaseThrottle):
         self.ident = None
         self.now = None
         self.record = None
+        self.storage = get_throttle_storage()
 
     def _init_context(self, request):
         """
@@ -74,28 +88,15 @@ class AdaptiveDBThrottle(BaseThrottle):
         self._init_context(request)
 
         try:
-            self.record = ThrottleRecord.objects.get(
-                ident=self.ident, scope=self.scope
-            )
-        except ThrottleRecord.DoesNotExist:
-            return True  # First-time access — no restrictions
-
-        if self.record.expires_at > self.now:
-            wait_time = int(
-                (self.record.expires_at - self.now).total_seconds()
+            wait_time = self.storage.check(self)
+        except STORAGE_ERRORS:
+            logger.warning(
+                "Throttle %s check failed", self.scope, exc_info=True
             )
+            return True
+        if wait_time:
             raise CustomThrottleException(wait=wait_time)
 
-        if self.record.attempts >= self.allowed_attempts:
-            cooldown = self.base_window * (2**self.record.level)
-            self.record.level = min(self.record.level + 1, self.max_level)
-            self.record.attempts = 0  # Reset after penalty
-            self.record.expires_at = self.now + timedelta(seconds=cooldown)
-            self.record.last_blocked_at = timezone.now()
-            self.record.save()
-
-            raise CustomThrottleException(wait=cooldown)
-
         return True
 
     def record_attempt(self, request):
@@ -103,31 +104,24 @@ class AdaptiveDBThrottle(BaseThrottle):
         Log a failed attempt. Called after sensitive operations like login.
         """
         self._init_context(request)
-
-        record, created = ThrottleRecord.objects.get_or_create(
-            ident=self.ident,
-            scope=self.scope,
-            defaults={"level": 0, "expires_at": self.now, "attempts": 1},
-        )
-
-        if not created and record.expires_at <= self.now:
-            record.attempts += 1
-            record.save()
+        try:
+            self.storage.record_attempt(self)
+        except STORAGE_ERRORS:
+            logger.warning(
+                "Throttle %s attempt not recorded", self.scope, exc_info=True
+            )
 
     def reset_level(self, request):
         """
         Reset throttle level if user remains blocked for too long.
         """
         self._init_context(request)
-
         try:
-            record = ThrottleRecord.objects.get(
-                ident=self.ident, scope=self.scope
+            self.storage.reset_level(self)
+        except STORAGE_ERRORS:
+            logger.warning(
+                "Throttle %s reset failed", self.scope, exc_info=True
             )
-            if record.level >= self.reset_threshold:
-                record.delete()
-        except ThrottleRecord.DoesNotExist:
-            pass
 
     @staticmethod
     def format_duration(seconds):
@@ -310,3 +304,34 @@ SCOPE_CONFIG_MAP = {
     "password_change": "accounts.views.CustomPasswordChangeView",
     "password_reset": "accounts.views.CustomPasswordResetView",
 }
+
+
+def get_scope_throttle_config(scope):
+    """
+    Resolve `(base_window, max_level)` for a throttle scope.
+
+    Reads `throttle_base_window` / `throttle_max_level` from view classes
+    and `base_window` / `max_level` from throttle classes.
+    Returns None for unknown scopes or configs without a base window.
+    """
+    scope_config = SCOPE_CONFIG_MAP.get(scope)
+    if not scope_config:
+        return None
+
+    # If config is a string, import the class
+    if isinstance(scope_config, str):
+        try:
+            scope_config = import_string(scope_config)
+        except ImportError:
+            return None
+
+    base_window = getattr(
+        scope_config, "throttle_base_window", None
+    ) or getattr(scope_config, "base_window", None)
+    if base_window is None:
+        return None
+
+    max_level = getattr(scope_config, "throttle_max_level", None) or getattr(
+        scope_config, "max_level", 10
+    )
+    return base_window, max_level
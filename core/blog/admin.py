@@ -1,6 +1,6 @@
 from django.contrib import admin
 from .models import Post, Category
-from .models import Comment
+from .models import Comment, DigestRun
 from .forms import PostForm
 
 
@@ -46,4 +46,16 @@ class CommentAdmin(admin.ModelAdmin):
     actions = [confirm_and_delete_comments]
 
 
+@admin.register(DigestRun)
+class DigestRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "period_start",
+        "period_end",
+        "sent_count",
+        "last_user_id",
+        "is_completed",
+    )
+    list_filter = ("is_completed",)
+
+
 admin.site.register(Category)
@@ -0,0 +1,294 @@
+import functools
+import json
+import operator
+from urllib.parse import urlencode
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import CharField, F, Q, Value
+from django.db.models.functions import Concat
+from django.http import HttpResponse, HttpResponseNotAllowed
+from django.utils import timezone
+from rest_framework import exceptions, serializers
+from rest_framework.filters import search_smart_split
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from uploads.fields import renditions_representation
+from ...async_cache import aget_cached, aset_cached
+from ...models import Category, Comment, Post
+from .paginations import PostsPagination
+from .views import PostModelViewSet
+
+datetime_field = serializers.DateTimeField()
+
+# Query parameters of the post list besides `page`; nothing else is
+# part of its cache key or its links
+POST_LIST_PARAMS = ("category__name", "search", "ordering")
+
+
+def require_get(view):
+    """
+    require_GET for async views; Django 4.2's decorator only wraps sync
+    ones.
+    """
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        json.dumps(data, cls=DjangoJSONEncoder),
+        status=status,
+        content_type="application/json",
+    )
+
+
+def cached_response(body):
+    return HttpResponse(body, content_type="application/json")
+
+
+async def authenticate(request):
+    """
+    Resolve the user with the DRF authentication classes, in a thread.
+    Returns (user, None), or (None, error response) on bad credentials.
+    """
+
+    def resolve_user():
+        authenticators = [
+            auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ]
+        return Request(request, authenticators=authenticators).user
+
+    try:
+        return await sync_to_async(resolve_user)(), None
+    except exceptions.AuthenticationFailed as error:
+        return None, json_response({"detail": error.detail}, status=401)
+
+
+def published_posts():
+    return Post.objects.filter(
+        status=True, published_date__lte=timezone.now()
+    ).select_related("author__user", "category")
+
+
+def serialize_post(post, request):
+    """
+    Same keys as PostSerializer (without content and comments).
+    """
+    return {
+        "title": post.title,
+        "image": (
+            request.build_absolute_uri(post.image.url) if post.image else None
+        ),
+        "image_renditions": renditions_representation(
+            post.image, post.image_renditions, request
+        ),
+        "snippet": post.get_snippet(),
+        "author": post.author.full_name(),
+        "category": post.category.name if post.category else None,
+        "status": post.status,
+        "published_date": datetime_field.to_representation(
+            post.published_date
+        ),
+        "absolute_url": request.build_absolute_uri(post.get_absolute_url()),
+    }
+
+
+def search_posts(posts, value):
+    """
+    Filter like SearchFilter on PostModelViewSet: every search term
+    must be in one of its search fields.
+    """
+    terms = search_smart_split(value)
+    if not terms:
+        return posts
+    posts = posts.annotate(
+        author_full_name=Concat(
+            F("author__first_name"),
+            Value(" "),
+            F("author__last_name"),
+            output_field=CharField(),
+        )
+    )
+    for term in terms:
+        posts = posts.filter(
+            functools.reduce(
+                operator.or_,
+                (
+                    Q(**{f"{field}__icontains": term})
+                    for field in PostModelViewSet.search_fields
+                ),
+            )
+        )
+    return posts
+
+
+def get_ordering(value):
+    """
+    Read `ordering` like OrderingFilter: invalid fields are dropped, and
+    without valid ones the view's default applies.
+    """
+    fields = [field.strip() for field in value.split(",")]
+    ordering = [
+        field
+        for field in fields
+        if field.removeprefix("-") in PostModelViewSet.ordering_fields
+    ]
+    return ordering or PostModelViewSet.ordering
+
+
+def page_link(request, params, number):
+    """
+    Absolute URL of page `number` of the list, with `params` only.
+    """
+    query = urlencode({**params, "page": number} if number > 1 else params)
+    url = request.build_absolute_uri(request.path)
+    return f"{url}?{query}" if query else url
+
+
+def build_comment_tree(comments):
+    """
+    Nest visible comments like CommentSerializer does with `replies`.
+    """
+    children = {}
+    for comment in comments:
+        children.setdefault(comment.parent_id, []).append(comment)
+
+    def serialize(comment):
+        return {
+            "id": comment.id,
+            "author": comment.author.full_name(),
+            "text": comment.text,
+            "created_at": datetime_field.to_representation(comment.created_at),
+            "replies": [
+                serialize(reply) for reply in children.get(comment.id, [])
+            ],
+        }
+
+    return [serialize(comment) for comment in children.get(None, [])]
+
+
+@require_get
+async def post_list(request):
+    """
+    Async variant of the post list endpoint, with the same pagination,
+    category filter, search and ordering. Anonymous; pages are cached in
+    Redis for ASYNC_CACHE_TIMEOUT.
+    """
+    page = request.GET.get("page", "1")
+    params = {
+        name: request.GET[name]
+        for name in POST_LIST_PARAMS
+        if request.GET.get(name)
+    }
+    cache_key = f"post_list:{request.get_host()}:{page}:{urlencode(params)}"
+    cached = await aget_cached(cache_key)
+    if cached is not None:
+        return cached_response(cached)
+
+    posts = published_posts().order_by(
+        *get_ordering(params.get("ordering", ""))
+    )
+    if "category__name" in params:
+        posts = posts.filter(category__name=params["category__name"])
+    if "search" in params:
+        posts = search_posts(posts, params["search"])
+
+    page_size = PostsPagination.page_size
+    count = await posts.acount()
+    total_pages = max(1, -(-count // page_size))
+    if not page.isdigit() or not 1 <= int(page) <= total_pages:
+        return json_response({"detail": "Invalid page."}, status=404)
+    number = int(page)
+
+    offset = (number - 1) * page_size
+    page_posts = posts[offset:][:page_size]
+    results = [
+        serialize_post(post, request) async for post in page_posts.aiterator()
+    ]
+
+    next_link = previous_link = None
+    if number < total_pages:
+        next_link = page_link(request, params, number + 1)
+    if number > 1:
+        previous_link = page_link(request, params, number - 1)
+    data = {
+        "links": {"next": next_link, "previous": previous_link},
+        "total_objects": count,
+        "total_pages": total_pages,
+        "results": results,
+    }
+    body = json.dumps(data, cls=DjangoJSONEncoder)
+    await aset_cached(cache_key, body)
+    return cached_response(body)
+
+
+@require_get
+async def post_detail(request, slug):
+    """
+    Async variant of the post detail endpoint: authenticated users see
+    published posts and their own drafts, with approved comments.
+    """
+    user, error = await authenticate(request)
+    if error:
+        return error
+    if not user.is_authenticated:
+        return json_response(
+            {"detail": "Authentication credentials were not provided."},
+            status=401,
+        )
+
+    visible = Q(status=True, published_date__lte=timezone.now()) | Q(
+        author__user_id=user.pk
+    )
+    try:
+        post = await Post.objects.select_related(
+            "author__user", "category"
+        ).aget(visible, slug=slug)
+    except Post.DoesNotExist:
+        return json_response({"detail": "Not found."}, status=404)
+
+    comments = Comment.objects.filter(
+        post=post, is_hidden=False, is_approved=True
+    ).select_related("author__user")
+    data = serialize_post(post, request)
+    del data["snippet"]
+    data["content"] = post.content
+    data["comments"] = build_comment_tree(
+        [comment async for comment in comments.aiterator()]
+    )
+    return json_response(data)
+
+
+@require_get
+async def category_list(request):
+    """
+    Async variant of the category list endpoint (admin users only).
+    """
+    user, error = await authenticate(request)
+    if error:
+        return error
+    if not user.is_staff:
+        return json_response(
+            {"detail": "You do not have permission to perform this action."},
+            status=403 if user.is_authenticated else 401,
+        )
+
+    return json_response(
+        [
+            {
+                "id": category.id,
+                "name": category.name,
+                "absolute_url": request.build_absolute_uri(
+                    category.get_absolute_url()
+                ),
+            }
+            async for category in Category.objects.aiterator()
+        ]
+    )
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
+from uploads.fields import ImageRenditionsField
 from ...models import Post, Category, Comment
-from accounts.models import Profile
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -77,12 +77,14 @@ class PostSerializer(serializers.ModelSerializer):
     snippet = serializers.ReadOnlyField(source="get_snippet")
     absolute_url = serializers.SerializerMethodField(read_only=True)
     comments = serializers.SerializerMethodField()
+    image_renditions = ImageRenditionsField()
 
     class Meta:
         model = Post
         fields = [
             "title",
             "image",
+            "image_renditions",
             "snippet",
             "content",
             "author",
@@ -126,7 +128,7 @@ class PostSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         request = self.context.get("request")
-        validated_data["author"] = Profile.objects.get(user=request.user)
+        validated_data["author"] = request.user.profile
         if "image" not in validated_data or validated_data["image"] in [
             None,
             "",
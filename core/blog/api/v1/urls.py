@@ -1,10 +1,24 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from . import async_views, views
 
 app_name = "api-v1"
 
 router = DefaultRouter()
 router.register("post", views.PostModelViewSet, basename="post")
 router.register("category", views.CategoryModelViewSet, basename="category")
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    # Async read endpoints, for ASGI servers (core.asgi)
+    path("async/post/", async_views.post_list, name="async-post-list"),
+    path(
+        "async/post/<str:slug>/",
+        async_views.post_detail,
+        name="async-post-detail",
+    ),
+    path(
+        "async/category/",
+        async_views.category_list,
+        name="async-category-list",
+    ),
+]
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import weakref
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "async_api"
+
+# One client per event loop; redis.asyncio connections are bound to it
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_redis():
+    """
+    Return the redis.asyncio client of the running loop, or None when
+    ASYNC_CACHE_URL is empty.
+    """
+    if not settings.ASYNC_CACHE_URL:
+        return None
+    import redis.asyncio
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = redis.asyncio.Redis.from_url(settings.ASYNC_CACHE_URL)
+        _clients[loop] = client
+    return client
+
+
+async def aget_cached(key):
+    """
+    Cached bytes for `key`, or None on a miss or a Redis error.
+    """
+    from redis.exceptions import RedisError
+
+    client = get_async_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(f"{KEY_PREFIX}:{key}")
+    except RedisError:
+        logger.warning("Async cache read failed", exc_info=True)
+        return None
+
+
+async def aset_cached(key, value, timeout=None):
+    from redis.exceptions import RedisError
+
+    client = get_async_redis()
+    if client is None:
+        return
+    try:
+        await client.set(
+            f"{KEY_PREFIX}:{key}",
+            value,
+            ex=timeout or settings.ASYNC_CACHE_TIMEOUT,
+        )
+    except RedisError:
+        logger.warning("Async cache write failed", exc_info=True)
@@ -0,0 +1,144 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from mail_templated import EmailMessage
+
+from .models import DigestRun, Post
+
+User = get_user_model()
+
+# Replaced with each recipient's rendered header
+HEADER_MARKER = "<!-- digest-header -->"
+
+
+def get_current_run(now=None):
+    """
+    Return the unfinished digest run, or start a new one covering the
+    time since the previous run ended (one week for the first run).
+    """
+    now = now or timezone.now()
+    run = DigestRun.objects.filter(is_completed=False).first()
+    if run:
+        return run
+
+    last_run = DigestRun.objects.filter(is_completed=True).first()
+    period_start = last_run.period_end if last_run else now - timedelta(days=7)
+    return DigestRun.objects.create(period_start=period_start, period_end=now)
+
+
+def render_shared_digest(posts):
+    """
+    Render the digest template once for every recipient.
+    Returns (subject, html) with HEADER_MARKER in place of the header.
+    """
+    message = EmailMessage(
+        template_name="email/weekly-digest.tpl",
+        context={
+            "posts": posts,
+            "domain": settings.DOMAIN_NAME,
+            "header": mark_safe(HEADER_MARKER),
+        },
+        render=True,
+    )
+    return message.subject, message.body
+
+
+def iter_recipient_chunks(last_user_id, chunk_size):
+    """
+    Stream verified users after `last_user_id` in id order, in chunks.
+    """
+    recipients = (
+        User.objects.filter(
+            is_verified=True, is_active=True, id__gt=last_user_id
+        )
+        .order_by("id")
+        .values_list("id", "email", "profile__first_name")
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for recipient in recipients:
+        chunk.append(recipient)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def send_digest(chunk_size=None, rate_limit=None, connection=None):
+    """
+    Send the weekly digest of new posts to all verified users.
+
+    The post block is rendered once and only the header is rendered per
+    recipient. Recipients are streamed in chunks over one pooled
+    connection, at no more than `rate_limit` messages per second.
+    Progress is saved after every chunk, and up to the last delivered
+    message when sending fails, so a resumed run sends no duplicates.
+    Returns the number of messages sent by this call.
+    """
+    chunk_size = chunk_size or settings.DIGEST_CHUNK_SIZE
+    if rate_limit is None:
+        rate_limit = settings.DIGEST_RATE_LIMIT
+
+    run = get_current_run()
+    posts = list(
+        Post.objects.filter(
+            status=True,
+            published_date__gt=run.period_start,
+            published_date__lte=run.period_end,
+        )
+        .select_related("author__user")
+        .order_by("-published_date")[: settings.DIGEST_MAX_POSTS]
+    )
+    if not posts:
+        run.is_completed = True
+        run.save()
+        return 0
+
+    subject, shared_html = render_shared_digest(posts)
+    header_template = get_template("email/weekly-digest-header.html")
+    connection = connection or get_connection()
+    started = time.monotonic()
+    sent = 0
+
+    with connection:
+        for chunk in iter_recipient_chunks(run.last_user_id, chunk_size):
+            delivered = 0
+            try:
+                for user_id, email, first_name in chunk:
+                    header = header_template.render(
+                        {"name": first_name or email}
+                    )
+                    message = EmailMultiAlternatives(
+                        subject=subject,
+                        body=shared_html.replace(HEADER_MARKER, header, 1),
+                        from_email=settings.EMAIL_HOST_USER or None,
+                        to=[email],
+                        connection=connection,
+                    )
+                    message.content_subtype = "html"
+                    delivered += connection.send_messages([message]) or 0
+                    run.last_user_id = user_id
+            finally:
+                # Saved on failures too, so a resumed run starts after
+                # the last recipient that was reached
+                sent += delivered
+                run.sent_count += delivered
+                run.save(
+                    update_fields=["last_user_id", "sent_count", "updated_at"]
+                )
+
+            # Rate control: keep the average under `rate_limit` msgs/sec
+            if rate_limit:
+                ahead = sent / rate_limit - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    run.is_completed = True
+    run.save(update_fields=["is_completed", "updated_at"])
+    return sent
@@ -0,0 +1,97 @@
+import time
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+from blog.models import Post
+
+# (label, CONN_MAX_AGE, psycopg 3 prepare_threshold)
+MODES = [
+    ("new connection per request", 0, None),
+    ("persistent connection", 300, None),
+    ("persistent + prepared statements", 300, 1),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the time per simulated request of the hot post queries "
+        "with a new DB connection per request, a persistent connection "
+        "and a persistent connection with server-side prepared statements."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Simulated requests per mode.",
+        )
+
+    def handle(self, *args, **options):
+        slug = (
+            Post.objects.filter(status=True)
+            .values_list("slug", flat=True)
+            .first()
+        )
+        settings_dict = connection.settings_dict
+        saved = settings_dict["CONN_MAX_AGE"], settings_dict.get(
+            "CONN_HEALTH_CHECKS", False
+        )
+        prepared = connection.vendor == "postgresql" and settings_dict.get(
+            "OPTIONS", {}
+        ).get("server_side_binding")
+
+        try:
+            for label, max_age, threshold in MODES:
+                if threshold and not prepared:
+                    self.stdout.write(
+                        f"{label}: skipped (needs PostgreSQL, psycopg 3 "
+                        "and server_side_binding)"
+                    )
+                    continue
+                connection.close()
+                settings_dict["CONN_MAX_AGE"] = max_age
+                settings_dict["CONN_HEALTH_CHECKS"] = bool(max_age)
+                self.run(label, threshold, slug, options["requests"])
+        finally:
+            connection.close()
+            (
+                settings_dict["CONN_MAX_AGE"],
+                settings_dict["CONN_HEALTH_CHECKS"],
+            ) = saved
+
+    def run(self, label, threshold, slug, requests):
+        opened = []
+
+        def on_connect(sender, connection, **kwargs):
+            opened.append(connection.alias)
+            if hasattr(connection.connection, "prepare_threshold"):
+                connection.connection.prepare_threshold = threshold
+
+        connection_created.connect(on_connect)
+        try:
+            started = time.perf_counter()
+            for _ in range(requests):
+                request_started.send(sender=self.__class__)
+                list(
+                    Post.objects.filter(
+                        status=True, published_date__lte=timezone.now()
+                    )
+                    .select_related("author", "category")
+                    .order_by("-published_date")[:3]
+                )
+                Post.objects.filter(slug=slug).first()
+                request_finished.send(sender=self.__class__)
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(on_connect)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: {elapsed / requests * 1000:.3f}ms/request, "
+                f"{len(opened)} connections opened"
+            )
+        )
@@ -0,0 +1,216 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# "default" is the previous setup: gunicorn's defaults, no config file.
+# "uvicorn" serves core.asgi and is benchmarked on --async-path.
+PROFILES = ["default", "sync", "gthread", "gevent", "uvicorn"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn with each profile of gunicorn.conf.py and measure "
+        "the time to the first response and the throughput and latency "
+        "under concurrent load."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            nargs="+",
+            choices=PROFILES,
+            default=["default", "gthread"],
+        )
+        parser.add_argument("--path", default="/blog/")
+        parser.add_argument(
+            "--async-path",
+            default="/blog/api/v1/async/post/",
+            help="Path requested from the uvicorn profile.",
+        )
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Same worker count for every profile (default: sized by "
+            "gunicorn.conf.py).",
+        )
+        parser.add_argument(
+            "--slow-clients",
+            type=int,
+            default=0,
+            help="Clients that trickle their requests during the load.",
+        )
+        parser.add_argument(
+            "--slow-delay",
+            type=float,
+            default=2.0,
+            help="Seconds a slow client takes to send each request.",
+        )
+
+    def handle(self, *args, **options):
+        for profile in options["profiles"]:
+            self.run(profile, options)
+
+    def server_command(self, profile, bind, workers):
+        # Other profiles read the bind and workers from the environment
+        if profile == "default":
+            command = ["gunicorn", "-c", os.devnull, "--bind", bind]
+            if workers:
+                command += ["--workers", str(workers)]
+        else:
+            command = ["gunicorn", "-c", "gunicorn.conf.py"]
+        if profile == "uvicorn":
+            return command + ["core.asgi:application"]
+        return command + ["core.wsgi:application"]
+
+    def run(self, profile, options):
+        host, port = "127.0.0.1", options["port"]
+        path = options["async_path" if profile == "uvicorn" else "path"]
+        env = dict(
+            os.environ,
+            GUNICORN_PROFILE=profile,
+            GUNICORN_BIND=f"{host}:{port}",
+            DJANGO_SETTINGS_MODULE=os.environ.get(
+                "DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE
+            ),
+        )
+        if options["workers"]:
+            env["GUNICORN_WORKERS"] = str(options["workers"])
+
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            self.server_command(
+                profile, env["GUNICORN_BIND"], options["workers"]
+            ),
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            ready, first = self.wait_for_first_response(
+                host, port, path, server
+            )
+            ready -= started
+            stop = threading.Event()
+            slow_clients = [
+                threading.Thread(
+                    target=self.slow_client,
+                    args=(host, port, path, options["slow_delay"], stop),
+                )
+                for _ in range(options["slow_clients"])
+            ]
+            for thread in slow_clients:
+                thread.start()
+            try:
+                latencies, errors, elapsed = self.load(
+                    host,
+                    port,
+                    path,
+                    options["requests"],
+                    options["concurrency"],
+                )
+            finally:
+                stop.set()
+                for thread in slow_clients:
+                    thread.join()
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{profile} {path}: first response {first * 1000:.0f}ms "
+                f"({ready:.2f}s after start), "
+                f"{len(latencies) / elapsed:.0f} req/s, "
+                f"p50 {statistics.median(latencies or [0]) * 1000:.1f}ms, "
+                f"p95 {p95 * 1000:.1f}ms, {errors} errors"
+            )
+        )
+
+    def wait_for_first_response(self, host, port, path, server, timeout=60):
+        """
+        Poll until the server answers; returns (time answered, duration
+        of the first answered request).
+        """
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if server.poll() is not None:
+                raise CommandError("gunicorn exited during startup.")
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            try:
+                request_started = time.perf_counter()
+                connection.request("GET", path)
+                connection.getresponse().read()
+                answered = time.perf_counter()
+                return answered, answered - request_started
+            except OSError:
+                time.sleep(0.05)
+            finally:
+                connection.close()
+        raise CommandError("gunicorn did not answer in time.")
+
+    def load(self, host, port, path, requests, concurrency):
+        """
+        Send `requests` GETs from `concurrency` keep-alive clients.
+        Returns (latencies, errors, elapsed seconds).
+        """
+        per_client = max(1, requests // concurrency)
+
+        def client(_):
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            latencies, errors = [], 0
+            for _ in range(per_client):
+                request_started = time.perf_counter()
+                try:
+                    connection.request("GET", path)
+                    response = connection.getresponse()
+                    response.read()
+                except OSError:
+                    connection.close()
+                    errors += 1
+                    continue
+                if response.status >= 500:
+                    errors += 1
+                latencies.append(time.perf_counter() - request_started)
+            connection.close()
+            return latencies, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(client, range(concurrency)))
+        elapsed = time.perf_counter() - started
+        latencies = [value for result, _ in results for value in result]
+        return latencies, sum(errors for _, errors in results), elapsed
+
+    def slow_client(self, host, port, path, delay, stop):
+        """
+        Repeatedly send a request whose headers take `delay` seconds to
+        arrive, like a client on a slow network, until `stop` is set.
+        """
+        while not stop.is_set():
+            try:
+                with socket.create_connection(
+                    (host, port), timeout=30
+                ) as sock:
+                    sock.sendall(
+                        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n".encode()
+                    )
+                    stop.wait(delay)
+                    sock.sendall(b"Connection: close\r\n\r\n")
+                    while sock.recv(65536):
+                        pass
+            except OSError:
+                stop.wait(0.1)
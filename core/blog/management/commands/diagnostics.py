@@ -0,0 +1,97 @@
+import pickle
+from collections import defaultdict
+from itertools import islice
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+
+from core.cache import format_size, key_family, size_histogram
+
+BAR_WIDTH = 40
+
+
+class Command(BaseCommand):
+    help = (
+        "Report cache payload sizes of the Redis cache aliases: a size "
+        "histogram, and the stored size of each key family against "
+        "uncompressed pickle."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--aliases",
+            nargs="+",
+            help="Cache aliases to inspect (default: every Redis alias).",
+        )
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=10000,
+            help="Keys scanned per alias.",
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="Key families listed."
+        )
+
+    def handle(self, *args, **options):
+        aliases = options["aliases"] or [
+            alias
+            for alias, config in settings.CACHES.items()
+            if config["BACKEND"].startswith("django_redis.")
+        ]
+        for alias in aliases:
+            self.report_cache(alias, options["sample"], options["top"])
+
+    def report_cache(self, alias, sample, top):
+        from redis.exceptions import ResponseError
+
+        client = caches[alias].client
+        redis = client.get_client(write=False)
+        # family -> [keys, stored bytes, pickled bytes]
+        families = defaultdict(lambda: [0, 0, 0])
+        sizes = []
+        for key in islice(redis.scan_iter(count=1000), sample):
+            try:
+                value = redis.get(key)
+            except ResponseError:
+                continue  # Not a string: throttle hashes, sets
+            if value is None:
+                continue
+            stored = len(value)
+            try:
+                pickled = len(
+                    pickle.dumps(client.decode(value), pickle.DEFAULT_PROTOCOL)
+                )
+            except Exception:
+                # Raw values written around the cache API (async pages,
+                # revocation bitmaps)
+                pickled = stored
+            family = families[key_family(key)]
+            family[0] += 1
+            family[1] += stored
+            family[2] += pickled
+            sizes.append(stored)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cache {alias!r}: {len(sizes)} values, "
+                f"{format_size(sum(sizes))} stored"
+            )
+        )
+        histogram = size_histogram(sizes)
+        largest = max((count for _, count in histogram), default=0) or 1
+        for label, count in histogram:
+            bar = "#" * round(count / largest * BAR_WIDTH)
+            self.stdout.write(f"  {label:>10} {count:>7} {bar}")
+
+        self.stdout.write(
+            f"  {'family':<40} {'keys':>7} {'stored':>10} {'average':>10} "
+            f"{'vs pickle':>9}"
+        )
+        ranked = sorted(families.items(), key=lambda item: -item[1][1])
+        for family, (keys, stored, pickled) in ranked[:top]:
+            change = stored / pickled - 1 if pickled else 0
+            self.stdout.write(
+                f"  {family[:40]:<40} {keys:>7} {format_size(stored):>10} "
+                f"{format_size(stored / keys):>10} {change:>+9.0%}"
+            )
@@ -1,60 +1,173 @@
-from django.core.management.base import BaseCommand
+import hashlib
+import json
+import os
+import pkgutil
+import time
+from importlib.util import find_spec
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
 from django.core.management import call_command
-from django.db.migrations.executor import MigrationExecutor
+from django.core.management.base import BaseCommand
 from django.db import connections
-from django.db.utils import OperationalError
-from accounts.scheduler import setup_periodic_tasks
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django_celery_beat.models import PeriodicTask
+
+from accounts.scheduler import (
+    PERIODIC_TASKS,
+    periodic_tasks_fingerprint,
+    setup_periodic_tasks,
+)
+from core.db_router import migration_databases
+
+# Fingerprints of the last successful steps. Kept in STATIC_ROOT so a
+# fresh static volume also re-runs collectstatic.
+STATE_FILE = ".prepare_app.json"
+STEPS = ("migrate", "collectstatic", "periodic_tasks")
+IGNORE_PATTERNS = ["CVS", ".*", "*~"]
+
+
+def unapplied_migrations(database="default"):
+    """
+    Migrations on disk that are not recorded in the database, found
+    without building the migration graph (no migration is imported).
+    """
+    recorder = MigrationRecorder(connections[database])
+    applied = set(recorder.applied_migrations())
+    pending = []
+    for app_config in apps.get_app_configs():
+        module_name, _ = MigrationLoader.migrations_module(app_config.label)
+        spec = find_spec(module_name) if module_name else None
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        for module in pkgutil.iter_modules(spec.submodule_search_locations):
+            name = module.name
+            if module.ispkg or name.startswith(("_", "~")):
+                continue
+            if (app_config.label, name) not in applied:
+                pending.append((app_config.label, name))
+    return pending
+
+
+def static_fingerprint():
+    """
+    Hash of every static source file (path, size, mtime) and of the
+    static storage settings.
+    """
+    entries = []
+    for finder in get_finders():
+        for path, storage in finder.list(IGNORE_PATTERNS):
+            stat = os.stat(storage.path(path))
+            prefix = getattr(storage, "prefix", None) or ""
+            entries.append(
+                f"{prefix}/{path}\0{stat.st_size}\0{stat.st_mtime_ns}"
+            )
+    entries.sort()
+    entries.append(repr(settings.STORAGES.get("staticfiles")))
+    entries.append(repr(sorted(settings.STATIC_COMPRESS_EXTENSIONS)))
+    return hashlib.sha256("\n".join(entries).encode()).hexdigest()
 
 
 class Command(BaseCommand):
-    help = "Prepare the application by making migrations, migrating, and collecting static files."
+    help = (
+        "Prepare the application: apply migrations, collect static files "
+        "and set up periodic tasks, skipping steps whose inputs did not "
+        "change. Run it as a one-shot job before starting web processes."
+    )
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--steps",
+            nargs="+",
+            choices=STEPS,
+            default=list(STEPS),
+            help="Steps to run (default: all).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run the steps even when nothing changed.",
+        )
+
+    def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS("Starting preparation steps..."))
+        self.state = self.load_state()
+        self.force = options["force"]
+        started = time.perf_counter()
 
-        # Check if migrations are needed
-        self.stdout.write("Checking for pending migrations...")
-        if self._has_pending_migrations():
-            self.stdout.write(
-                "Pending migrations found. Applying migrations..."
-            )
-            # Make migrations
-            self.stdout.write("Making migrations...")
-            call_command("makemigrations")
-
-            # Apply migrations
-            self.stdout.write("Applying migrations...")
-            call_command("migrate")
-        else:
+        for step in STEPS:
+            if step not in options["steps"]:
+                continue
+            step_started = time.perf_counter()
+            ran = getattr(self, f"run_{step}")()
             self.stdout.write(
-                self.style.SUCCESS("No pending migrations found.")
+                f"  {step}: {'done' if ran else 'unchanged, skipped'} "
+                f"in {time.perf_counter() - step_started:.2f}s"
             )
 
-        # Collect static files
-        self.stdout.write("Collecting static files...")
-        call_command("collectstatic", "--noinput")
-
-        self.stdout.write("Setting up periodic tasks...")
-        setup_periodic_tasks()
         self.stdout.write(
-            self.style.SUCCESS("Periodic tasks set successfully.")
+            self.style.SUCCESS(
+                "All preparation steps completed in "
+                f"{time.perf_counter() - started:.2f}s."
+            )
         )
 
-        self.stdout.write(
-            self.style.SUCCESS(
-                "All preparation steps completed successfully."
+    def run_migrate(self):
+        # The primary first: the hot-write database (core.db_router)
+        # only gets the tables routed to it
+        databases = [
+            database
+            for database in migration_databases()
+            if self.force or unapplied_migrations(database)
+        ]
+        for database in databases:
+            call_command(
+                "migrate", "--noinput", database=database, verbosity=0
             )
+        return bool(databases)
+
+    def run_collectstatic(self):
+        fingerprint = static_fingerprint()
+        if not self.force and self.state.get("static") == fingerprint:
+            return False
+        call_command("collectstatic", "--noinput", verbosity=0)
+        self.save_state(static=fingerprint)
+        return True
+
+    def run_periodic_tasks(self):
+        fingerprint = periodic_tasks_fingerprint()
+        # The rows are checked too, in case the database was reset
+        unchanged = (
+            self.state.get("periodic_tasks") == fingerprint
+            and self.periodic_tasks_exist()
+        )
+        if not self.force and unchanged:
+            return False
+        setup_periodic_tasks()
+        self.save_state(periodic_tasks=fingerprint)
+        return True
+
+    def periodic_tasks_exist(self):
+        names = [spec["name"] for spec in PERIODIC_TASKS]
+        return PeriodicTask.objects.filter(name__in=names).count() == len(
+            names
         )
 
-    def _has_pending_migrations(self):
-        """
-        Check if there are any pending migrations.
-        """
+    def state_path(self):
+        return os.path.join(settings.STATIC_ROOT, STATE_FILE)
+
+    def load_state(self):
         try:
-            connection = connections["default"]
-            executor = MigrationExecutor(connection)
-            targets = executor.loader.graph.leaf_nodes()
-            return executor.migration_plan(targets)
-        except OperationalError:
-            # If the database is not initialized, assume migrations are needed
-            return True
+            with open(self.state_path()) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, **fingerprints):
+        self.state.update(fingerprints)
+        os.makedirs(settings.STATIC_ROOT, exist_ok=True)
+        temp_path = f"{self.state_path()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.state, file)
+        os.replace(temp_path, self.state_path())
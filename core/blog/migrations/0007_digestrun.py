@@ -0,0 +1,37 @@
+# Generated by Django 4.2.15 on 2026-10-19 11:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_alter_category_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DigestRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("period_start", models.DateTimeField()),
+                ("period_end", models.DateTimeField()),
+                ("last_user_id", models.BigIntegerField(default=0)),
+                ("sent_count", models.PositiveIntegerField(default=0)),
+                ("is_completed", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-period_end"],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.15 on 2026-10-19 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_digestrun"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
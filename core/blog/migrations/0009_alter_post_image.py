@@ -0,0 +1,25 @@
+# Generated by Django 4.2.15 on 2026-10-19 11:34
+
+from django.db import migrations, models
+import uploads.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_post_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                default="defaults/default_post.png",
+                null=True,
+                storage=uploads.storage.get_content_addressed_storage,
+                upload_to="post_images/",
+            ),
+        ),
+    ]
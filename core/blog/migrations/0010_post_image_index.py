@@ -0,0 +1,26 @@
+# Generated by Django 4.2.15 on 2026-10-19 12:20
+
+from django.db import migrations, models
+import uploads.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_alter_post_image"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                db_index=True,
+                default="defaults/default_post.png",
+                null=True,
+                storage=uploads.storage.get_content_addressed_storage,
+                upload_to="post_images/",
+            ),
+        ),
+    ]
@@ -5,6 +5,8 @@ import re
 from decouple import config
 from ckeditor_uploader.fields import RichTextUploadingField
 
+from uploads.storage import get_content_addressed_storage
+
 
 # Create your models here.
 def get_bad_words():
@@ -22,11 +24,19 @@ class Post(models.Model):
     author = models.ForeignKey(
         "accounts.Profile", on_delete=models.CASCADE, related_name="posts"
     )
+    # Indexed for the media access checks (uploads.access); on PostgreSQL
+    # the index gets a varchar_pattern_ops twin for prefix lookups
     image = models.ImageField(
         upload_to="post_images/",
+        storage=get_content_addressed_storage,
         blank=True,
         null=True,
         default="defaults/default_post.png",
+        db_index=True,
+    )
+    # Rendition manifest of `image`, filled by uploads.tasks
+    image_renditions = models.JSONField(
+        default=dict, blank=True, editable=False
     )
     category = models.ForeignKey(
         "Category", on_delete=models.SET_NULL, null=True
@@ -124,3 +134,27 @@ class CommentReport(models.Model):
 
     def __str__(self):
         return f"{self.user} -> {self.comment}"
+
+
+class DigestRun(models.Model):
+    """
+    Progress of one weekly digest fan-out.
+    Lets an interrupted run resume after the last user it reached.
+    """
+
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField()
+    last_user_id = models.BigIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    is_completed = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-period_end"]
+
+    def __str__(self):
+        return (
+            f"Digest {self.period_start:%Y-%m-%d} → {self.period_end:%Y-%m-%d}"
+        )
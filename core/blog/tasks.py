@@ -1,6 +1,7 @@
 from celery import shared_task
 from django.utils import timezone
 from .models import Comment, Post
+from .digest import send_digest
 from accounts.models import Profile
 
 
@@ -37,3 +38,12 @@ def create_comment_task(post_slug, profile_id, text, parent_id=None):
 
         # Save the comment to the database
         comment.save()
+
+
+@shared_task
+def send_weekly_digest():
+    """
+    Email verified users a digest of the posts published since the last
+    digest. Resumes an interrupted run instead of starting over.
+    """
+    return send_digest()
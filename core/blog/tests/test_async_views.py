@@ -0,0 +1,142 @@
+"""
+Test suite for the async read endpoints.
+"""
+
+import pytest
+from datetime import timedelta
+from django.core.cache import caches
+from django.urls import reverse
+
+from blog.models import Comment, Post
+
+
+@pytest.fixture
+def local_caches(settings):
+    """
+    Uses in-process caches instead of Redis and disables the async cache.
+    """
+    settings.CACHES = {
+        alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        for alias in ("default", "sessions")
+    }
+    settings.JWT_REVOCATION_ENABLED = False
+    settings.ASYNC_CACHE_URL = ""
+    yield
+    for alias in ("default", "sessions"):
+        caches[alias].clear()
+
+
+@pytest.mark.django_db
+def test_async_post_list_matches_sync_list(
+    api_client, local_caches, test_post
+):
+    """
+    The async list returns the same page as the DRF list.
+    """
+    response = api_client.get(reverse("blog:api-v1:async-post-list"))
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_objects"] == 1
+    assert data["links"] == {"next": None, "previous": None}
+    assert data["results"][0]["title"] == test_post.title
+    assert data["results"][0]["snippet"] == test_post.get_snippet()
+    assert data["results"][0]["category"] == "Test Category"
+
+    response = api_client.get(
+        reverse("blog:api-v1:async-post-list"), {"page": 2}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_post_list_searches_orders_and_links(
+    api_client, local_caches, test_post
+):
+    """
+    Search and ordering work like the DRF list, and page links carry
+    only the list's own query parameters.
+    """
+    for day in range(1, 5):
+        Post.objects.create(
+            author=test_post.author,
+            title=f"Match {day}",
+            content="Content",
+            category=test_post.category,
+            status=True,
+            published_date=test_post.published_date - timedelta(days=day),
+        )
+    url = reverse("blog:api-v1:async-post-list")
+
+    data = api_client.get(
+        url, {"search": "match", "ordering": "published_date", "utm": "x"}
+    ).json()
+    assert data["total_objects"] == 4
+    assert [post["title"] for post in data["results"]] == [
+        "Match 4",
+        "Match 3",
+        "Match 2",
+    ]
+    assert data["links"]["previous"] is None
+    assert data["links"]["next"] == (
+        "http://testserver/blog/api/v1/async/post/"
+        "?search=match&ordering=published_date&page=2"
+    )
+
+    data = api_client.get(url, {"ordering": "title", "page": 2}).json()
+    assert [post["title"] for post in data["results"]] == [
+        "Match 3",
+        "Match 4",
+    ]
+    assert data["links"]["previous"] == (
+        "http://testserver/blog/api/v1/async/post/?ordering=title"
+    )
+
+
+@pytest.mark.django_db
+def test_async_post_detail_requires_authentication(
+    api_client, local_caches, test_user, test_post
+):
+    """
+    Detail needs a user and nests approved comments under their parent.
+    """
+    user, profile = test_user
+    comment = Comment.objects.create(
+        author=profile, post=test_post, text="Root", is_approved=True
+    )
+    Comment.objects.create(
+        author=profile,
+        post=test_post,
+        text="Reply",
+        parent=comment,
+        is_approved=True,
+    )
+    Comment.objects.create(author=profile, post=test_post, text="Pending")
+    url = reverse(
+        "blog:api-v1:async-post-detail", kwargs={"slug": test_post.slug}
+    )
+
+    assert api_client.get(url).status_code == 401
+
+    api_client.force_authenticate(user=user)
+    data = api_client.get(url).json()
+    assert data["content"] == test_post.content
+    assert [c["text"] for c in data["comments"]] == ["Root"]
+    assert data["comments"][0]["replies"][0]["text"] == "Reply"
+
+
+@pytest.mark.django_db
+def test_async_category_list_is_admin_only(
+    api_client, local_caches, test_user, test_category
+):
+    """
+    Like the DRF category list, only staff may list categories.
+    """
+    user, _ = test_user
+    url = reverse("blog:api-v1:async-category-list")
+    api_client.force_authenticate(user=user)
+    assert api_client.get(url).status_code == 403
+
+    user.is_staff = True
+    user.save()
+    api_client.force_authenticate(user=user)
+    assert api_client.get(url).json()[0]["name"] == test_category.name
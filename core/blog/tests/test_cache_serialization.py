@@ -0,0 +1,102 @@
+"""
+Test suite for the compact cache serializer and threshold compressor.
+"""
+
+import pickle
+import pytest
+from django.conf import settings
+from django_redis.client import DefaultClient
+
+from blog.models import Category
+from core.cache import (
+    CompactSerializer,
+    ThresholdCompressor,
+    key_family,
+    size_histogram,
+)
+
+
+@pytest.fixture
+def client():
+    """
+    Returns a django-redis client with the "default" alias options;
+    encoding and decoding need no Redis server.
+    """
+    return DefaultClient(
+        "redis://localhost:6379/0",
+        {"OPTIONS": settings.CACHES["default"]["OPTIONS"]},
+        backend=None,
+    )
+
+
+@pytest.mark.parametrize(
+    "value, tag",
+    [
+        ({"page": 1, "titles": ["a", "b"], "score": 2.5}, b"j"),
+        ("text", b"j"),
+        (True, b"j"),
+        ((1, 2), b"p"),
+        (b"bytes", b"p"),
+        (Category(id=3, name="News"), b"p"),
+    ],
+)
+def test_values_round_trip(client, value, tag):
+    """
+    Plain data is stored as JSON, anything else is pickled.
+    """
+    encoded = client.encode(value)
+    decoded = client.decode(encoded)
+
+    assert encoded[:1] == tag
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+def test_large_values_are_compressed(client):
+    """
+    Values over COMPRESS_MIN_SIZE are compressed, smaller ones are not.
+    """
+    small = {"id": 1}
+    large = {"rows": [{"title": "Lorem ipsum", "id": i} for i in range(200)]}
+
+    assert client.encode(small) == b'j{"id":1}'
+    encoded = client.encode(large)
+    assert encoded[:1] == b"Z"
+    assert len(encoded) < len(CompactSerializer({}).dumps(large)) / 4
+    assert client.decode(encoded) == large
+
+
+def test_values_written_with_pickle_are_read(client):
+    """
+    Entries written by the previous pickle serializer stay readable.
+    """
+    value = {"cached": ["queryset"]}
+    assert client.decode(pickle.dumps(value)) == value
+
+
+def test_lz4_compression():
+    """
+    The lz4 algorithm round-trips through the compressor.
+    """
+    pytest.importorskip("lz4.frame")
+    compressor = ThresholdCompressor({"COMPRESS_ALGORITHM": "lz4"})
+    value = b"x" * 4096
+
+    compressed = compressor.compress(value)
+    assert compressed[:1] == b"L"
+    assert compressor.decompress(compressed) == value
+
+
+def test_key_family_and_histogram():
+    """
+    Keys are grouped without prefix, version and numbers, and sizes are
+    counted per bucket.
+    """
+    assert key_family(b":1:post_list_page_12") == "post_list_page_#"
+    assert key_family("async_api:/blog/") == "async_api:/blog/"
+
+    histogram = dict(size_histogram([10, 64, 100, 5000, 10**6]))
+    assert histogram["<= 64B"] == 2
+    assert histogram["<= 256B"] == 1
+    assert histogram["<= 16KiB"] == 1
+    assert histogram["> 64KiB"] == 1
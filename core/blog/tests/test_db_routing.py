@@ -0,0 +1,117 @@
+"""
+Test suite for primary/replica routing with read-your-writes pinning.
+"""
+
+import pytest
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.models import Category, Post
+from core.db_router import PrimaryReplicaRouter, begin_request, end_request
+from core.middleware import PrimaryPinMiddleware
+
+# Transactional tests: reads inside the test's own transaction would
+# always be routed to the primary
+DATABASES = ["default", "replica"]
+
+
+@pytest.fixture
+def replica(settings):
+    """
+    Routes reads to the "replica" alias (a test mirror of "default") and
+    uses in-process caches instead of Redis.
+    """
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.CACHES = {
+        alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        for alias in ("default", "sessions")
+    }
+    yield
+    for alias in ("default", "sessions"):
+        caches[alias].clear()
+
+
+def pin_cookie(settings, response):
+    return response.cookies.get(settings.DATABASE_PRIMARY_PIN_COOKIE)
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_safe_request_reads_from_replica(replica, settings):
+    """
+    An anonymous list page queries the replica only and is not pinned.
+    """
+    with CaptureQueriesContext(
+        connections["default"]
+    ) as primary, CaptureQueriesContext(connections["replica"]) as replicas:
+        response = Client().get(reverse("blog:post-list"))
+
+    assert response.status_code == 200
+    assert len(replicas) > 0
+    assert len(primary) == 0
+    assert pin_cookie(settings, response) is None
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_pinned_browser_reads_from_primary(replica, settings):
+    """
+    With the pin cookie, safe requests read from the primary.
+    """
+    client = Client()
+    client.cookies[settings.DATABASE_PRIMARY_PIN_COOKIE] = "1"
+
+    with CaptureQueriesContext(connections["replica"]) as replicas:
+        response = client.get(reverse("blog:post-list"))
+
+    assert response.status_code == 200
+    assert len(replicas) == 0
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+@pytest.mark.parametrize("method", ["get", "post"])
+def test_writing_request_pins_browser(replica, settings, method):
+    """
+    A request that writes, or any unsafe one, sets the pin cookie, and
+    reads after a write go to the primary.
+    """
+    router = PrimaryReplicaRouter()
+    routed = []
+
+    def view(request):
+        if request.method == "GET":
+            Category.objects.create(name="New")
+        routed.append(router.db_for_read(Post))
+        return HttpResponse()
+
+    request = getattr(RequestFactory(), method)("/")
+    response = PrimaryPinMiddleware(view)(request)
+
+    assert routed == ["default"]
+    cookie = pin_cookie(settings, response)
+    assert cookie is not None
+    assert cookie["max-age"] == settings.DATABASE_PRIMARY_PIN_SECONDS
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_primary_outside_requests_and_transactions(replica):
+    """
+    Tasks and commands, and reads inside transaction.atomic, use the
+    primary.
+    """
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Post) == "default"
+
+    state = begin_request(replica_reads=True)
+    try:
+        assert router.db_for_read(Post) == "replica"
+        with transaction.atomic():
+            assert router.db_for_read(Post) == "default"
+    finally:
+        assert end_request(state) is False
+
+    assert router.db_for_read(Post) == "default"
+    assert router.db_for_write(Post) == "default"
+    assert router.allow_migrate("replica", "blog") is False
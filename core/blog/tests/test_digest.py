@@ -0,0 +1,102 @@
+"""
+Test suite for the weekly digest fan-out.
+"""
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+
+from accounts.models import User
+from blog.digest import send_digest
+from blog.models import DigestRun
+
+
+class DroppingBackend(EmailBackend):
+    """
+    Locmem backend whose connection drops after `limit` messages.
+    """
+
+    def __init__(self, limit, **kwargs):
+        super().__init__(**kwargs)
+        self.limit = limit
+
+    def send_messages(self, messages):
+        if len(mail.outbox) + len(messages) > self.limit:
+            raise ConnectionError("connection dropped")
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db
+def test_send_digest_personalizes_header_only(test_user, test_post):
+    """
+    Every verified user gets the shared post block with their own header.
+    """
+    user, profile = test_user
+    user.is_verified = True
+    user.save()
+    profile.first_name = "Mehdi"
+    profile.save()
+    User.objects.create_user(email="unverified@blog.com", password="x")
+
+    assert send_digest(rate_limit=0) == 1
+    assert len(mail.outbox) == 1
+    message = mail.outbox[0]
+    assert message.to == [user.email]
+    assert "Hi Mehdi" in message.body
+    assert test_post.title in message.body
+    assert "1 new post" in message.subject
+
+    run = DigestRun.objects.get()
+    assert run.is_completed
+    assert run.last_user_id == user.id
+
+
+@pytest.mark.django_db
+def test_send_digest_resumes_after_last_user(test_user, test_post):
+    """
+    An unfinished run skips users that were already reached.
+    """
+    user, _ = test_user
+    user.is_verified = True
+    user.save()
+    second = User.objects.create_user(email="second@blog.com", password="x")
+    second.is_verified = True
+    second.save()
+
+    run = DigestRun.objects.create(
+        period_start=test_post.published_date.replace(year=2000),
+        period_end=test_post.published_date,
+        last_user_id=user.id,
+        sent_count=1,
+    )
+
+    assert send_digest(rate_limit=0) == 1
+    assert [m.to for m in mail.outbox] == [[second.email]]
+    run.refresh_from_db()
+    assert run.sent_count == 2
+    assert run.is_completed
+
+
+@pytest.mark.django_db
+def test_send_digest_records_progress_within_a_chunk(test_post):
+    """
+    When the connection drops mid-chunk, the messages already delivered
+    are recorded and not sent again on resume.
+    """
+    users = [
+        User.objects.create_user(
+            email=f"reader{i}@blog.com", password="x", is_verified=True
+        )
+        for i in range(3)
+    ]
+
+    with pytest.raises(ConnectionError):
+        send_digest(
+            chunk_size=10, rate_limit=0, connection=DroppingBackend(limit=2)
+        )
+    run = DigestRun.objects.get()
+    assert run.last_user_id == users[1].id
+    assert run.sent_count == 2
+
+    assert send_digest(rate_limit=0) == 1
+    assert [m.to for m in mail.outbox] == [[user.email] for user in users]
@@ -0,0 +1,58 @@
+"""
+Test suite for the incremental prepare_app command.
+"""
+
+import io
+import pytest
+from django.core.management import call_command
+from django_celery_beat.models import PeriodicTask
+
+from accounts.scheduler import PERIODIC_TASKS
+
+
+def prepare(*args):
+    out = io.StringIO()
+    call_command("prepare_app", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def static_dirs(settings, tmp_path):
+    """
+    Collects one source directory into a temporary STATIC_ROOT.
+    """
+    source = tmp_path / "static"
+    source.mkdir()
+    (source / "site.css").write_text("body { color: red; }")
+    settings.STATICFILES_DIRS = [source]
+    settings.STATICFILES_FINDERS = [
+        "django.contrib.staticfiles.finders.FileSystemFinder"
+    ]
+    settings.STATIC_ROOT = tmp_path / "collected"
+    return source
+
+
+@pytest.mark.django_db
+def test_second_run_skips_unchanged_steps(static_dirs, settings):
+    """
+    Steps run once, are skipped while their inputs are unchanged and
+    run again after a static source changes.
+    """
+    output = prepare()
+    assert "migrate: unchanged, skipped" in output
+    assert "collectstatic: done" in output
+    assert "periodic_tasks: done" in output
+    assert PeriodicTask.objects.filter(
+        name__in=[spec["name"] for spec in PERIODIC_TASKS]
+    ).count() == len(PERIODIC_TASKS)
+    assert (settings.STATIC_ROOT / "site.css").exists()
+
+    output = prepare()
+    assert "collectstatic: unchanged, skipped" in output
+    assert "periodic_tasks: unchanged, skipped" in output
+
+    (static_dirs / "app.js").write_text("console.log(1);")
+    output = prepare("--steps", "collectstatic")
+    assert "collectstatic: done" in output
+    assert "periodic_tasks" not in output
+    assert (settings.STATIC_ROOT / "app.js").exists()
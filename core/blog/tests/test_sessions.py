@@ -0,0 +1,54 @@
+"""
+Test suite for session-free anonymous list pages.
+"""
+
+import pytest
+from django.core.cache import caches
+from django.test import Client
+from django.urls import reverse
+
+from accounts.middleware import REQUEST_USER_BACKEND
+
+
+@pytest.fixture
+def locmem_caches(settings):
+    """
+    Uses in-process caches instead of Redis, sessions included.
+    """
+    settings.CACHES = {
+        alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        for alias in ("default", "sessions")
+    }
+    yield
+    for alias in ("default", "sessions"):
+        caches[alias].clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name", ["blog:post-list", "blog:api-v1:post-list"]
+)
+def test_anonymous_list_is_session_free(locmem_caches, url_name):
+    """
+    Anonymous list GETs neither create a session nor vary on Cookie.
+    """
+    response = Client().get(reverse(url_name))
+
+    assert response.status_code == 200
+    assert "Cookie" not in response.get("Vary", "")
+    assert "sessionid" not in response.cookies
+
+
+@pytest.mark.django_db
+def test_session_user_is_loaded(locmem_caches, test_user):
+    """
+    Logged-in users are still served from their Redis session.
+    """
+    user, _ = test_user
+    client = Client()
+    client.force_login(user, backend=REQUEST_USER_BACKEND)
+
+    response = client.get(reverse("blog:post-list"))
+
+    assert response.context["user"].pk == user.pk
+    assert "Cookie" in response.get("Vary", "")
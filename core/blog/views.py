@@ -12,7 +12,6 @@ from django.urls import reverse
 from django.views import View
 from django.contrib import messages
 from django.shortcuts import get_object_or_404, redirect
-from accounts.models import Profile
 from django.core.cache import cache
 from django.db.models import Q
 from .tasks import create_comment_task
@@ -232,7 +231,7 @@ class PostCreateView(
             )
             form.instance.category = category_obj
 
-        form.instance.author = Profile.objects.get(user=self.request.user)
+        form.instance.author = self.request.user.profile
         messages.success(
             self.request, "Your post has been created successfully."
         )
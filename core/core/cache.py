@@ -0,0 +1,179 @@
+import math
+import pickle
+import re
+import zlib
+from django.core.exceptions import ImproperlyConfigured
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+from django_redis.serializers.base import BaseSerializer
+
+# Optional codecs, checked when a cache alias selects them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# First byte of every stored value. Serializer tags are lowercase and
+# compressor tags uppercase; values written by django-redis'
+# PickleSerializer start with b"\x80", so they are still read.
+ORJSON, MSGPACK, PICKLE = b"j", b"m", b"p"
+ZLIB, LZ4 = b"Z", b"L"
+
+PLAIN_TYPES = (str, int, bool, type(None))
+# Upper bounds of the payload size histogram, in bytes
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536)
+DJANGO_KEY_PREFIX = re.compile(r"^[^:]*:\d+:")
+
+
+def is_plain(value):
+    """
+    Whether `value` round-trips exactly through JSON or msgpack: None,
+    bools, ints, finite floats and strings in lists and str-keyed dicts.
+    Subclasses (SafeString, enums) and tuples are not plain.
+    """
+    kind = type(value)
+    if kind in PLAIN_TYPES:
+        return True
+    if kind is float:
+        return math.isfinite(value)
+    if kind is list:
+        return all(is_plain(item) for item in value)
+    if kind is dict:
+        return all(
+            type(key) is str and is_plain(item) for key, item in value.items()
+        )
+    return False
+
+
+def require(module, name, option):
+    if module is None:
+        raise ImproperlyConfigured(
+            f"The cache option {option} needs the {name} package."
+        )
+
+
+class CompactSerializer(BaseSerializer):
+    """
+    Serialize plain data with orjson or msgpack (OPTIONS
+    "SERIALIZER_FORMAT", default "orjson") and anything else, model
+    instances and querysets included, with pickle.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.format = options.get("SERIALIZER_FORMAT", "orjson")
+        if self.format not in ("orjson", "msgpack"):
+            raise ImproperlyConfigured(
+                f"Unknown SERIALIZER_FORMAT: {self.format}"
+            )
+        codecs = {"orjson": orjson, "msgpack": msgpack}
+        require(codecs[self.format], self.format, "SERIALIZER_FORMAT")
+
+    def dumps(self, value):
+        if is_plain(value):
+            try:
+                if self.format == "orjson":
+                    return ORJSON + orjson.dumps(value)
+                return MSGPACK + msgpack.dumps(value)
+            except (TypeError, OverflowError):
+                pass  # Integers wider than 64 bits
+        return PICKLE + pickle.dumps(value, pickle.DEFAULT_PROTOCOL)
+
+    def loads(self, value):
+        tag, payload = value[:1], memoryview(value)[1:]
+        if tag == ORJSON:
+            return orjson.loads(payload)
+        if tag == MSGPACK:
+            return msgpack.loads(payload, raw=False)
+        if tag == PICKLE:
+            return pickle.loads(payload)
+        return pickle.loads(value)
+
+
+class ThresholdCompressor(BaseCompressor):
+    """
+    Compress values of at least COMPRESS_MIN_SIZE bytes (default 1024)
+    with zlib or lz4 (OPTIONS "COMPRESS_ALGORITHM", default "zlib"), when
+    that makes them smaller. Smaller values are stored as they are:
+    compressing them costs CPU on every read for little memory.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.algorithm = options.get("COMPRESS_ALGORITHM", "zlib")
+        if self.algorithm not in ("zlib", "lz4"):
+            raise ImproperlyConfigured(
+                f"Unknown COMPRESS_ALGORITHM: {self.algorithm}"
+            )
+        if self.algorithm == "lz4":
+            require(lz4_frame, "lz4", "COMPRESS_ALGORITHM")
+        self.min_size = options.get("COMPRESS_MIN_SIZE", 1024)
+        self.level = options.get(
+            "COMPRESS_LEVEL", 6 if self.algorithm == "zlib" else 0
+        )
+
+    def compress(self, value):
+        if len(value) < self.min_size:
+            return value
+        if self.algorithm == "zlib":
+            compressed = ZLIB + zlib.compress(value, self.level)
+        else:
+            compressed = LZ4 + lz4_frame.compress(
+                value, compression_level=self.level
+            )
+        return compressed if len(compressed) < len(value) else value
+
+    def decompress(self, value):
+        tag = value[:1]
+        try:
+            if tag == ZLIB:
+                return zlib.decompress(memoryview(value)[1:])
+            if tag == LZ4:
+                return lz4_frame.decompress(memoryview(value)[1:])
+        except Exception as e:
+            raise CompressorError from e
+        # Stored uncompressed; the client then reads it as it is
+        raise CompressorError("Value is not compressed")
+
+
+def key_family(key):
+    """
+    Group a cache key with its siblings: the key without Django's
+    "prefix:version:", with numbers replaced by "#"
+    (":1:post_list_page_2" -> "post_list_page_#").
+    """
+    if isinstance(key, bytes):
+        key = key.decode(errors="replace")
+    return re.sub(r"\d+", "#", DJANGO_KEY_PREFIX.sub("", key, count=1))
+
+
+def size_histogram(sizes):
+    """
+    Count `sizes` per SIZE_BUCKETS bucket; returns [(label, count)].
+    """
+    counts = [0] * (len(SIZE_BUCKETS) + 1)
+    for size in sizes:
+        index = next(
+            (i for i, bound in enumerate(SIZE_BUCKETS) if size <= bound),
+            len(SIZE_BUCKETS),
+        )
+        counts[index] += 1
+    labels = [f"<= {format_size(bound)}" for bound in SIZE_BUCKETS]
+    labels.append(f"> {format_size(SIZE_BUCKETS[-1])}")
+    return list(zip(labels, counts))
+
+
+def format_size(size):
+    for unit in ("B", "KiB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}MiB"
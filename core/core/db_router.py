@@ -0,0 +1,132 @@
+import contextvars
+import random
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set by PrimaryPinMiddleware for each request; None outside requests
+_request_state = contextvars.ContextVar("db_request_state", default=None)
+
+
+def begin_request(replica_reads):
+    """
+    Start tracking the current request; reads may go to a replica when
+    `replica_reads` is true. Returns the request state for `end_request`.
+    """
+    state = {"replica_reads": replica_reads, "wrote": False}
+    _request_state.set(state)
+    return state
+
+
+def end_request(state):
+    """
+    Stop tracking the current request; returns whether it wrote to the
+    primary.
+    """
+    # Not a token reset: under ASGI the middleware hooks run in
+    # different contexts
+    _request_state.set(None)
+    return state["wrote"]
+
+
+def migration_databases():
+    """
+    Aliases that get migrations: the primary and the hot-write database.
+    """
+    if settings.HOT_WRITE_DATABASE:
+        return [DEFAULT_DB_ALIAS, settings.HOT_WRITE_DATABASE]
+    return [DEFAULT_DB_ALIAS]
+
+
+class HotWriteRouter:
+    """
+    Keep the tables written on every login attempt or beat tick (the
+    HOT_WRITE_MODELS: ThrottleRecord, sessions, django_celery_beat) in
+    HOT_WRITE_DATABASE, so their writes do not compete with content
+    queries for WAL and locks. Without HOT_WRITE_DATABASE it routes
+    nothing.
+
+    Must come before PrimaryReplicaRouter: hot-write models are neither
+    read from replicas nor pin the user to the primary.
+    """
+
+    def is_hot(self, app_label, model_name=None):
+        hot_models = settings.HOT_WRITE_MODELS
+        return app_label in hot_models or (
+            model_name is not None
+            and f"{app_label}.{model_name}" in hot_models
+        )
+
+    def route(self, model):
+        database = settings.HOT_WRITE_DATABASE
+        if database and self.is_hot(
+            model._meta.app_label, model._meta.model_name
+        ):
+            return database
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self.route(model)
+
+    def db_for_write(self, model, **hints):
+        return self.route(model)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        database = settings.HOT_WRITE_DATABASE
+        if database and database in (obj1._state.db, obj2._state.db):
+            return obj1._state.db == obj2._state.db
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        database = settings.HOT_WRITE_DATABASE
+        if not database:
+            return None
+        if self.is_hot(app_label, model_name):
+            return db == database
+        if db == database:
+            return False
+        return None
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to a random alias of DATABASE_REPLICAS and everything else
+    to the primary ("default").
+
+    Reads only go to a replica inside a request that allowed it (a safe
+    method without the primary pin cookie, see PrimaryPinMiddleware) and
+    outside `transaction.atomic`. Management commands, Celery tasks and
+    shells read from the primary, so they never miss a row that was just
+    committed.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or state is None
+            or not state["replica_reads"]
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state["wrote"] = True
+            # Later reads of this request must see the write
+            state["replica_reads"] = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from .db_router import begin_request, end_request
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class PrimaryPinMiddleware(MiddlewareMixin):
+    """
+    Read-your-writes for PrimaryReplicaRouter.
+
+    Safe requests may read from replicas. A request that writes to the
+    primary, or any unsafe request (a comment is saved by a Celery task,
+    not by its request), sets the DATABASE_PRIMARY_PIN_COOKIE cookie. For
+    DATABASE_PRIMARY_PIN_SECONDS that browser then reads from the primary
+    only, so a user sees their own post edit or comment despite
+    replication lag. The cookie also makes nginx skip its page cache.
+    """
+
+    def process_request(self, request):
+        replica_reads = (
+            request.method in SAFE_METHODS
+            and settings.DATABASE_PRIMARY_PIN_COOKIE not in request.COOKIES
+        )
+        request._db_request_state = begin_request(replica_reads)
+
+    def process_response(self, request, response):
+        state = getattr(request, "_db_request_state", None)
+        if state is None:
+            return response
+        wrote = end_request(state)
+        if wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                settings.DATABASE_PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_PRIMARY_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
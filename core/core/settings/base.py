@@ -42,15 +42,17 @@ INSTALLED_APPS = [
     "ckeditor_uploader",
     "accounts",
     "blog",
+    "uploads",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.PrimaryPinMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "accounts.middleware.RequestUserMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -77,6 +79,36 @@ TEMPLATES = [
 WSGI_APPLICATION = "core.wsgi.application"
 
 
+# Database routing (core.db_router)
+# - Safe requests read from a random alias of DATABASE_REPLICAS
+# - Writes, transactions, commands and tasks use the primary ("default")
+# - A browser that wrote is pinned to the primary for
+#   DATABASE_PRIMARY_PIN_SECONDS through a cookie (read-your-writes);
+#   keep it above the replication lag
+DATABASE_ROUTERS = [
+    "core.db_router.HotWriteRouter",
+    "core.db_router.PrimaryReplicaRouter",
+]
+DATABASE_REPLICAS = []
+DATABASE_PRIMARY_PIN_COOKIE = "db_primary_pin"
+DATABASE_PRIMARY_PIN_SECONDS = config(
+    "DB_PRIMARY_PIN_SECONDS", cast=int, default=15
+)
+
+# Optional database alias for tables written on every login attempt or
+# beat tick. prepare_app migrates it too. If it is down:
+# - throttles fail open (logged), so logins keep working unthrottled
+# - celery beat cannot load or save its schedule until it is back
+# - database-backed sessions fail (SESSION_ENGINE uses Redis by default)
+# Content pages and the API are not affected.
+HOT_WRITE_DATABASE = None
+HOT_WRITE_MODELS = [
+    "accounts.throttlerecord",
+    "sessions",
+    "django_celery_beat",
+]
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -105,14 +137,56 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"  # Used in production (collectstatic)
 STATICFILES_DIRS = [BASE_DIR / "static"]  # Used in development
+# Precompressed siblings written by core.storage in production
+STATIC_COMPRESS_EXTENSIONS = {".css", ".js", ".svg", ".json", ".map", ".txt"}
+STATIC_COMPRESS_MIN_SIZE = 256
 
 # Media files (User-uploaded content)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Internal nginx location that serves MEDIA_ROOT; media requests are
+# authorized by uploads.views.serve_media, then handed to nginx with
+# X-Accel-Redirect. Empty streams the file from Django (development).
+MEDIA_ACCEL_REDIRECT_PREFIX = config("MEDIA_ACCEL_REDIRECT_PREFIX", default="")
+# Browser cache lifetime of public media that is not content-addressed
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+# Image renditions (uploads.renditions), rendered by Celery on upload
+IMAGE_RENDITION_DIR = "renditions/"
+IMAGE_RENDITION_WIDTHS = [320, 640, 1280]
+IMAGE_RENDITION_FORMATS = ["webp", "jpeg"]
+IMAGE_RENDITION_QUALITY = config(
+    "IMAGE_RENDITION_QUALITY", cast=int, default=80
+)
+# Width of the blurred inline placeholder
+IMAGE_PLACEHOLDER_WIDTH = 16
+
+# Orphaned media collection (uploads.gc): unreferenced files older than
+# the grace period are moved to MEDIA_ROOT/<MEDIA_QUARANTINE_DIR>/<date>/
+MEDIA_GC_GRACE_HOURS = config("MEDIA_GC_GRACE_HOURS", cast=int, default=24)
+MEDIA_QUARANTINE_DIR = ".quarantine"
 
 # CKEditor configuration
 CKEDITOR_UPLOAD_PATH = "uploads/"
-CKEDITOR_IMAGE_BACKEND = "pillow"
+# Deduplicate uploads by content digest (see uploads.storage)
+CKEDITOR_STORAGE_BACKEND = "uploads.storage.ContentAddressedStorage"
+# Thumbnails come from the rendition pipeline (uploads.renditions)
+CKEDITOR_IMAGE_BACKEND = "ckeditor_uploader.backends.DummyBackend"
+# Images per page of the catalog-backed browser (uploads.views.browse)
+UPLOAD_BROWSE_PAGE_SIZE = 60
+
+# Direct-to-bucket uploads (uploads.direct): clients upload to an
+# S3-compatible bucket (AWS S3, MinIO) with presigned URLs, then call the
+# finalize endpoint and Celery moves the object into media storage
+UPLOAD_S3_ENABLED = config("UPLOAD_S3_ENABLED", cast=bool, default=False)
+UPLOAD_S3_BUCKET = config("UPLOAD_S3_BUCKET", default="")
+UPLOAD_S3_ENDPOINT_URL = config("UPLOAD_S3_ENDPOINT_URL", default="")
+UPLOAD_S3_REGION = config("UPLOAD_S3_REGION", default="us-east-1")
+UPLOAD_S3_ACCESS_KEY_ID = config("UPLOAD_S3_ACCESS_KEY_ID", default="")
+UPLOAD_S3_SECRET_ACCESS_KEY = config("UPLOAD_S3_SECRET_ACCESS_KEY", default="")
+UPLOAD_S3_INCOMING_PREFIX = "incoming/"
+UPLOAD_S3_PRESIGN_EXPIRES = 10 * 60
+UPLOAD_MAX_SIZE = config("UPLOAD_MAX_SIZE", cast=int, default=10 * 1024 * 1024)
 CKEDITOR_CONFIGS = {
     "default": {
         "toolbar": "full",
@@ -127,6 +201,12 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Custom user model
 AUTH_USER_MODEL = "accounts.User"
 
+# Permission claims of JWT users are answered before ModelBackend
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.ClaimsPermissionBackend",
+    "accounts.backends.RequestUserBackend",
+]
+
 # Email configuration
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = config("EMAIL_HOST", default="smtp4dev")
@@ -135,14 +215,40 @@ EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", cast=bool, default=False)
 
+# Email outbox dispatcher (accounts.mailer)
+EMAIL_OUTBOX_BATCH_SIZE = config(
+    "EMAIL_OUTBOX_BATCH_SIZE", cast=int, default=50
+)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config(
+    "EMAIL_OUTBOX_MAX_ATTEMPTS", cast=int, default=5
+)
+# Base retry delay in seconds, doubled after every failed attempt
+EMAIL_OUTBOX_RETRY_DELAY = config(
+    "EMAIL_OUTBOX_RETRY_DELAY", cast=int, default=60
+)
+# Seconds a dispatcher owns the batch it claimed; must cover sending it
+EMAIL_OUTBOX_CLAIM_TIMEOUT = config(
+    "EMAIL_OUTBOX_CLAIM_TIMEOUT", cast=int, default=300
+)
+# Days sent emails are kept before the daily purge deletes them
+EMAIL_OUTBOX_RETENTION_DAYS = config(
+    "EMAIL_OUTBOX_RETENTION_DAYS", cast=int, default=30
+)
+
+# Weekly digest of new posts (blog.digest)
+DIGEST_CHUNK_SIZE = config("DIGEST_CHUNK_SIZE", cast=int, default=500)
+# Maximum messages per second, 0 disables rate control
+DIGEST_RATE_LIMIT = config("DIGEST_RATE_LIMIT", cast=int, default=20)
+DIGEST_MAX_POSTS = config("DIGEST_MAX_POSTS", cast=int, default=10)
+
 
 # DRF (Django REST Framework) settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.BasicAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedTokenAuthentication",
+        "accounts.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -158,14 +264,47 @@ REST_FRAMEWORK = {
     "NUM_PROXIES": 1,
 }
 
+# Cached token lookups for accounts.authentication.CachedTokenAuthentication
+AUTH_TOKEN_CACHE_ALIAS = "default"
+AUTH_TOKEN_CACHE_TIMEOUT = config(
+    "AUTH_TOKEN_CACHE_TIMEOUT", cast=int, default=60
+)
+
+# Request user (user + profile + permissions) cache, see
+# accounts.request_user; entries are dropped on User/Profile saves and
+# permission changes
+REQUEST_USER_CACHE_ALIAS = "default"
+REQUEST_USER_CACHE_TIMEOUT = config(
+    "REQUEST_USER_CACHE_TIMEOUT", cast=int, default=300
+)
+
 
 # JWT settings
 SIMPLE_JWT = {
     "TOKEN_OBTAIN_SERIALIZER": "accounts.api.v1.serializers.CustomTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.api.v1.serializers.CustomTokenRefreshSerializer",
     "ALGORITHM": config("ALGORITHM", default="HS256"),
     "SIGNING_KEY": config("SIGNING_KEY", default=SECRET_KEY),
 }
 
+# JWT revocation list (accounts.revocation)
+JWT_REVOCATION_ENABLED = config(
+    "JWT_REVOCATION_ENABLED", cast=bool, default=True
+)
+JWT_REVOCATION_REDIS_ALIAS = "default"
+# Seconds between incremental Bloom filter syncs from Redis
+JWT_REVOCATION_SYNC_INTERVAL = config(
+    "JWT_REVOCATION_SYNC_INTERVAL", cast=int, default=5
+)
+# Seconds between full rebuilds, which drop expired revocations
+JWT_REVOCATION_REBUILD_INTERVAL = config(
+    "JWT_REVOCATION_REBUILD_INTERVAL", cast=int, default=3600
+)
+JWT_REVOCATION_BLOOM_CAPACITY = config(
+    "JWT_REVOCATION_BLOOM_CAPACITY", cast=int, default=100000
+)
+JWT_REVOCATION_BLOOM_ERROR_RATE = 0.001
+
 
 # Celery configuration
 CELERY_BROKER_URL = config(
@@ -181,16 +320,65 @@ CELERY_BEAT_SCHEDULER = config(
 
 
 # Caching configuration (Redis)
+# Values are serialized by core.cache.CompactSerializer (orjson or
+# msgpack for plain data, pickle otherwise) and compressed with zlib or
+# lz4 from COMPRESS_MIN_SIZE bytes; `manage.py diagnostics` shows the
+# payload sizes per key family
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": "redis://redis:6379/2",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "SERIALIZER": "core.cache.CompactSerializer",
+            "SERIALIZER_FORMAT": "orjson",
+            "COMPRESSOR": "core.cache.ThresholdCompressor",
+            "COMPRESS_ALGORITHM": config(
+                "CACHE_COMPRESS_ALGORITHM", default="zlib"
+            ),
+            "COMPRESS_MIN_SIZE": 1024,
         },
-    }
+    },
+    # Sessions are small plain dicts, read on every logged-in request:
+    # compact, rarely worth compressing
+    "sessions": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://redis:6379/3",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "SERIALIZER": "core.cache.CompactSerializer",
+            "SERIALIZER_FORMAT": "orjson",
+            "COMPRESSOR": "core.cache.ThresholdCompressor",
+            "COMPRESS_MIN_SIZE": 4096,
+        },
+    },
 }
 
+# Async read API (blog.api.v1.async_views), served by uvicorn workers
+# from core.asgi. Page bodies are cached through redis.asyncio; an empty
+# URL disables the cache.
+ASYNC_CACHE_URL = config("ASYNC_CACHE_URL", default="redis://redis:6379/2")
+ASYNC_CACHE_TIMEOUT = 60
+
+# Sessions live in Redis and are only loaded when read; cookieless
+# (anonymous) requests never touch them, see accounts.sessions
+SESSION_ENGINE = "accounts.sessions"
+SESSION_CACHE_ALIAS = "sessions"
+# Keep flash messages out of the session
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+
+# Adaptive throttle storage
+# - DatabaseThrottleStorage keeps state in the ThrottleRecord table
+# - RedisThrottleStorage uses one atomic Lua script per call with native TTLs
+THROTTLE_STORAGE_BACKEND = config(
+    "THROTTLE_STORAGE_BACKEND",
+    default="accounts.throttle_storages.DatabaseThrottleStorage",
+)
+THROTTLE_REDIS_ALIAS = config("THROTTLE_REDIS_ALIAS", default="default")
+# Write Redis escalations to ThrottleRecord for auditing in the admin
+THROTTLE_DB_AUDIT = config("THROTTLE_DB_AUDIT", cast=bool, default=True)
+
 
 # Authentication URLs
 LOGIN_URL = "/accounts/login/"
@@ -13,8 +13,30 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+    },
+    # Same file through a second connection, to try the replica routing
+    # with DB_USE_REPLICA=True; tests mirror it to the default database
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    },
+    # Throttle, session and beat tables, with DB_USE_HOT_WRITES=True
+    # (then also `migrate --database hot_writes`)
+    "hot_writes": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "hot_writes.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    },
 }
+DATABASE_REPLICAS = (
+    ["replica"] if config("DB_USE_REPLICA", cast=bool, default=False) else []
+)
+HOT_WRITE_DATABASE = (
+    "hot_writes"
+    if config("DB_USE_HOT_WRITES", cast=bool, default=False)
+    else None
+)
 
 CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5500",
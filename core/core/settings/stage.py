@@ -21,7 +21,55 @@ DATABASES = {
         "PASSWORD": config("DB_PASSWORD", default="POSTGRES_PASSWORD"),
         "HOST": config("DB_HOST", default="postgres"),
         "PORT": config("DB_PORT", default="5432"),
+        # Persistent connections: each worker thread keeps its own and
+        # checks it after idle time, so a worker holds up to
+        # GUNICORN_THREADS connections (see gunicorn.conf.py)
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", cast=int, default=300),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "connect_timeout": 5,
+            # psycopg 3: bind parameters on the server and prepare a query
+            # once it ran DB_PREPARE_THRESHOLD times on a connection
+            "server_side_binding": True,
+            "prepare_threshold": config(
+                "DB_PREPARE_THRESHOLD", cast=int, default=5
+            ),
+        },
+    }
+}
+
+# Streaming replicas, one alias per host of DB_REPLICA_HOSTS, with the
+# primary's settings (see core.db_router)
+for index, host in enumerate(
+    config(
+        "DB_REPLICA_HOSTS",
+        cast=lambda v: [s.strip() for s in v.split(",") if s.strip()],
+        default="",
+    ),
+    start=1,
+):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
     }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# Throttle, session and beat tables on their own server (core.db_router)
+if config("DB_HOT_WRITES_HOST", default=""):
+    DATABASES["hot_writes"] = {
+        **DATABASES["default"],
+        "NAME": config("DB_HOT_WRITES_NAME", default="hot_writes"),
+        "HOST": config("DB_HOT_WRITES_HOST"),
+    }
+    HOT_WRITE_DATABASE = "hot_writes"
+
+# Hashed static files with precompressed .gz/.br siblings (core.storage)
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "core.storage.CompressedManifestStaticFilesStorage"
+    },
 }
 
 CORS_ALLOWED_ORIGINS = [
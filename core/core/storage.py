@@ -0,0 +1,77 @@
+import gzip
+import os
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # .br siblings are skipped without the package
+    brotli = None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes `.gz` and `.br` siblings of the
+    hashed files for nginx's gzip_static/brotli_static.
+
+    Hashed names change with the content, so an existing sibling is
+    always current and only new or changed files are compressed.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            compressed = self.compress(hashed_name)
+            if compressed:
+                yield hashed_name, hashed_name, True
+
+    def is_compressible(self, name):
+        return (
+            os.path.splitext(name)[1].lower()
+            in settings.STATIC_COMPRESS_EXTENSIONS
+        )
+
+    def compress(self, name):
+        """
+        Write the missing compressed siblings of `name`.
+        Returns whether any were written.
+        """
+        if not self.is_compressible(name):
+            return False
+        path = self.path(name)
+        if os.path.getsize(path) < settings.STATIC_COMPRESS_MIN_SIZE:
+            return False
+
+        encoders = [(".gz", self.gzip)]
+        if brotli is not None:
+            encoders.append((".br", brotli.compress))
+        missing = [
+            (suffix, encode)
+            for suffix, encode in encoders
+            if not os.path.exists(path + suffix)
+        ]
+        if not missing:
+            return False
+
+        with open(path, "rb") as file:
+            content = file.read()
+        for suffix, encode in missing:
+            compressed = encode(content)
+            if len(compressed) < len(content):
+                with open(path + suffix, "wb") as file:
+                    file.write(compressed)
+        return True
+
+    @staticmethod
+    def gzip(content):
+        # mtime=0 keeps the output identical across runs
+        return gzip.compress(content, compresslevel=9, mtime=0)
@@ -28,7 +28,7 @@ from django.contrib.sitemaps.views import sitemap
 from django.views.decorators.cache import cache_page
 
 from blog.sitemaps import PostSitemap
-
+from uploads.views import serve_media
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -72,7 +72,11 @@ urlpatterns = [
         schema_view.with_ui("redoc", cache_timeout=0),
         name="schema-redoc",
     ),
-    path("ckeditor/", include("ckeditor_uploader.urls")),
+    path("ckeditor/", include("uploads.urls")),
+    path(
+        "uploads/api/v1/",
+        include("uploads.api.v1.urls", namespace="uploads"),
+    ),
     path(
         "sitemap.xml",
         cache_page(86400)(sitemap),
@@ -87,11 +91,17 @@ handler403 = "core.views.errors.error_403"  # permission denied
 handler404 = "core.views.errors.error_404"  # page not found
 handler500 = "core.views.errors.error_500"  # server error
 
-# Serving static and media for development
+# Serving static for development
 if settings.DEBUG:
     urlpatterns += static(
         settings.STATIC_URL, document_root=settings.STATIC_ROOT
     )
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )
+
+# Media is authorized by Django and sent by nginx (X-Accel-Redirect)
+urlpatterns += [
+    path(
+        f"{settings.MEDIA_URL.lstrip('/')}<path:path>",
+        serve_media,
+        name="media",
+    ),
+]
@@ -0,0 +1,92 @@
+import logging
+import os
+import time
+import django
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def warm_url_resolvers():
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    # Building the reverse dict populates every included resolver
+    resolver.reverse_dict
+    resolver.resolve("/blog/")
+
+
+def warm_templates():
+    """
+    Compile every project template; with the cached loader they stay
+    in memory for the worker's lifetime.
+    """
+    from django.template.loader import get_template
+
+    for directory in settings.TEMPLATES[0]["DIRS"]:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(".html"):
+                    path = os.path.join(root, name)
+                    get_template(os.path.relpath(path, directory))
+
+
+def warm_api_schema():
+    from drf_yasg import openapi
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    info = openapi.Info(title="Blog API", default_version="v1")
+    OpenAPISchemaGenerator(info).get_schema(request=None, public=True)
+
+
+def warm_database():
+    """
+    Connect to every database, which also imports the backends. The
+    connections belong to the calling thread; see `warm_up`.
+    """
+    from django.db import connections
+
+    for alias in settings.DATABASES:
+        connections[alias].ensure_connection()
+
+
+def warm_caches():
+    from django.core.cache import caches
+
+    for alias in settings.CACHES:
+        caches[alias].get("warmup")
+
+
+WARMUP_STEPS = [
+    ("urls", warm_url_resolvers),
+    ("templates", warm_templates),
+    ("schema", warm_api_schema),
+    ("database", warm_database),
+    ("caches", warm_caches),
+]
+
+
+def warm_up(keep_connections=False):
+    """
+    Pay the first-request costs of a fresh worker up front. Failing
+    steps are logged and skipped. Returns {step: milliseconds}.
+
+    The database connections opened here are closed again unless
+    `keep_connections` is set: only a worker serving requests from this
+    same thread (gunicorn's sync profile) would reuse them, any other
+    worker would hold them idle for its lifetime.
+    """
+    from django.db import connections
+
+    django.setup()
+    timings = {}
+    for name, step in WARMUP_STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.warning("Warm-up step %s failed", name, exc_info=True)
+        timings[name] = (time.perf_counter() - started) * 1000
+    if not keep_connections:
+        connections.close_all()
+    return timings
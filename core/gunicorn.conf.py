@@ -0,0 +1,108 @@
+# ==============================
+# gunicorn.conf.py
+# Gunicorn settings, loaded from the working directory (/app)
+# ==============================
+#
+# GUNICORN_PROFILE picks the worker model:
+# - "sync":    one request per process (gunicorn's default)
+# - "gthread": a few threads per process; the default, suits our views
+#              that mostly wait on Postgres, Redis and SMTP
+# - "gevent":  greenlets for many slow clients; needs gevent, and
+#              patches the stdlib before the app loads (psycopg 3
+#              waits cooperatively once patched)
+# - "uvicorn": asyncio workers for the ASGI app (core.asgi:application),
+#              which serves the async read endpoints
+#
+# The app is preloaded in the master so workers share its memory
+# (copy-on-write), and each worker is warmed up after the fork
+# (see core.warmup). Module-level names are read as gunicorn settings,
+# hence `decouple.config` rather than a `config` name.
+
+import os
+import decouple
+
+profile = decouple.config("GUNICORN_PROFILE", default="gthread")
+if profile not in ("sync", "gthread", "gevent", "uvicorn"):
+    raise ValueError(f"Unknown GUNICORN_PROFILE: {profile}")
+
+if profile == "gevent":
+    # Must run before Django, psycopg or redis are imported
+    from gevent import monkey
+
+    monkey.patch_all()
+
+# CPUs available to this container, not to the host
+try:
+    cpu_count = len(os.sched_getaffinity(0))
+except AttributeError:
+    cpu_count = os.cpu_count() or 1
+
+bind = decouple.config("GUNICORN_BIND", default="0.0.0.0:8000")
+worker_class = (
+    "uvicorn.workers.UvicornWorker" if profile == "uvicorn" else profile
+)
+workers = decouple.config(
+    "GUNICORN_WORKERS",
+    cast=int,
+    default={"sync": 2 * cpu_count + 1, "gthread": cpu_count + 1}.get(
+        profile, cpu_count
+    ),
+)
+threads = decouple.config(
+    "GUNICORN_THREADS", cast=int, default=4 if profile == "gthread" else 1
+)
+worker_connections = decouple.config(
+    "GUNICORN_WORKER_CONNECTIONS", cast=int, default=500
+)
+
+# Django keeps one persistent DB connection per thread (CONN_MAX_AGE),
+# so a worker holds up to `threads` connections. Greenlets and ASGI
+# requests do not reuse threads, so those profiles connect per request.
+if profile in ("gevent", "uvicorn"):
+    os.environ.setdefault("DB_CONN_MAX_AGE", "0")
+db_connection_budget = decouple.config(
+    "DB_CONNECTION_BUDGET", cast=int, default=80
+)
+
+preload_app = decouple.config("GUNICORN_PRELOAD", cast=bool, default=True)
+# Recycle workers to bound memory growth; jitter avoids restarting
+# them all at once
+max_requests = decouple.config("GUNICORN_MAX_REQUESTS", cast=int, default=2000)
+max_requests_jitter = max_requests // 10
+timeout = decouple.config("GUNICORN_TIMEOUT", cast=int, default=30)
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = decouple.config("GUNICORN_ACCESS_LOG", default=None)
+errorlog = "-"
+
+
+def when_ready(server):
+    # Nothing opened by the preloaded app may be shared with workers
+    from django.db import connections
+
+    connections.close_all()
+
+    if profile in ("sync", "gthread"):
+        total = workers * threads
+        log = server.log.info
+        if total > db_connection_budget:
+            log = server.log.warning
+        log(
+            "Up to %s DB connections per worker, %s in total (budget %s)",
+            threads,
+            total,
+            db_connection_budget,
+        )
+
+
+def post_fork(server, worker):
+    from core.warmup import warm_up
+
+    # Sync workers serve requests in this thread and reuse its connection
+    timings = warm_up(keep_connections=profile == "sync")
+    server.log.info(
+        "Worker %s warmed up: %s",
+        worker.pid,
+        ", ".join(f"{name} {ms:.0f}ms" for name, ms in timings.items()),
+    )
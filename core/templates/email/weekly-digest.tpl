@@ -0,0 +1,18 @@
+{% extends "mail_templated/base.tpl" %}
+
+{% block subject %}
+This week on the blog: {{ posts|length }} new post{{ posts|length|pluralize }}
+{% endblock %}
+
+{% block html %}
+{{ header }}
+<ul>
+{% for post in posts %}
+<li>
+<a href="{{ domain }}{% url 'blog:post-detail' slug=post.slug %}"><strong>{{ post.title }}</strong></a>
+by {{ post.author.full_name }}
+<p>{{ post.content|striptags|truncatewords:30 }}</p>
+</li>
+{% endfor %}
+</ul>
+{% endblock %}
@@ -0,0 +1,49 @@
+import os
+import re
+from django.conf import settings
+
+from accounts.models import Profile
+from blog.models import Post
+
+# Names written by uploads.storage.ContentAddressedStorage
+DIGEST_NAME_PATTERN = re.compile(
+    r"^[^/]+/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]+$"
+)
+
+
+def is_digest_name(name):
+    return bool(DIGEST_NAME_PATTERN.match(name))
+
+
+def owning_posts(name):
+    """
+    Posts whose image is `name`, or whose image `name` is a rendition of.
+    """
+    rendition_dir = settings.IMAGE_RENDITION_DIR
+    if name.startswith(rendition_dir):
+        source_root = os.path.dirname(name.removeprefix(rendition_dir))
+        return Post.objects.filter(image__startswith=f"{source_root}.")
+    return Post.objects.filter(image=name)
+
+
+def get_media_access(name, user):
+    """
+    Decide whether `user` may fetch the media file `name`.
+
+    Returns (allowed, public). Images of draft posts are private to their
+    author and staff unless a published post or a profile uses the same
+    file; every other file is public.
+    """
+    posts = list(owning_posts(name).values_list("status", "author_id"))
+    if not posts or any(status for status, _ in posts):
+        return True, True
+    if Profile.objects.filter(image=name).exists():
+        return True, True
+
+    if not user.is_authenticated:
+        return False, False
+    if user.is_staff:
+        return True, False
+    profile = getattr(user, "profile", None)
+    authors = {author_id for _, author_id in posts}
+    return profile is not None and profile.id in authors, False
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import StoredFile, Upload
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ("name", "size", "ref_count", "created_at")
+    search_fields = ("name", "digest")
+    readonly_fields = ("name", "digest", "size", "created_at", "updated_at")
+
+
+@admin.register(Upload)
+class UploadAdmin(admin.ModelAdmin):
+    list_display = ("original_name", "uploaded_by", "size", "created_at")
+    search_fields = ("original_name", "image")
+    raw_id_fields = ("uploaded_by",)
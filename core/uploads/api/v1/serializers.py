@@ -0,0 +1,72 @@
+import mimetypes
+import os
+from rest_framework import serializers
+
+from blog.models import Post
+from ...direct import ALLOWED_EXTENSIONS, DirectUploadError, verify_upload
+
+DIRECT_UPLOAD_TARGETS = ["upload", "post", "profile"]
+
+
+class PresignedUploadSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100, required=False)
+    method = serializers.ChoiceField(choices=["post", "put"], default="post")
+
+    def validate_filename(self, value):
+        """
+        Only the image extensions that ingest accepts.
+        """
+        if os.path.splitext(value)[1].lower() not in ALLOWED_EXTENSIONS:
+            raise serializers.ValidationError(
+                "Only JPEG, PNG, GIF and WebP images can be uploaded."
+            )
+        return value
+
+    def validate(self, attrs):
+        """
+        Default the content type from the file name; only images.
+        """
+        content_type = attrs.get("content_type") or (
+            mimetypes.guess_type(attrs["filename"])[0] or ""
+        )
+        if not content_type.startswith("image/"):
+            raise serializers.ValidationError(
+                {"content_type": "Only images can be uploaded."}
+            )
+        attrs["content_type"] = content_type
+        return attrs
+
+
+class FinalizeUploadSerializer(serializers.Serializer):
+    key = serializers.CharField(max_length=512)
+    target = serializers.ChoiceField(choices=DIRECT_UPLOAD_TARGETS)
+    object_id = serializers.IntegerField(required=False)
+    filename = serializers.CharField(
+        max_length=255, required=False, default=""
+    )
+
+    def validate(self, attrs):
+        """
+        Check the target belongs to the user and the object is a valid
+        upload of theirs.
+        """
+        user = self.context["request"].user
+        target = attrs["target"]
+        if target == "upload" and not user.is_staff:
+            raise serializers.ValidationError(
+                {"target": "Only staff can upload to the editor catalog."}
+            )
+        if (
+            target == "post"
+            and not Post.objects.filter(
+                pk=attrs.get("object_id"), author__user=user
+            ).exists()
+        ):
+            raise serializers.ValidationError({"object_id": "Post not found."})
+
+        try:
+            verify_upload(user.pk, attrs["key"])
+        except DirectUploadError as error:
+            raise serializers.ValidationError({"key": str(error)})
+        return attrs
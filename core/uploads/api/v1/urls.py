@@ -0,0 +1,18 @@
+from django.urls import path
+
+from . import views
+
+app_name = "api-v1"
+
+urlpatterns = [
+    path(
+        "direct/presign/",
+        views.PresignedUploadAPIView.as_view(),
+        name="direct-presign",
+    ),
+    path(
+        "direct/finalize/",
+        views.FinalizeUploadAPIView.as_view(),
+        name="direct-finalize",
+    ),
+]
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ...direct import create_presigned_upload
+from ...tasks import ingest_direct_upload
+from .serializers import FinalizeUploadSerializer, PresignedUploadSerializer
+
+
+class DirectUploadAPIView(APIView):
+    """
+    Base view of the direct-to-bucket upload endpoints; both answer 404
+    unless UPLOAD_S3_ENABLED is set.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def initial(self, request, *args, **kwargs):
+        if not settings.UPLOAD_S3_ENABLED:
+            raise NotFound()
+        super().initial(request, *args, **kwargs)
+
+
+class PresignedUploadAPIView(DirectUploadAPIView):
+    """
+    Presign a POST (default) or PUT so the client uploads the image
+    straight to the bucket.
+    """
+
+    serializer_class = PresignedUploadSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = create_presigned_upload(
+            request.user.pk,
+            serializer.validated_data["filename"],
+            serializer.validated_data["content_type"],
+            method=serializer.validated_data["method"],
+        )
+        return Response(upload, status=status.HTTP_201_CREATED)
+
+
+class FinalizeUploadAPIView(DirectUploadAPIView):
+    """
+    Verify an uploaded object and queue its move into media storage,
+    which attaches it to the target and renders the renditions.
+    """
+
+    serializer_class = FinalizeUploadSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        transaction.on_commit(
+            lambda: ingest_direct_upload.delay(
+                data["key"],
+                request.user.pk,
+                data["target"],
+                data.get("object_id"),
+                data["filename"],
+            )
+        )
+        return Response(
+            {"key": data["key"], "status": "queued"},
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+from django.conf import settings
+
+from .renditions import (
+    is_manifest_current,
+    manifest_file,
+    manifest_name,
+    render_image,
+)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp")
+
+
+def iter_media_images(media_root, directories):
+    """
+    Stream the relative names of image files under `directories` of
+    `media_root`, walking the tree with os.scandir.
+    CKEditor thumbnails (`*_thumb.*`) are skipped.
+    """
+    stack = [os.path.join(media_root, directory) for directory in directories]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                root, ext = os.path.splitext(entry.name)
+                if ext.lower() in IMAGE_EXTENSIONS and not root.endswith(
+                    "_thumb"
+                ):
+                    name = os.path.relpath(entry.path, media_root)
+                    yield name.replace(os.sep, "/")
+
+
+def current_manifest(media_root, name):
+    """
+    The manifest of `name` if it is current and newer than the source
+    file, else None (the file needs rendering).
+    """
+    manifest_path = os.path.join(media_root, manifest_name(name))
+    try:
+        with open(manifest_path, "rb") as file:
+            manifest = json.load(file)
+        manifest_mtime = os.stat(manifest_path).st_mtime
+    except (OSError, ValueError):
+        return None
+    source_mtime = os.stat(os.path.join(media_root, name)).st_mtime
+    if (
+        not is_manifest_current(manifest, name)
+        or manifest_mtime < source_mtime
+    ):
+        return None
+    return manifest
+
+
+def write_atomic(path, content):
+    """
+    Write `content` to `path` through a temporary file and a rename, so
+    readers never see a partial file.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_file(media_root, name):
+    """
+    Render one file under `media_root` (process pool worker).
+
+    Renditions are written first and the manifest last, so an
+    interrupted run leaves the file without a manifest and the next run
+    picks it up again; a manifest written but not yet recorded on the
+    rows is recorded by the next run. Returns (name, manifest, bytes written).
+    """
+    with open(os.path.join(media_root, name), "rb") as file:
+        manifest, files = render_image(file, name)
+    manifest_path, manifest_content = manifest_file(manifest)
+    written = 0
+    for path, content in [*files.items(), (manifest_path, manifest_content)]:
+        write_atomic(os.path.join(media_root, path), content)
+        written += len(content)
+    return name, manifest, written
+
+
+def default_directories():
+    return ["post_images/", "profile_images/", settings.CKEDITOR_UPLOAD_PATH]
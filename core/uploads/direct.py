@@ -0,0 +1,168 @@
+import os
+import posixpath
+import shutil
+import tempfile
+import uuid
+from django.conf import settings
+from django.core.files import File
+from PIL import Image
+
+# Extension stored for each image format PIL may detect on ingest; the
+# stored name never keeps the client's extension
+IMAGE_FORMAT_EXTENSIONS = {
+    "JPEG": ".jpg",
+    "PNG": ".png",
+    "GIF": ".gif",
+    "WEBP": ".webp",
+}
+# Extensions a client may announce, with their canonical form
+ALLOWED_EXTENSIONS = {
+    ".jpg": ".jpg",
+    ".jpeg": ".jpg",
+    ".png": ".png",
+    ".gif": ".gif",
+    ".webp": ".webp",
+}
+# Objects up to this size are buffered in memory on ingest
+SPOOL_MAX_SIZE = 2 * 1024 * 1024
+
+
+class DirectUploadError(Exception):
+    """
+    The object a client uploaded to the bucket cannot be accepted.
+    """
+
+
+def get_s3_client():
+    """
+    Client for the S3-compatible upload bucket (AWS S3, MinIO, ...).
+    """
+    import boto3  # only needed with UPLOAD_S3_ENABLED
+
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.UPLOAD_S3_ENDPOINT_URL or None,
+        region_name=settings.UPLOAD_S3_REGION,
+        aws_access_key_id=settings.UPLOAD_S3_ACCESS_KEY_ID or None,
+        aws_secret_access_key=settings.UPLOAD_S3_SECRET_ACCESS_KEY or None,
+    )
+
+
+def user_prefix(user_id):
+    return f"{settings.UPLOAD_S3_INCOMING_PREFIX}{user_id}/"
+
+
+def create_presigned_upload(
+    user_id, filename, content_type, method="post", client=None
+):
+    """
+    Presign an upload of one image under the user's incoming prefix.
+
+    POST uploads enforce the type and UPLOAD_MAX_SIZE in the policy; PUT
+    uploads only pin the type, the size is checked on finalize.
+    """
+    ext = ALLOWED_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+    if ext is None:
+        raise DirectUploadError("Only JPEG, PNG, GIF and WebP images.")
+    client = client or get_s3_client()
+    key = f"{user_prefix(user_id)}{uuid.uuid4().hex}{ext}"
+    bucket = settings.UPLOAD_S3_BUCKET
+    expires = settings.UPLOAD_S3_PRESIGN_EXPIRES
+
+    if method == "put":
+        url = client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": bucket, "Key": key, "ContentType": content_type},
+            ExpiresIn=expires,
+        )
+        return {
+            "method": "PUT",
+            "url": url,
+            "key": key,
+            "headers": {"Content-Type": content_type},
+        }
+
+    post = client.generate_presigned_post(
+        bucket,
+        key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, settings.UPLOAD_MAX_SIZE],
+        ],
+        ExpiresIn=expires,
+    )
+    return {
+        "method": "POST",
+        "url": post["url"],
+        "fields": post["fields"],
+        "key": key,
+    }
+
+
+def verify_upload(user_id, key, client=None):
+    """
+    Check that `key` is the user's uploaded image within the size limit.
+    Rejected objects are deleted. Returns the HEAD response.
+    """
+    from botocore.exceptions import ClientError
+
+    if not key.startswith(user_prefix(user_id)) or ".." in key:
+        raise DirectUploadError("Unknown upload.")
+
+    client = client or get_s3_client()
+    bucket = settings.UPLOAD_S3_BUCKET
+    try:
+        head = client.head_object(Bucket=bucket, Key=key)
+    except ClientError:
+        raise DirectUploadError("Upload not found.")
+
+    if head["ContentLength"] > settings.UPLOAD_MAX_SIZE:
+        client.delete_object(Bucket=bucket, Key=key)
+        raise DirectUploadError("File is too large.")
+    if not head.get("ContentType", "").startswith("image/"):
+        client.delete_object(Bucket=bucket, Key=key)
+        raise DirectUploadError("Only images can be uploaded.")
+    return head
+
+
+def ingest_object(key, field_file, client=None):
+    """
+    Copy the uploaded object into `field_file`'s storage (without saving
+    the instance), then delete it from the bucket. Returns the stored
+    name.
+
+    The image format is detected by PIL and must match the key's
+    extension; the stored name gets the extension of that format, so a
+    polyglot can never be stored as, e.g., `.html`.
+    """
+    client = client or get_s3_client()
+    bucket = settings.UPLOAD_S3_BUCKET
+    try:
+        with tempfile.SpooledTemporaryFile(SPOOL_MAX_SIZE) as temp:
+            body = client.get_object(Bucket=bucket, Key=key)["Body"]
+            try:
+                shutil.copyfileobj(body, temp)
+            finally:
+                body.close()
+
+            temp.seek(0)
+            try:
+                with Image.open(temp) as image:
+                    image_format = image.format
+                    image.verify()
+            except Exception:
+                raise DirectUploadError("File is not a valid image.")
+            root, ext = posixpath.splitext(posixpath.basename(key))
+            format_ext = IMAGE_FORMAT_EXTENSIONS.get(image_format)
+            if (
+                format_ext is None
+                or ALLOWED_EXTENSIONS.get(ext.lower()) != format_ext
+            ):
+                raise DirectUploadError("File does not match its image type.")
+
+            temp.seek(0)
+            field_file.save(f"{root}{format_ext}", File(temp), save=False)
+    finally:
+        client.delete_object(Bucket=bucket, Key=key)
+    return field_file.name
@@ -0,0 +1,48 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+from .renditions import build_srcset, manifest_matches
+
+
+class ImageRenditionsField(serializers.Field):
+    """
+    Read-only field with the size, blur placeholder and per-format
+    `srcset` (absolute URLs) of an instance's image renditions, or None
+    until they are rendered.
+    """
+
+    def __init__(self, image_field="image", **kwargs):
+        self.image_field = image_field
+        kwargs["read_only"] = True
+        kwargs.setdefault("source", "*")
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        return renditions_representation(
+            getattr(instance, self.image_field),
+            getattr(instance, f"{self.image_field}_renditions"),
+            self.context.get("request"),
+        )
+
+
+def renditions_representation(image, manifest, request=None):
+    """
+    Size, placeholder and per-format `srcset` of an image's renditions,
+    or None until they are rendered.
+    """
+    if not image or not manifest_matches(manifest, image.name):
+        return None
+
+    def url(name):
+        url = default_storage.url(name)
+        return request.build_absolute_uri(url) if request else url
+
+    return {
+        "width": manifest["width"],
+        "height": manifest["height"],
+        "placeholder": manifest["placeholder"],
+        "srcset": {
+            fmt: build_srcset(manifest, fmt, url)
+            for fmt in manifest["renditions"]
+        },
+    }
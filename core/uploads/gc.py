@@ -0,0 +1,169 @@
+import hashlib
+import os
+import re
+import time
+from datetime import datetime, timezone
+from itertools import chain
+from urllib.parse import unquote, urlsplit
+from django.conf import settings
+
+from accounts.models import Profile
+from blog.models import Post
+from .models import StoredFile, Upload
+
+# Top-level directories that are never collected
+KEPT_DIRS = ("defaults",)
+
+
+def name_key(name):
+    """
+    8-byte hash of a media name; the referenced set stores these instead
+    of the names to stay small with hundreds of thousands of files.
+    """
+    return hashlib.blake2b(name.encode(), digest_size=8).digest()
+
+
+def media_url_pattern():
+    media_path = urlsplit(settings.MEDIA_URL).path
+    return re.compile(
+        r"""(?:https?://[^/"'\s]+)?"""
+        + re.escape(media_path)
+        + r"""([^"'\s?#)]+)"""
+    )
+
+
+def iter_referenced_names(chunk_size=2000):
+    """
+    Stream every media name referenced by Post/Profile images and by the
+    media URLs inside Post content, in one pass over each table.
+    """
+    pattern = media_url_pattern()
+    posts = Post.objects.values_list("image", "content").iterator(
+        chunk_size=chunk_size
+    )
+    for image, content in posts:
+        if image:
+            yield image
+        for match in pattern.finditer(content or ""):
+            yield unquote(match.group(1))
+
+    profiles = (
+        Profile.objects.exclude(image="")
+        .exclude(image__isnull=True)
+        .values_list("image", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+    yield from profiles
+
+
+def iter_recent_names(since, chunk_size=2000):
+    """
+    Stream the names saved or cataloged since `since`. A re-upload of
+    existing content only touches its StoredFile row, not the file's
+    mtime, so these are kept through the grace period as well.
+    """
+    yield from (
+        StoredFile.objects.filter(updated_at__gte=since)
+        .values_list("name", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+    yield from (
+        Upload.objects.filter(created_at__gte=since)
+        .values_list("image", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def build_referenced_set(since=None):
+    """
+    Keys of referenced names (and of names saved since `since`) and of
+    their rendition directories.
+    """
+    names = iter_referenced_names()
+    if since is not None:
+        names = chain(names, iter_recent_names(since))
+    referenced = set()
+    for name in names:
+        referenced.add(name_key(name))
+        referenced.add(name_key(os.path.splitext(name)[0]))
+    return referenced
+
+
+def is_referenced(name, referenced):
+    if name_key(name) in referenced:
+        return True
+    rendition_dir = settings.IMAGE_RENDITION_DIR
+    if name.startswith(rendition_dir):
+        # renditions/<source root>/<file>: kept while the source is
+        source_root = os.path.dirname(name.removeprefix(rendition_dir))
+        return name_key(source_root) in referenced
+    return False
+
+
+def iter_media_files(media_root):
+    """
+    Walk MEDIA_ROOT with os.scandir, yielding (name, stat) for every
+    file outside hidden and kept directories.
+    """
+    stack = [media_root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if directory == media_root and entry.name in KEPT_DIRS:
+                        continue
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    name = os.path.relpath(entry.path, media_root)
+                    yield name.replace(os.sep, "/"), entry.stat()
+
+
+def collect_orphans(grace_hours=None, dry_run=False, batch_size=1000):
+    """
+    Move media files that nothing references and that were not saved
+    within the grace period to `MEDIA_QUARANTINE_DIR/<date>/`, dropping their
+    catalog and reference-count rows.
+
+    Memory stays bounded: the referenced set holds 8-byte keys and the
+    tree is streamed. Returns (files, bytes) quarantined.
+    """
+    if grace_hours is None:
+        grace_hours = settings.MEDIA_GC_GRACE_HOURS
+    media_root = str(settings.MEDIA_ROOT)
+    quarantine = os.path.join(
+        media_root,
+        settings.MEDIA_QUARANTINE_DIR,
+        time.strftime("%Y%m%d"),
+    )
+    cutoff = time.time() - grace_hours * 3600
+    referenced = build_referenced_set(
+        since=datetime.fromtimestamp(cutoff, timezone.utc)
+    )
+
+    files = reclaimed = 0
+    batch = []
+    for name, stat in iter_media_files(media_root):
+        if stat.st_mtime > cutoff or is_referenced(name, referenced):
+            continue
+        files += 1
+        reclaimed += stat.st_size
+        if dry_run:
+            continue
+        target = os.path.join(quarantine, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(os.path.join(media_root, name), target)
+        batch.append(name)
+        if len(batch) >= batch_size:
+            forget_files(batch)
+            batch = []
+    if batch:
+        forget_files(batch)
+    return files, reclaimed
+
+
+def forget_files(names):
+    Upload.objects.filter(image__in=names).delete()
+    StoredFile.objects.filter(name__in=names).delete()
@@ -0,0 +1,127 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from accounts.models import Profile
+from blog.models import Post
+from uploads.backfill import (
+    current_manifest,
+    default_directories,
+    iter_media_images,
+    render_file,
+)
+from uploads.models import Upload
+
+# Models whose `image_renditions` field records the manifest
+RENDITION_MODELS = (Post, Profile, Upload)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render missing or outdated image renditions for files under "
+        "MEDIA_ROOT in parallel. Safe to interrupt and run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "directories",
+            nargs="*",
+            help="Directories under MEDIA_ROOT (default: post, profile "
+            "and CKEditor uploads).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Worker processes.",
+        )
+        parser.add_argument(
+            "--max-pending",
+            type=int,
+            default=None,
+            help="Files queued at once, bounding memory "
+            "(default: 2 per worker).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Render files whose manifest is current too.",
+        )
+
+    def handle(self, *args, **options):
+        media_root = str(settings.MEDIA_ROOT)
+        directories = options["directories"] or default_directories()
+        workers = options["workers"]
+        max_pending = options["max_pending"] or workers * 2
+        self.rendered = self.skipped = self.failed = self.written = 0
+
+        # Forked workers must not share the parent's DB connections
+        for connection in connections.all():
+            if not connection.in_atomic_block:
+                connection.close()
+        self.started = time.monotonic()
+        pending = {}  # future -> file name
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for name in iter_media_images(media_root, directories):
+                manifest = (
+                    None
+                    if options["force"]
+                    else current_manifest(media_root, name)
+                )
+                if manifest is not None:
+                    # The manifest may be on disk only, if a run stopped
+                    # before recording it
+                    self.record(name, manifest)
+                    self.skipped += 1
+                    continue
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    self.collect(
+                        {future: pending.pop(future) for future in done}
+                    )
+                pending[executor.submit(render_file, media_root, name)] = name
+            self.collect(pending)
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {self.rendered}, skipped {self.skipped}, "
+                f"failed {self.failed} in {elapsed:.1f}s "
+                f"({self.rendered / elapsed if elapsed else 0:.1f} images/s, "
+                f"{self.written / 1024 / 1024:.1f} MiB written)"
+            )
+        )
+
+    def collect(self, futures):
+        for future, name in futures.items():
+            try:
+                _, manifest, written = future.result()
+            except Exception as error:
+                self.failed += 1
+                self.stderr.write(f"Failed to render {name}: {error!r}")
+                continue
+
+            self.rendered += 1
+            self.written += written
+            self.record(name, manifest)
+
+            if self.rendered % 100 == 0:
+                elapsed = time.monotonic() - self.started
+                self.stdout.write(
+                    f"{self.rendered} rendered "
+                    f"({self.rendered / elapsed:.1f} images/s)"
+                )
+
+    def record(self, name, manifest):
+        """
+        Store `manifest` on the rows whose image is `name`, unless they
+        already have it.
+        """
+        for model in RENDITION_MODELS:
+            if name.startswith(model.image.field.upload_to):
+                model.objects.filter(image=name).exclude(
+                    image_renditions=manifest
+                ).update(image_renditions=manifest)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from uploads.gc import collect_orphans
+
+
+class Command(BaseCommand):
+    help = (
+        "Move media files that no post or profile references, and that "
+        "are older than the grace period, to the quarantine directory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=None,
+            help="Keep files modified within this many hours "
+            "(default: MEDIA_GC_GRACE_HOURS).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be quarantined.",
+        )
+
+    def handle(self, *args, **options):
+        files, reclaimed = collect_orphans(
+            grace_hours=options["grace_hours"], dry_run=options["dry_run"]
+        )
+        action = "Would quarantine" if options["dry_run"] else "Quarantined"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {files} file(s), "
+                f"{reclaimed / 1024 / 1024:.1f} MiB reclaimed."
+            )
+        )
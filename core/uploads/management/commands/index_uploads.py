@@ -0,0 +1,74 @@
+import os
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from uploads.backfill import iter_media_images
+from uploads.models import Upload
+
+
+class Command(BaseCommand):
+    help = (
+        "Add existing CKEditor uploads under MEDIA_ROOT to the upload "
+        "catalog. Files already in the catalog are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--owner",
+            help="Email of the user to record as uploader "
+            "(default: none, visible to superusers only).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        owner = None
+        if options["owner"]:
+            owner = User.objects.filter(email=options["owner"]).first()
+            if owner is None:
+                raise CommandError(f"No user with email {options['owner']}")
+
+        media_root = str(settings.MEDIA_ROOT)
+        names = iter_media_images(media_root, [settings.CKEDITOR_UPLOAD_PATH])
+        indexed = 0
+        batch = []
+        for name in names:
+            batch.append(name)
+            if len(batch) >= options["batch_size"]:
+                indexed += self.index(media_root, batch, owner)
+                batch = []
+        if batch:
+            indexed += self.index(media_root, batch, owner)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} upload(s)."))
+
+    def index(self, media_root, names, owner):
+        known = set(
+            Upload.objects.filter(image__in=names).values_list(
+                "image", flat=True
+            )
+        )
+        uploads = []
+        for name in names:
+            if name in known:
+                continue
+            stat = os.stat(os.path.join(media_root, name))
+            uploads.append(
+                Upload(
+                    image=name,
+                    original_name=os.path.basename(name),
+                    size=stat.st_size,
+                    uploaded_by=owner,
+                    created_at=datetime.fromtimestamp(
+                        stat.st_mtime, tz=timezone.utc
+                    ),
+                )
+            )
+        Upload.objects.bulk_create(uploads, ignore_conflicts=True)
+        return len(uploads)
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.15 on 2026-10-19 11:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uploads.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("uploads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Upload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "image",
+                    models.FileField(
+                        max_length=255,
+                        storage=uploads.storage.get_content_addressed_storage,
+                        upload_to="uploads/",
+                    ),
+                ),
+                (
+                    "image_renditions",
+                    models.JSONField(blank=True, default=dict, editable=False),
+                ),
+                ("original_name", models.CharField(max_length=255)),
+                ("size", models.BigIntegerField(default=0)),
+                (
+                    "created_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "uploaded_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="uploads",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["uploaded_by", "-created_at"],
+                        name="upload_author_created_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="upload",
+            constraint=models.UniqueConstraint(
+                fields=("image", "uploaded_by"), name="upload_image_author"
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.15 on 2026-10-19 12:17
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def recount_references(apps, schema_editor):
+    """
+    ref_count used to count saves; count the rows using each file.
+    """
+    StoredFile = apps.get_model("uploads", "StoredFile")
+    counts = {}
+    for model in (
+        apps.get_model("blog", "Post"),
+        apps.get_model("uploads", "Upload"),
+    ):
+        rows = (
+            model.objects.exclude(image="")
+            .values("image")
+            .annotate(count=Count("pk"))
+        )
+        for row in rows:
+            counts[row["image"]] = counts.get(row["image"], 0) + row["count"]
+
+    for stored in StoredFile.objects.iterator():
+        stored.ref_count = counts.get(stored.name, 0)
+        stored.save(update_fields=["ref_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_alter_post_image"),
+        ("uploads", "0002_upload_upload_upload_image_author"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="storedfile",
+            name="ref_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(recount_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+from .storage import get_content_addressed_storage
+
+
+class StoredFile(models.Model):
+    """
+    A file stored once under its content digest by
+    ContentAddressedStorage, with the number of rows whose image it is
+    (Post and Upload, kept by uploads.signals). Storage deletes leave a
+    referenced file alone; the media GC (uploads.gc) quarantines files
+    nothing references.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Refreshed by every save of the content, identical re-uploads too
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def register(cls, name, digest, size):
+        """
+        Record a saved file; an existing row is only touched, so the GC
+        grace period restarts with a re-upload.
+        """
+        touched = cls.objects.filter(name=name).update(
+            updated_at=timezone.now()
+        )
+        if not touched:
+            cls.objects.get_or_create(
+                name=name, defaults={"digest": digest, "size": size}
+            )
+
+    @classmethod
+    def add_reference(cls, name):
+        cls.objects.filter(name=name).update(
+            ref_count=F("ref_count") + 1, updated_at=timezone.now()
+        )
+
+    @classmethod
+    def drop_reference(cls, name):
+        cls.objects.filter(name=name, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1, updated_at=timezone.now()
+        )
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class Upload(models.Model):
+    """
+    Catalog entry of a CKEditor upload, recorded when the file is saved.
+    The CKEditor image browser is served from this table instead of
+    walking the upload directory.
+    """
+
+    image = models.FileField(
+        upload_to="uploads/",
+        storage=get_content_addressed_storage,
+        max_length=255,
+    )
+    # Rendition manifest of `image`, filled by uploads.tasks
+    image_renditions = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
+    original_name = models.CharField(max_length=255)
+    size = models.BigIntegerField(default=0)
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="uploads",
+    )
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(
+                fields=["uploaded_by", "-created_at"],
+                name="upload_author_created_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["image", "uploaded_by"], name="upload_image_author"
+            ),
+        ]
+
+    def __str__(self):
+        return self.original_name
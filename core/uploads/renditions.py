@@ -0,0 +1,179 @@
+import base64
+import hashlib
+import io
+import json
+import os
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Pillow format and file extension of each rendition format
+FORMATS = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}
+
+
+def get_rendition_version():
+    """
+    Short hash of the rendition settings; manifests made with other
+    settings are out of date.
+    """
+    spec = json.dumps(
+        [
+            settings.IMAGE_RENDITION_WIDTHS,
+            settings.IMAGE_RENDITION_FORMATS,
+            settings.IMAGE_RENDITION_QUALITY,
+            settings.IMAGE_PLACEHOLDER_WIDTH,
+        ]
+    )
+    return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+
+def rendition_prefix(name):
+    """
+    Storage path prefix of the renditions of the source file `name`.
+    """
+    root, _ = os.path.splitext(name)
+    return f"{settings.IMAGE_RENDITION_DIR}{root}"
+
+
+def manifest_name(name):
+    """
+    Storage name of the manifest written next to the renditions of `name`.
+    """
+    return f"{rendition_prefix(name)}/manifest.json"
+
+
+def manifest_matches(manifest, name):
+    """
+    Whether `manifest` describes renditions of the source file `name`.
+    """
+    return bool(manifest) and manifest.get("source") == name
+
+
+def is_manifest_current(manifest, name):
+    """
+    Whether `manifest` matches `name` and the current rendition settings.
+    """
+    return (
+        manifest_matches(manifest, name)
+        and manifest.get("version") == get_rendition_version()
+    )
+
+
+def decode_image(file):
+    """
+    Decode an image once, letting the JPEG decoder downscale while
+    decoding, and apply its EXIF orientation.
+    """
+    image = Image.open(file)
+    image.draft("RGB", (max(settings.IMAGE_RENDITION_WIDTHS), 1))
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def encode_image(image, fmt, quality):
+    """
+    Encode `image` without metadata: Pillow only writes EXIF when asked.
+    """
+    pil_format, _ = FORMATS[fmt]
+    if pil_format == "JPEG" and image.mode == "RGBA":
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def resize(image, width):
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+
+
+def render_image(file, name):
+    """
+    Decode the source image `name` once and encode every rendition.
+
+    Returns (manifest, files), where `files` maps storage names to the
+    encoded bytes. Widths above the source width are not upscaled.
+    """
+    image = decode_image(file)
+    prefix = rendition_prefix(name)
+    widths = sorted(
+        {min(width, image.width) for width in settings.IMAGE_RENDITION_WIDTHS}
+    )
+
+    files = {}
+    renditions = {fmt: [] for fmt in settings.IMAGE_RENDITION_FORMATS}
+    for width in widths:
+        resized = resize(image, width) if width < image.width else image
+        for fmt in settings.IMAGE_RENDITION_FORMATS:
+            rendition_name = f"{prefix}/{width}w.{FORMATS[fmt][1]}"
+            files[rendition_name] = encode_image(
+                resized, fmt, settings.IMAGE_RENDITION_QUALITY
+            )
+            renditions[fmt].append({"width": width, "name": rendition_name})
+
+    placeholder = encode_image(
+        resize(image, min(settings.IMAGE_PLACEHOLDER_WIDTH, image.width)),
+        "jpeg",
+        quality=40,
+    )
+    manifest = {
+        "source": name,
+        "version": get_rendition_version(),
+        "width": image.width,
+        "height": image.height,
+        "placeholder": "data:image/jpeg;base64,"
+        + base64.b64encode(placeholder).decode(),
+        "renditions": renditions,
+    }
+    return manifest, files
+
+
+def manifest_file(manifest):
+    """
+    Return the (name, content) of the manifest file of `manifest`.
+    """
+    return manifest_name(manifest["source"]), json.dumps(manifest).encode()
+
+
+def save_renditions(manifest, files, storage=None):
+    """
+    Write rendered files, replacing older renditions with the same name.
+    The manifest file is written last, so it only exists once every
+    rendition it lists does.
+    """
+    storage = storage or default_storage
+    manifest_path, manifest_content = manifest_file(manifest)
+    files = {**files, manifest_path: manifest_content}
+    for name, content in files.items():
+        if storage.exists(name):
+            storage.delete(name)
+        storage.save(name, ContentFile(content))
+
+
+def generate_renditions(name, storage=None):
+    """
+    Render and store the renditions of the stored file `name`.
+    Returns the manifest.
+    """
+    storage = storage or default_storage
+    with storage.open(name, "rb") as file:
+        manifest, files = render_image(file, name)
+    save_renditions(manifest, files, storage)
+    return manifest
+
+
+def build_srcset(manifest, fmt, url=None):
+    """
+    Return the `srcset` attribute value of one rendition format.
+    """
+    url = url or default_storage.url
+    return ", ".join(
+        f"{url(rendition['name'])} {rendition['width']}w"
+        for rendition in manifest["renditions"].get(fmt, [])
+    )
@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import Profile
+from blog.models import Post
+from .models import StoredFile, Upload
+from .renditions import is_manifest_current
+from .tasks import render_image_renditions
+
+# Shared default images, not worth rendering per instance
+SKIPPED_PREFIXES = ("defaults/",)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=Upload)
+def schedule_image_renditions(sender, instance, **kwargs):
+    """
+    Render the image renditions in Celery once a new image is committed.
+    """
+    name = instance.image.name if instance.image else ""
+    if (
+        name
+        and not name.startswith(SKIPPED_PREFIXES)
+        and not is_manifest_current(instance.image_renditions, name)
+    ):
+        transaction.on_commit(
+            lambda: render_image_renditions.delay(
+                sender._meta.label, instance.pk
+            )
+        )
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=Upload)
+def remember_stored_image(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the image name the row had before this save.
+    """
+    if update_fields is not None and "image" not in update_fields:
+        return
+    instance._stored_image = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("image", flat=True)
+        .first()
+        if instance.pk
+        else ""
+    ) or ""
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Upload)
+def count_image_reference(sender, instance, **kwargs):
+    """
+    Move the StoredFile reference when the image changed.
+    """
+    if not hasattr(instance, "_stored_image"):
+        return
+    previous = instance.__dict__.pop("_stored_image")
+    current = instance.image.name or ""
+    if current != previous:
+        if current:
+            StoredFile.add_reference(current)
+        if previous:
+            StoredFile.drop_reference(previous)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Upload)
+def drop_image_reference(sender, instance, **kwargs):
+    """
+    Release the StoredFile reference of a deleted row.
+    """
+    if instance.image:
+        StoredFile.drop_reference(instance.image.name)
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.apps import apps
+from django.db import transaction
+
+# Uploads are streamed here first, on the same volume as the final path
+INCOMING_DIR = ".incoming"
+CHUNK_SIZE = 64 * 1024
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that stores every file under its SHA-256 digest.
+
+    The upload is hashed while it is streamed to disk (never read fully
+    into memory) and saved as `<top dir>/<ab>/<cd>/<digest><ext>`, e.g.
+    `post_images/3f/a2/3fa2….jpg`. Identical content resolves to the
+    existing file, and StoredFile counts the rows that use it, so
+    `delete()` leaves a file alone while it is referenced. Since a name
+    never changes content, it can be served with immutable cache
+    headers.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save()
+        return name
+
+    def digest_name(self, name, digest):
+        top_dir = name.split("/", 1)[0] if "/" in name else ""
+        ext = os.path.splitext(name)[1].lower()
+        return posixpath.join(
+            top_dir, digest[:2], digest[2:4], f"{digest}{ext}"
+        )
+
+    def _save(self, name, content):
+        temp_path, digest, size = self._stream_to_disk(content)
+        final_name = self.digest_name(name, digest)
+        full_path = self.path(final_name)
+        try:
+            if not os.path.exists(full_path):
+                self._make_dirs(os.path.dirname(full_path))
+                os.replace(temp_path, full_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+        get_stored_file_model().register(final_name, digest, size)
+        return final_name
+
+    def _stream_to_disk(self, content):
+        """
+        Hash `content` chunk by chunk into a temporary file under
+        INCOMING_DIR. Returns (temporary path, hex digest, size).
+        """
+        incoming = self.path(INCOMING_DIR)
+        self._make_dirs(incoming)
+        sha256 = hashlib.sha256()
+        size = 0
+
+        if hasattr(content, "temporary_file_path"):
+            # Large uploads are already on disk: hash, then move them
+            with open(content.temporary_file_path(), "rb") as file:
+                for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    size += len(chunk)
+            fd, temp_path = tempfile.mkstemp(dir=incoming)
+            os.close(fd)
+            file_move_safe(
+                content.temporary_file_path(),
+                temp_path,
+                allow_overwrite=True,
+            )
+            return temp_path, sha256.hexdigest(), size
+
+        fd, temp_path = tempfile.mkstemp(dir=incoming)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    sha256.update(chunk)
+                    file.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return temp_path, sha256.hexdigest(), size
+
+    def _make_dirs(self, directory):
+        if self.directory_permissions_mode is not None:
+            # Set the umask so intermediate directories get the mode too
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(
+                    directory, self.directory_permissions_mode, exist_ok=True
+                )
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+    def delete(self, name):
+        """
+        Remove `name` unless a row still references it.
+        """
+        StoredFile = get_stored_file_model()
+        with transaction.atomic():
+            stored = (
+                StoredFile.objects.select_for_update()
+                .filter(name=name)
+                .first()
+            )
+            if stored and stored.ref_count > 0:
+                return
+            if stored:
+                stored.delete()
+        super().delete(name)
+
+
+def get_stored_file_model():
+    # Resolved lazily: uploads.models uses this module for its fields
+    return apps.get_model("uploads", "StoredFile")
+
+
+def get_content_addressed_storage():
+    return content_addressed_storage
+
+
+content_addressed_storage = ContentAddressedStorage()
@@ -0,0 +1,72 @@
+import posixpath
+from celery import shared_task
+from django.apps import apps
+
+from accounts.models import Profile
+from blog.models import Post
+from .direct import DirectUploadError, ingest_object
+from .gc import collect_orphans
+from .models import Upload
+from .renditions import generate_renditions, is_manifest_current
+
+
+@shared_task
+def render_image_renditions(model_label, pk):
+    """
+    Render the renditions of an instance's `image` and record the
+    manifest in its `image_renditions` field.
+    """
+    model = apps.get_model(model_label)
+    instance = (
+        model.objects.filter(pk=pk).only("image", "image_renditions").first()
+    )
+    if instance is None or not instance.image:
+        return
+    name = instance.image.name
+    if is_manifest_current(instance.image_renditions, name):
+        return
+
+    manifest = generate_renditions(name)
+    # Skip the update if the image was replaced in the meantime
+    model.objects.filter(pk=pk, image=name).update(image_renditions=manifest)
+
+
+@shared_task
+def collect_orphaned_media():
+    """
+    Quarantine unreferenced media files past the grace period.
+    """
+    files, reclaimed = collect_orphans()
+    return {"files": files, "bytes": reclaimed}
+
+
+@shared_task
+def ingest_direct_upload(key, user_id, target, object_id=None, filename=""):
+    """
+    Move a finalized direct upload from the bucket into media storage
+    and attach it to its target. Saving the target queues renditions.
+    """
+    if target == "upload":
+        instance = Upload(uploaded_by_id=user_id)
+    elif target == "profile":
+        instance = Profile.objects.get(user_id=user_id)
+    else:
+        instance = Post.objects.get(pk=object_id, author__user_id=user_id)
+
+    try:
+        name = ingest_object(key, instance.image)
+    except DirectUploadError:
+        return None
+
+    if target == "upload":
+        Upload.objects.get_or_create(
+            image=name,
+            uploaded_by_id=user_id,
+            defaults={
+                "original_name": filename or posixpath.basename(key),
+                "size": instance.image.size,
+            },
+        )
+    else:
+        instance.save(update_fields=["image"])
+    return name
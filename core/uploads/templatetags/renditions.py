@@ -0,0 +1,39 @@
+from django import template
+
+from ..renditions import build_srcset, manifest_matches
+
+register = template.Library()
+
+
+@register.simple_tag
+def srcset(image, manifest, fmt="jpeg"):
+    """
+    Return the `srcset` value of an image's renditions, or "" when they
+    were not rendered yet.
+    """
+    if not image or not manifest_matches(manifest, image.name):
+        return ""
+    return build_srcset(manifest, fmt)
+
+
+@register.inclusion_tag("uploads/responsive_image.html")
+def responsive_image(image, manifest, alt="", sizes="100vw", css_class=""):
+    """
+    Render a <picture> with WebP and JPEG srcsets and a blurred
+    placeholder, falling back to the original file until the renditions
+    exist.
+    """
+    context = {
+        "src": image.url if image else "",
+        "alt": alt,
+        "sizes": sizes,
+        "css_class": css_class,
+        "manifest": None,
+    }
+    if image and manifest_matches(manifest, image.name):
+        context.update(
+            manifest=manifest,
+            webp_srcset=build_srcset(manifest, "webp"),
+            jpeg_srcset=build_srcset(manifest, "jpeg"),
+        )
+    return context
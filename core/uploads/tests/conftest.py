@@ -0,0 +1,47 @@
+"""
+Shared fixtures for uploads app tests.
+"""
+
+import io
+import pytest
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    """
+    Stores uploads in a temporary MEDIA_ROOT.
+    """
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def locmem_caches(settings):
+    """
+    Uses in-process caches instead of Redis, sessions included.
+    """
+    settings.CACHES = {
+        alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        for alias in ("default", "sessions")
+    }
+    yield
+    for alias in ("default", "sessions"):
+        caches[alias].clear()
+
+
+@pytest.fixture
+def stored_jpeg(media_root):
+    """
+    Stores an 800x600 JPEG with EXIF data and returns its name.
+    """
+    exif = Image.Exif()
+    exif[0x010F] = "Test Camera"  # Make
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), "red").save(buffer, "JPEG", exif=exif)
+    return default_storage.save(
+        "post_images/photo.jpg", ContentFile(buffer.getvalue())
+    )
@@ -0,0 +1,49 @@
+"""
+Test suite for the parallel rendition backfill command.
+"""
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from accounts.models import Profile, User
+from blog.models import Post
+from uploads.renditions import manifest_name
+
+
+@pytest.mark.django_db
+def test_backfill_renders_then_skips(stored_jpeg, media_root, capsys):
+    """
+    A second run skips files whose manifest is current.
+    """
+    call_command("backfill_renditions", "--workers", "2")
+    assert (media_root / manifest_name(stored_jpeg)).exists()
+    assert "Rendered 1, skipped 0, failed 0" in capsys.readouterr().out
+
+    call_command("backfill_renditions", "--workers", "2")
+    assert "Rendered 0, skipped 1, failed 0" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_backfill_records_manifest_left_on_disk(stored_jpeg, capsys):
+    """
+    A file rendered by an interrupted run is skipped, and its manifest
+    is still recorded on the rows using it.
+    """
+    call_command("backfill_renditions", "--workers", "1")
+    capsys.readouterr()
+    user = User.objects.create_user(email="resume@uploads.com", password="x")
+    post = Post.objects.create(
+        author=Profile.objects.get(user=user),
+        title="Resumed",
+        content="Content",
+        status=True,
+        published_date=timezone.now(),
+        image=stored_jpeg,
+    )
+    Post.objects.filter(pk=post.pk).update(image_renditions={})
+
+    call_command("backfill_renditions", "--workers", "1")
+    assert "Rendered 0, skipped 1, failed 0" in capsys.readouterr().out
+    post.refresh_from_db()
+    assert post.image_renditions["source"] == stored_jpeg
@@ -0,0 +1,84 @@
+"""
+Test suite for the catalog-backed CKEditor image browser.
+"""
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import User
+from uploads.models import StoredFile, Upload
+
+
+@pytest.fixture
+def staff_client(db, locmem_caches):
+    """
+    Returns a client logged in as a staff user, and the user.
+    """
+    user = User.objects.create_user(
+        email="editor@uploads.com", password="x", is_staff=True
+    )
+    client = Client()
+    client.force_login(user, backend="accounts.backends.RequestUserBackend")
+    return client, user
+
+
+def test_upload_is_cataloged_and_browsed_per_author(
+    staff_client, media_root, settings
+):
+    """
+    Uploads are recorded for their author, who only sees their own.
+    """
+    settings.UPLOAD_BROWSE_PAGE_SIZE = 1
+    client, user = staff_client
+    other = User.objects.create_user(email="other@uploads.com", password="x")
+    Upload.objects.create(
+        image="uploads/other.png", original_name="other.png", uploaded_by=other
+    )
+
+    for content in (b"first", b"second"):
+        response = client.post(
+            reverse("ckeditor_upload"),
+            {"upload": SimpleUploadedFile("photo.png", content)},
+        )
+        assert response.status_code == 200
+    assert Upload.objects.filter(uploaded_by=user).count() == 2
+
+    response = client.get(reverse("ckeditor_browse"))
+    assert response.status_code == 200
+    assert len(response.context["files"]) == 1
+    assert response.context["page"].paginator.count == 2
+
+
+def test_repeated_upload_is_one_reference(staff_client, media_root):
+    """
+    Uploading the same image again reuses the catalog row and counts no
+    new reference to the shared file.
+    """
+    client, user = staff_client
+    for _ in range(3):
+        response = client.post(
+            reverse("ckeditor_upload"),
+            {"upload": SimpleUploadedFile("photo.png", b"same")},
+        )
+        assert response.status_code == 200
+
+    upload = Upload.objects.get(uploaded_by=user)
+    assert StoredFile.objects.get(name=upload.image.name).ref_count == 1
+
+
+def test_index_uploads_skips_known_files(db, media_root):
+    """
+    Existing files are indexed once.
+    """
+    (media_root / "uploads" / "2024").mkdir(parents=True)
+    (media_root / "uploads" / "2024" / "old.jpg").write_bytes(b"old")
+
+    call_command("index_uploads")
+    call_command("index_uploads")
+
+    assert list(Upload.objects.values_list("image", flat=True)) == [
+        "uploads/2024/old.jpg"
+    ]
@@ -0,0 +1,74 @@
+"""
+Test suite for access-controlled media delivery.
+"""
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from accounts.middleware import REQUEST_USER_BACKEND
+from accounts.models import Profile, User
+from blog.models import Post
+
+
+@pytest.fixture
+def draft_image(media_root):
+    """
+    A draft post with an image and a rendition; returns (post, user).
+    """
+    default_storage.save("post_images/draft.jpg", ContentFile(b"jpeg"))
+    default_storage.save(
+        "renditions/post_images/draft/320w.webp", ContentFile(b"webp")
+    )
+    user = User.objects.create_user(email="author@uploads.com", password="x")
+    post = Post.objects.create(
+        author=Profile.objects.get(user=user),
+        title="Draft",
+        content="draft",
+        status=False,
+        published_date=timezone.now(),
+        image="post_images/draft.jpg",
+    )
+    return post, user
+
+
+@pytest.mark.django_db
+def test_draft_images_are_private(client, locmem_caches, draft_image):
+    """
+    Draft images and their renditions are hidden from other users.
+    """
+    _, author = draft_image
+    for path in (
+        "/media/post_images/draft.jpg",
+        "/media/renditions/post_images/draft/320w.webp",
+    ):
+        assert client.get(path).status_code == 404
+
+    client.force_login(author, backend=REQUEST_USER_BACKEND)
+    response = client.get("/media/post_images/draft.jpg")
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == b"jpeg"
+    assert "private" in response["Cache-Control"]
+
+
+@pytest.mark.django_db
+def test_published_images_use_accel_redirect(
+    client, settings, locmem_caches, draft_image
+):
+    """
+    With a prefix set, Django only answers with X-Accel-Redirect.
+    """
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+    post, _ = draft_image
+    post.status = True
+    post.save()
+
+    response = client.get("/media/post_images/draft.jpg")
+    assert response.status_code == 200
+    assert response["X-Accel-Redirect"] == (
+        "/protected-media/post_images/draft.jpg"
+    )
+    assert "Content-Type" not in response
+    assert "public" in response["Cache-Control"]
+    assert client.get("/media/.quarantine/x.jpg").status_code == 404
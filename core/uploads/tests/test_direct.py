@@ -0,0 +1,136 @@
+"""
+Test suite for direct-to-bucket uploads, against moto's S3.
+"""
+
+import io
+import pytest
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from accounts.models import Profile, User
+from uploads.tasks import ingest_direct_upload
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+
+@pytest.fixture
+def bucket(settings, media_root):
+    """
+    Enables direct uploads against an in-memory S3 bucket.
+    """
+    settings.UPLOAD_S3_ENABLED = True
+    settings.UPLOAD_S3_BUCKET = "uploads"
+    settings.UPLOAD_S3_ACCESS_KEY_ID = "testing"
+    settings.UPLOAD_S3_SECRET_ACCESS_KEY = "testing"
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name=settings.UPLOAD_S3_REGION)
+        client.create_bucket(Bucket="uploads")
+        yield client
+
+
+@pytest.fixture
+def uploader(db):
+    return User.objects.create_user(email="direct@uploads.com", password="x")
+
+
+def jpeg_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), "blue").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.mark.django_db
+def test_presign_finalize_and_ingest(locmem_caches, bucket, uploader):
+    """
+    A presigned PUT upload is verified on finalize and then attached to
+    the profile by the ingest task.
+    """
+    user = uploader
+    client = APIClient()
+    client.force_authenticate(user)
+
+    response = client.post(
+        reverse("uploads:direct-presign"),
+        {"filename": "me.jpg", "method": "put"},
+    )
+    assert response.status_code == 201
+    key = response.data["key"]
+    assert key.startswith(f"incoming/{user.pk}/")
+    bucket.put_object(
+        Bucket="uploads", Key=key, Body=jpeg_bytes(), ContentType="image/jpeg"
+    )
+
+    response = client.post(
+        reverse("uploads:direct-finalize"),
+        {"key": key, "target": "profile"},
+    )
+    assert response.status_code == 202
+
+    name = ingest_direct_upload(key, user.pk, "profile")
+    assert Profile.objects.get(user=user).image.name == name
+    assert bucket.list_objects_v2(Bucket="uploads")["KeyCount"] == 0
+
+
+@pytest.mark.django_db
+def test_finalize_rejects_foreign_or_invalid_objects(
+    locmem_caches, bucket, uploader
+):
+    """
+    Keys outside the user's prefix and non-image objects are refused.
+    """
+    user = uploader
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse("uploads:direct-finalize")
+
+    response = client.post(
+        url, {"key": "incoming/0/x.jpg", "target": "profile"}
+    )
+    assert response.status_code == 400
+
+    key = f"incoming/{user.pk}/x.txt"
+    bucket.put_object(
+        Bucket="uploads", Key=key, Body=b"text", ContentType="text/plain"
+    )
+    response = client.post(url, {"key": key, "target": "profile"})
+    assert response.status_code == 400
+    assert bucket.list_objects_v2(Bucket="uploads")["KeyCount"] == 0
+
+
+@pytest.mark.django_db
+def test_presign_rejects_non_image_extensions(locmem_caches, bucket, uploader):
+    """
+    The client's extension must be an image one, whatever the type.
+    """
+    client = APIClient()
+    client.force_authenticate(uploader)
+
+    response = client.post(
+        reverse("uploads:direct-presign"),
+        {"filename": "x.html", "content_type": "image/png"},
+    )
+    assert response.status_code == 400
+    assert "filename" in response.data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ext", [".html", ".png"])
+def test_ingest_rejects_mismatched_image_type(
+    locmem_caches, bucket, uploader, media_root, ext
+):
+    """
+    An object whose detected format does not match its extension is
+    dropped, and nothing is stored under its name.
+    """
+    key = f"incoming/{uploader.pk}/x{ext}"
+    bucket.put_object(
+        Bucket="uploads", Key=key, Body=jpeg_bytes(), ContentType="image/png"
+    )
+
+    assert ingest_direct_upload(key, uploader.pk, "profile") is None
+    image = Profile.objects.get(user=uploader).image
+    assert image.name.startswith("defaults/")
+    assert not list(media_root.rglob(f"*{ext}"))
+    assert bucket.list_objects_v2(Bucket="uploads")["KeyCount"] == 0
@@ -0,0 +1,75 @@
+"""
+Test suite for the orphaned media collector.
+"""
+
+import os
+import pytest
+from datetime import timedelta
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from accounts.models import Profile, User
+from blog.models import Post
+from uploads.gc import collect_orphans
+from uploads.models import StoredFile
+from uploads.storage import ContentAddressedStorage
+
+
+@pytest.mark.django_db
+def test_unreferenced_files_are_quarantined(media_root):
+    """
+    Files referenced by images, content or renditions stay; others move
+    to the quarantine directory.
+    """
+    for name in (
+        "post_images/kept.jpg",
+        "uploads/2024/inline.png",
+        "renditions/post_images/kept/320w.webp",
+        "post_images/orphan.jpg",
+        "renditions/post_images/orphan/320w.webp",
+        "defaults/default_post.png",
+    ):
+        path = media_root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"12345")
+
+    user = User.objects.create_user(email="gc@uploads.com", password="x")
+    Post.objects.create(
+        author=Profile.objects.get(user=user),
+        title="Kept",
+        content='<img src="/media/uploads/2024/inline.png" />',
+        status=True,
+        published_date=timezone.now(),
+        image="post_images/kept.jpg",
+    )
+
+    assert collect_orphans(grace_hours=0) == (2, 10)
+
+    assert (media_root / "post_images/kept.jpg").exists()
+    assert (media_root / "uploads/2024/inline.png").exists()
+    assert (media_root / "renditions/post_images/kept/320w.webp").exists()
+    assert (media_root / "defaults/default_post.png").exists()
+    assert not (media_root / "post_images/orphan.jpg").exists()
+    quarantined = list((media_root / ".quarantine").rglob("orphan.jpg"))
+    assert len(quarantined) == 1
+
+
+@pytest.mark.django_db
+def test_reuploaded_file_is_kept_through_grace_period(media_root):
+    """
+    Re-uploading an old unreferenced file restarts its grace period,
+    although the file itself is not rewritten.
+    """
+    storage = ContentAddressedStorage()
+    name = storage.save("post_images/a.jpg", ContentFile(b"reused"))
+    week_ago = timezone.now() - timedelta(days=7)
+    os.utime(storage.path(name), (week_ago.timestamp(),) * 2)
+    StoredFile.objects.filter(name=name).update(updated_at=week_ago)
+
+    assert storage.save("post_images/b.jpg", ContentFile(b"reused")) == name
+    assert collect_orphans(grace_hours=24) == (0, 0)
+    assert storage.exists(name)
+
+    StoredFile.objects.filter(name=name).update(updated_at=week_ago)
+    assert collect_orphans(grace_hours=24) == (1, len(b"reused"))
+    assert not storage.exists(name)
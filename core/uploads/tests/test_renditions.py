@@ -0,0 +1,81 @@
+"""
+Test suite for the image rendition pipeline.
+"""
+
+import pytest
+from django.core.files.storage import default_storage
+from django.template import Context, Template
+from django.utils import timezone
+from PIL import Image
+
+from accounts.models import Profile, User
+from blog.models import Post
+from uploads.renditions import generate_renditions, is_manifest_current
+from uploads.tasks import render_image_renditions
+
+
+def test_generate_renditions_strips_exif(stored_jpeg):
+    """
+    Renditions are rendered at the configured widths without EXIF.
+    """
+    manifest = generate_renditions(stored_jpeg)
+
+    assert is_manifest_current(manifest, stored_jpeg)
+    assert manifest["placeholder"].startswith("data:image/jpeg;base64,")
+    widths = [r["width"] for r in manifest["renditions"]["webp"]]
+    assert widths == [320, 640, 800]  # no upscaling past the source
+    for rendition in manifest["renditions"]["jpeg"]:
+        with default_storage.open(rendition["name"]) as file:
+            image = Image.open(file)
+            assert image.width == rendition["width"]
+            assert not image.getexif()
+
+
+@pytest.mark.django_db
+def test_task_records_manifest_for_srcset(stored_jpeg):
+    """
+    The task stores the manifest, which the template tag turns into
+    a srcset.
+    """
+    user = User.objects.create_user(email="writer@uploads.com", password="x")
+    post = Post.objects.create(
+        author=Profile.objects.get(user=user),
+        title="Photo",
+        content="Content",
+        status=True,
+        published_date=timezone.now(),
+        image=stored_jpeg,
+    )
+
+    render_image_renditions(post._meta.label, post.pk)
+
+    post.refresh_from_db()
+    assert is_manifest_current(post.image_renditions, stored_jpeg)
+    html = Template(
+        "{% load renditions %}{% srcset post.image post.image_renditions "
+        "'webp' %}"
+    ).render(Context({"post": post}))
+    assert "photo/320w.webp 320w" in html
+
+
+@pytest.mark.django_db
+def test_responsive_image_falls_back_to_placeholder(stored_jpeg):
+    """
+    Both the srcset and the plain <img> show the placeholder when the
+    image fails to load.
+    """
+    post = Post(image=stored_jpeg, title="Photo")
+    template = Template(
+        "{% load renditions %}"
+        "{% responsive_image post.image post.image_renditions %}"
+    )
+
+    html = template.render(Context({"post": post}))
+    assert "srcset" not in html
+    assert "this.src='/static/img/placeholder.jpg'" in html
+
+    post.image_renditions = generate_renditions(stored_jpeg)
+    html = template.render(Context({"post": post}))
+    assert "<picture>" in html
+    assert "removeAttribute('srcset')" in html
+    assert "this.src='/static/img/placeholder.jpg'" in html
@@ -0,0 +1,66 @@
+"""
+Test suite for the content-addressed upload storage.
+"""
+
+import pytest
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from accounts.models import Profile, User
+from blog.models import Post
+from uploads.models import StoredFile
+from uploads.storage import ContentAddressedStorage
+
+
+@pytest.mark.django_db
+def test_identical_uploads_share_one_file(media_root):
+    """
+    Re-uploading the same content resolves to the existing path, and an
+    unreferenced file is removed by delete().
+    """
+    storage = ContentAddressedStorage()
+    first = storage.save("post_images/a.jpg", ContentFile(b"same bytes"))
+    second = storage.save("post_images/b.JPG", ContentFile(b"same bytes"))
+    other = storage.save("post_images/a.jpg", ContentFile(b"other bytes"))
+
+    assert first == second != other
+    assert first.startswith("post_images/") and first.endswith(".jpg")
+    assert StoredFile.objects.get(name=first).ref_count == 0
+    assert not list((media_root / ".incoming").iterdir())
+
+    storage.delete(first)
+    assert not storage.exists(first)
+    assert not StoredFile.objects.filter(name=first).exists()
+
+
+@pytest.mark.django_db
+def test_rows_using_a_file_are_counted(media_root):
+    """
+    Saving, replacing and deleting a post image move its reference, and
+    a referenced file survives delete().
+    """
+    storage = ContentAddressedStorage()
+    first = storage.save("post_images/a.jpg", ContentFile(b"first"))
+    second = storage.save("post_images/b.jpg", ContentFile(b"second"))
+
+    user = User.objects.create_user(email="refs@uploads.com", password="x")
+    post = Post.objects.create(
+        author=Profile.objects.get(user=user),
+        title="Counted",
+        content="Content",
+        status=True,
+        published_date=timezone.now(),
+        image=first,
+    )
+    assert StoredFile.objects.get(name=first).ref_count == 1
+    storage.delete(first)
+    assert storage.exists(first)
+
+    post.image = second
+    post.save(update_fields=["image"])
+    post.save(update_fields=["title"])
+    assert StoredFile.objects.get(name=first).ref_count == 0
+    assert StoredFile.objects.get(name=second).ref_count == 1
+
+    post.delete()
+    assert StoredFile.objects.get(name=second).ref_count == 0
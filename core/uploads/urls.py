@@ -0,0 +1,20 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.urls import path
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_exempt
+
+from . import views
+
+# Same names as ckeditor_uploader.urls, which the CKEditor widget reverses
+urlpatterns = [
+    path(
+        "upload/",
+        csrf_exempt(staff_member_required(views.ImageUploadView.as_view())),
+        name="ckeditor_upload",
+    ),
+    path(
+        "browse/",
+        never_cache(staff_member_required(views.browse)),
+        name="ckeditor_browse",
+    ),
+]
@@ -0,0 +1,167 @@
+import os
+from urllib.parse import quote
+from ckeditor_uploader import utils
+from ckeditor_uploader.backends import get_backend
+from ckeditor_uploader.utils import storage
+from ckeditor_uploader.views import get_upload_filename
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+from django.utils.html import escape
+from django.views import generic
+from django.views.static import serve
+
+from .access import get_media_access, is_digest_name
+from .models import Upload
+from .renditions import manifest_matches
+
+
+class ImageUploadView(generic.View):
+    """
+    CKEditor upload endpoint that records every saved file in the
+    upload catalog (same responses as ckeditor_uploader's view).
+    """
+
+    http_method_names = ["post"]
+
+    def post(self, request, **kwargs):
+        uploaded_file = request.FILES["upload"]
+        ck_func_num = escape(request.GET.get("CKEditorFuncNum", ""))
+
+        filewrapper = get_backend()(storage, uploaded_file)
+        allow_nonimages = getattr(
+            settings, "CKEDITOR_ALLOW_NONIMAGE_FILES", True
+        )
+        if not filewrapper.is_image and not allow_nonimages:
+            return self.respond(ck_func_num, error="Invalid file type.")
+
+        saved_path = filewrapper.save_as(
+            get_upload_filename(uploaded_file.name, request)
+        )
+        # A re-upload finds its row, so the shared file gains no reference
+        # (uploads.signals counts one per row)
+        Upload.objects.get_or_create(
+            image=saved_path,
+            uploaded_by=request.user,
+            defaults={
+                "original_name": os.path.basename(uploaded_file.name),
+                "size": uploaded_file.size,
+            },
+        )
+
+        url = utils.get_media_url(saved_path)
+        if not ck_func_num:
+            return JsonResponse(
+                {
+                    "url": url,
+                    "uploaded": "1",
+                    "fileName": os.path.basename(saved_path),
+                }
+            )
+        return self.respond(ck_func_num, url=url)
+
+    def respond(self, ck_func_num, url="", error=""):
+        return HttpResponse(
+            "<script type='text/javascript'>"
+            f"window.parent.CKEDITOR.tools.callFunction("
+            f"'{ck_func_num}', '{escape(url)}', '{escape(error)}');"
+            "</script>"
+        )
+
+
+def get_thumbnail_url(upload):
+    """
+    URL of the smallest JPEG rendition, or of the file until rendered.
+    """
+    manifest = upload.image_renditions
+    if manifest_matches(manifest, upload.image.name):
+        renditions = manifest["renditions"].get("jpeg")
+        if renditions:
+            return storage.url(renditions[0]["name"])
+    return upload.image.url
+
+
+def browse(request):
+    """
+    CKEditor image browser served from the upload catalog, paginated.
+    Staff see their own uploads; superusers can see everyone's and
+    filter by `author` (a user id).
+    """
+    uploads = Upload.objects.select_related("uploaded_by")
+    author = request.GET.get("author", "")
+    if not request.user.is_superuser:
+        uploads = uploads.filter(uploaded_by=request.user)
+    elif author.isdigit():
+        uploads = uploads.filter(uploaded_by_id=author)
+
+    query = request.GET.get("q", "").strip()
+    if query:
+        uploads = uploads.filter(original_name__icontains=query)
+
+    page = Paginator(uploads, settings.UPLOAD_BROWSE_PAGE_SIZE).get_page(
+        request.GET.get("page")
+    )
+    files = []
+    for upload in page:
+        is_image = utils.is_valid_image_extension(upload.image.name)
+        files.append(
+            {
+                "src": upload.image.url,
+                "thumb": (
+                    get_thumbnail_url(upload)
+                    if is_image
+                    else utils.get_icon_filename(upload.image.name)
+                ),
+                "visible_filename": upload.original_name,
+                "author": upload.uploaded_by,
+            }
+        )
+
+    params = request.GET.copy()
+    params.pop("page", None)
+    context = {
+        "files": files,
+        "page": page,
+        "query": query,
+        "author": author,
+        "base_query": params.urlencode(),
+    }
+    return render(request, "uploads/browse.html", context)
+
+
+def serve_media(request, path):
+    """
+    Serve a media file after checking it against its owning post.
+
+    With `MEDIA_ACCEL_REDIRECT_PREFIX` set, the file is handed to nginx
+    with X-Accel-Redirect (sendfile, Range and ETag handled there);
+    otherwise it is streamed by Django, for the development server.
+    """
+    if any(part.startswith(".") for part in path.split("/")):
+        raise Http404  # quarantine and temporary directories
+    allowed, public = get_media_access(path, request.user)
+    if not allowed:
+        raise Http404
+
+    prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX
+    if prefix:
+        response = HttpResponse()
+        # Let nginx pick the type from the file extension
+        del response["Content-Type"]
+        response["X-Accel-Redirect"] = f"{prefix}{quote(path)}"
+    else:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    if not public:
+        patch_cache_control(response, private=True, no_cache=True)
+    elif is_digest_name(path):
+        patch_cache_control(
+            response, public=True, max_age=31536000, immutable=True
+        )
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE
+        )
+    return response